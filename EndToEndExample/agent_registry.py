@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Agent Registry
+Local cache of created agents keyed by their definition, so restarts reuse existing
+agents instead of creating new ones
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: only the in-process lock applies
+    fcntl = None
+
+# Default location of the registry file, overridable with AGENT_REGISTRY_PATH
+DEFAULT_REGISTRY_PATH = ".agent_registry.json"
+
+
+def _tool_repr(tool: Any) -> Any:
+    """Convert a tool definition to something JSON serializable"""
+    if hasattr(tool, "as_dict"):
+        return tool.as_dict()
+    if isinstance(tool, dict):
+        return tool
+    return str(tool)
+
+
+def agent_definition_key(
+    endpoint: str,
+    name: str,
+    model: str,
+    instructions: str,
+    tools: Optional[List[Any]] = None,
+    description: Optional[str] = None
+) -> str:
+    """
+    Hash an agent definition into a stable registry key
+    
+    Args:
+        endpoint: Azure AI Foundry project endpoint the agent lives in
+        name: Agent name
+        model: Model deployment name
+        instructions: System instructions for the agent
+        tools: Tool definitions enabled for the agent
+        description: Agent description
+    
+    Returns:
+        Hex SHA-256 digest of the definition
+    """
+    definition = {
+        "endpoint": endpoint.rstrip("/"),
+        "name": name,
+        "model": model,
+        "instructions": instructions,
+        "tools": [_tool_repr(tool) for tool in tools or []],
+        "description": description
+    }
+    payload = json.dumps(definition, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AgentRegistry:
+    """JSON file mapping agent definition hashes to agent IDs"""
+    
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the agent registry
+        
+        Args:
+            path: Registry file path (defaults to AGENT_REGISTRY_PATH or .agent_registry.json)
+        """
+        self.path = path or os.getenv("AGENT_REGISTRY_PATH", DEFAULT_REGISTRY_PATH)
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """
+        Hold the registry lock across a read-modify-write
+        
+        Besides the in-process lock, an exclusive flock on a sidecar file serializes
+        writers in other processes, such as replicas sharing a volume.
+        """
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            with open(f"{self.path}.lock", "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Read the registry file, treating a missing or corrupt file as empty"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable agent registry {self.path}: {str(e)}")
+            return {}
+    
+    def _save(self, entries: Dict[str, Dict[str, Any]]):
+        """Write the registry file atomically through a uniquely named temp file"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temp = tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=directory, prefix=f".{os.path.basename(self.path)}.",
+            suffix=".tmp", delete=False
+        )
+        try:
+            with temp:
+                json.dump(entries, temp, indent=2, sort_keys=True)
+            os.replace(temp.name, self.path)
+        except BaseException:
+            os.unlink(temp.name)
+            raise
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a registered agent
+        
+        Args:
+            key: Definition key from agent_definition_key
+        
+        Returns:
+            Agent ID or None if not registered
+        """
+        with self._lock:
+            entry = self._load().get(key)
+        return entry.get("agent_id") if entry else None
+    
+    def register(self, key: str, agent_id: str, name: str):
+        """
+        Record an agent for a definition key
+        
+        Args:
+            key: Definition key from agent_definition_key
+            agent_id: Agent identifier
+            name: Agent name (for readability of the registry file)
+        """
+        with self._locked():
+            entries = self._load()
+            entries[key] = {"agent_id": agent_id, "name": name, "registered_at": time.time()}
+            try:
+                self._save(entries)
+            except OSError as e:
+                print(f"⚠️  Could not persist agent registry {self.path}: {str(e)}")
+    
+    def remove(self, key: Optional[str] = None, agent_id: Optional[str] = None) -> bool:
+        """
+        Remove an entry by definition key or agent ID
+        
+        Args:
+            key: Definition key to remove
+            agent_id: Agent identifier to remove
+        
+        Returns:
+            True if an entry was removed
+        """
+        with self._locked():
+            entries = self._load()
+            stale = [k for k, entry in entries.items()
+                     if k == key or (agent_id and entry.get("agent_id") == agent_id)]
+            for k in stale:
+                del entries[k]
+            if stale:
+                try:
+                    self._save(entries)
+                except OSError as e:
+                    print(f"⚠️  Could not persist agent registry {self.path}: {str(e)}")
+        return bool(stale)
+    
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get all registry entries
+        
+        Returns:
+            Dictionary of definition key to entry
+        """
+        with self._lock:
+            return self._load()
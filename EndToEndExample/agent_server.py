@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Agent HTTP Server
+Serves a SemanticKernelAgentWrapper over HTTP with a JSON chat endpoint and a
+Server-Sent Events streaming endpoint
+
+Endpoints:
+    POST   /chat                  {"message": "...", "session_id": "..."} -> {"response": "...", ...}
+    POST   /chat/stream           Same body, streamed as SSE "message" events and a final "done" event
+    DELETE /sessions/{session_id} Delete a conversation and its thread
+    GET    /healthz               Liveness and load information
+
+Requests without a session_id are stateless and run on a temporary thread; identical
+stateless /chat requests in flight at the same time share one agent call. Sessions idle
+for longer than the session TTL are deleted along with their threads.
+"""
+
+import asyncio
+import json
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from aiohttp import web
+
+from semantic_kernel_agent_wrapper import SemanticKernelAgentWrapper
+
+
+class _Overloaded(Exception):
+    """No concurrency slot became available for an agent call"""
+
+
+class AgentServer:
+    """aiohttp application with bounded concurrency and per-session routing"""
+    
+    def __init__(
+        self,
+        wrapper: SemanticKernelAgentWrapper,
+        max_concurrency: int = 64,
+        max_waiting: int = 256,
+        queue_timeout: float = 30.0,
+        retry_after: int = 1,
+        session_lock_timeout: float = 30.0,
+        session_ttl: float = 3600.0,
+        max_sessions: int = 10000
+    ):
+        """
+        Initialize the agent server
+        
+        Args:
+            wrapper: Semantic Kernel wrapper with a created agent
+            max_concurrency: Maximum number of agent calls in flight
+            max_waiting: Maximum number of requests queued for a slot before rejecting with 503
+            queue_timeout: Seconds a request may wait for a slot before rejecting with 503
+            retry_after: Retry-After value (seconds) sent with 503 responses
+            session_lock_timeout: Seconds a request may wait for its session's previous turn
+                before rejecting with 409
+            session_ttl: Seconds a session may stay idle before it and its thread are deleted
+            max_sessions: Maximum number of idle sessions kept; the least recently used are
+                deleted first
+        """
+        self.wrapper = wrapper
+        self.max_concurrency = max_concurrency
+        self.max_waiting = max_waiting
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.session_lock_timeout = session_lock_timeout
+        self.session_ttl = session_ttl
+        self.max_sessions = max_sessions
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight = 0
+        self._waiting = 0
+        self._rejected = 0
+        # One lock per active session so turns on a thread never overlap
+        self._session_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+        # When each session last finished a turn, least recently used first
+        self._session_last_used: "OrderedDict[str, float]" = OrderedDict()
+        self._evicted = 0
+        self._sweeper: Optional[asyncio.Task] = None
+        
+        self.app = web.Application()
+        self.app.on_startup.append(self._start_sweeper)
+        self.app.on_cleanup.append(self._stop_sweeper)
+        self.app.add_routes([
+            web.post("/chat", self.handle_chat),
+            web.post("/chat/stream", self.handle_chat_stream),
+            web.delete("/sessions/{session_id}", self.handle_delete_session),
+            web.get("/healthz", self.handle_health)
+        ])
+    
+    def _overloaded(self) -> web.Response:
+        """503 response asking the client (or load balancer) to retry later"""
+        self._rejected += 1
+        return web.json_response(
+            {"error": "Server is at capacity, retry later"},
+            status=503,
+            headers={"Retry-After": str(self.retry_after)}
+        )
+    
+    async def _acquire_slot(self) -> bool:
+        """Wait for a concurrency slot; False if the queue is full or the wait timed out"""
+        if self._in_flight + self._waiting >= self.max_concurrency + self.max_waiting:
+            return False
+        
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self._waiting -= 1
+        
+        self._in_flight += 1
+        return True
+    
+    def _release_slot(self):
+        self._in_flight -= 1
+        self._semaphore.release()
+    
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        """Hold a concurrency slot, raising _Overloaded if none becomes available"""
+        if not await self._acquire_slot():
+            raise _Overloaded()
+        try:
+            yield
+        finally:
+            self._release_slot()
+    
+    def _session_busy(self) -> web.Response:
+        """409 response for a session whose previous turn is still running"""
+        return web.json_response(
+            {"error": "Session is busy with another turn, retry later"},
+            status=409,
+            headers={"Retry-After": str(self.retry_after)}
+        )
+    
+    async def _begin_turn(self, session_id: Optional[str]) -> Tuple[Optional[asyncio.Lock], Optional[web.Response]]:
+        """
+        Wait for the session's previous turn, then for a concurrency slot
+        
+        Taking the session lock first keeps queued turns of one session from holding
+        slots that other requests could use.
+        
+        Returns:
+            Tuple of the held session lock (None for stateless requests) and an error
+            response if the turn can't start
+        """
+        lock = self._session_lock(session_id)
+        if lock:
+            try:
+                await asyncio.wait_for(lock.acquire(), timeout=self.session_lock_timeout)
+            except asyncio.TimeoutError:
+                return None, self._session_busy()
+        
+        if not await self._acquire_slot():
+            if lock:
+                lock.release()
+            return None, self._overloaded()
+        return lock, None
+    
+    def _end_turn(self, session_id: Optional[str], lock: Optional[asyncio.Lock]):
+        """Release the slot and session lock taken by _begin_turn"""
+        self._release_slot()
+        if lock:
+            self._session_last_used[session_id] = time.monotonic()
+            self._session_last_used.move_to_end(session_id)
+            lock.release()
+    
+    def _session_lock(self, session_id: Optional[str]) -> Optional[asyncio.Lock]:
+        """Get the lock serializing turns of a session (None for stateless requests)"""
+        if session_id is None:
+            return None
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._session_locks[session_id] = lock
+        return lock
+    
+    @staticmethod
+    async def _parse_request(request: web.Request) -> Tuple[Optional[str], Optional[str], Optional[web.Response]]:
+        """Read message and session_id from a JSON body, or return a 400 response"""
+        try:
+            body = await request.json()
+        except ValueError:
+            # Malformed JSON or undecodable bytes (JSONDecodeError and UnicodeDecodeError are ValueErrors)
+            return None, None, web.json_response({"error": "Request body must be JSON"}, status=400)
+        if not isinstance(body, dict):
+            return None, None, web.json_response({"error": "Request body must be a JSON object"}, status=400)
+        
+        message = body.get("message")
+        if not isinstance(message, str) or not message.strip():
+            return None, None, web.json_response({"error": "'message' must be a non-empty string"}, status=400)
+        
+        session_id = body.get("session_id")
+        if session_id is not None:
+            session_id = str(session_id)
+        return message, session_id, None
+    
+    async def handle_chat(self, request: web.Request) -> web.Response:
+        """POST /chat: run one turn and return the full response"""
+        message, session_id, error = await self._parse_request(request)
+        if error:
+            return error
+        if session_id is None:
+            return await self._stateless_chat(message)
+        
+        lock, error = await self._begin_turn(session_id)
+        if error:
+            return error
+        
+        try:
+            response = self.wrapper.chat_stream(message, session_id=session_id)
+            text = await response
+            
+            return web.json_response({
+                "response": text,
+                "session_id": session_id,
+                "metrics": response.metrics()
+            })
+        except Exception as e:
+            print(f"❌ Error handling chat request: {str(e)}")
+            return web.json_response({"error": str(e)}, status=500)
+        finally:
+            self._end_turn(session_id, lock)
+    
+    async def _stateless_chat(self, message: str) -> web.Response:
+        """
+        Answer a stateless turn through chat_with_agent
+        
+        Cache hits and requests coalesced onto an identical call in flight are answered
+        without a concurrency slot; only the call that reaches the agent takes one.
+        """
+        try:
+            text = await self.wrapper.chat_with_agent(message, session_id=None, admission=self._slot)
+        except _Overloaded:
+            return self._overloaded()
+        except Exception as e:
+            print(f"❌ Error handling chat request: {str(e)}")
+            return web.json_response({"error": str(e)}, status=500)
+        
+        return web.json_response({"response": text, "session_id": None, "metrics": None})
+    
+    async def handle_chat_stream(self, request: web.Request) -> web.StreamResponse:
+        """POST /chat/stream: run one turn and stream text chunks as Server-Sent Events"""
+        message, session_id, error = await self._parse_request(request)
+        if error:
+            return error
+        lock, error = await self._begin_turn(session_id)
+        if error:
+            return error
+        
+        stream = web.StreamResponse(headers={
+            "Content-Type": "text/event-stream",
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        })
+        response = None
+        try:
+            await stream.prepare(request)
+            
+            response = self.wrapper.chat_stream(message, session_id=session_id)
+            async for chunk in response:
+                await stream.write(_sse("message", {"text": chunk}))
+            
+            await stream.write(_sse("done", {"session_id": session_id, "metrics": response.metrics()}))
+        except ConnectionResetError:
+            # Client went away; stop generating
+            if response is not None:
+                await response.aclose()
+            return stream
+        except asyncio.CancelledError:
+            if response is not None:
+                await response.aclose()
+            raise
+        except Exception as e:
+            print(f"❌ Error streaming chat response: {str(e)}")
+            try:
+                await stream.write(_sse("error", {"error": str(e)}))
+            except ConnectionResetError:
+                pass
+        finally:
+            self._end_turn(session_id, lock)
+        
+        await stream.write_eof()
+        return stream
+    
+    async def handle_delete_session(self, request: web.Request) -> web.Response:
+        """DELETE /sessions/{session_id}: delete a conversation"""
+        session_id = request.match_info["session_id"]
+        lock = self._session_lock(session_id)
+        async with lock:
+            self._session_last_used.pop(session_id, None)
+            deleted = await self.wrapper.delete_session(session_id)
+        if not deleted:
+            return web.json_response({"error": f"Session '{session_id}' not found"}, status=404)
+        return web.json_response({"deleted": session_id})
+    
+    async def evict_sessions(self) -> int:
+        """
+        Delete sessions idle for longer than session_ttl, and the least recently used
+        ones beyond max_sessions, along with their threads
+        
+        Sessions with a turn running or waiting are skipped.
+        
+        Returns:
+            Number of sessions deleted
+        """
+        now = time.monotonic()
+        excess = len(self._session_last_used) - self.max_sessions
+        evicted = 0
+        for session_id, last_used in list(self._session_last_used.items()):
+            if excess <= 0 and now - last_used < self.session_ttl:
+                break
+            lock = self._session_lock(session_id)
+            if lock.locked():
+                continue
+            async with lock:
+                # Used again while an earlier eviction was deleting a thread
+                if self._session_last_used.get(session_id) != last_used:
+                    continue
+                del self._session_last_used[session_id]
+                await self.wrapper.delete_session(session_id)
+            excess -= 1
+            evicted += 1
+        
+        if evicted:
+            self._evicted += evicted
+            print(f"♻️  Deleted {evicted} idle session(s)")
+        return evicted
+    
+    async def _sweep_sessions(self):
+        """Evict idle sessions periodically"""
+        interval = max(1.0, min(60.0, self.session_ttl / 4))
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.evict_sessions()
+            except Exception as e:
+                print(f"⚠️  Session eviction failed: {str(e)}")
+    
+    async def _start_sweeper(self, app: web.Application):
+        self._sweeper = asyncio.create_task(self._sweep_sessions())
+    
+    async def _stop_sweeper(self, app: web.Application):
+        if self._sweeper:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+    
+    async def handle_health(self, request: web.Request) -> web.Response:
+        """GET /healthz: liveness and load information"""
+        return web.json_response(self.stats())
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get current load statistics
+        
+        Returns:
+            Dictionary with in-flight, waiting and rejected request counts and session counts
+        """
+        return {
+            "status": "ok" if self.wrapper.agent else "starting",
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "rejected": self._rejected,
+            "max_concurrency": self.max_concurrency,
+            "sessions": len(self.wrapper.sessions),
+            "evicted_sessions": self._evicted,
+            "coalescing": self.wrapper.single_flight.stats()
+        }
+
+
+def _sse(event: str, data: Dict[str, Any]) -> bytes:
+    """Encode a Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+
+
+async def run_agent_server(
+    wrapper: SemanticKernelAgentWrapper,
+    host: str = "0.0.0.0",
+    port: int = 8000,
+    max_concurrency: int = 64,
+    session_ttl: float = 3600.0
+):
+    """
+    Serve the wrapper until cancelled
+    
+    Args:
+        wrapper: Semantic Kernel wrapper with a created agent
+        host: Interface to bind
+        port: Port to listen on
+        max_concurrency: Maximum number of agent calls in flight
+        session_ttl: Seconds a session may stay idle before it and its thread are deleted
+    """
+    server = AgentServer(wrapper, max_concurrency=max_concurrency, session_ttl=session_ttl)
+    runner = web.AppRunner(server.app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port, backlog=1024)
+    await site.start()
+    print(f"🌐 Serving agent on http://{host}:{port} (max {max_concurrency} concurrent requests)")
+    
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
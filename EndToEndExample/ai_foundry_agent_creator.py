@@ -5,31 +5,140 @@ Programmatically creates an AI agent using Azure AI Foundry APIs
 """
 
 import os
+import time
 import asyncio
-from typing import Optional
-from azure.ai.projects import AIProjectClient
-from azure.identity import DefaultAzureCredential
+from typing import AsyncIterator, Iterator, Optional
 from azure.ai.agents.models import CodeInterpreterTool, AzureAISearchTool, BingGroundingTool
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+
+from agent_registry import AgentRegistry, agent_definition_key
+from azure_clients import get_credential, get_project_client, get_async_project_client
+
+
+def _agent_to_dict(agent) -> dict:
+    """Convert an agent model to a dictionary"""
+    return {
+        "id": agent.id,
+        "name": agent.name,
+        "instructions": agent.instructions,
+        "model": agent.model,
+        "tools": agent.tools,
+        "created_at": agent.created_at
+    }
+
+
+def _message_to_dict(message) -> dict:
+    """Convert a thread message model to a dictionary"""
+    return {
+        "id": message.id,
+        "role": message.role,
+        "content": message.content,
+        "created_at": message.created_at
+    }
+
+
+# The service caps message list pages at 100 items
+MAX_MESSAGE_PAGE_SIZE = 100
+
+
+def _page_size(limit: Optional[int], page_size: int) -> int:
+    """Pick a page size that never fetches more than limit messages"""
+    size = min(page_size, limit) if limit else page_size
+    return max(1, min(size, MAX_MESSAGE_PAGE_SIZE))
+
+
+# Run statuses after which a run makes no further progress
+TERMINAL_RUN_STATUSES = {"completed", "failed", "cancelled", "expired", "incomplete"}
+
+# Statuses with which the service rejects a run stream request before creating the run
+STREAMING_UNSUPPORTED_STATUSES = {404, 405, 501}
+
+
+def _streaming_unsupported(error: Exception) -> bool:
+    """Whether a run stream request was rejected because streaming is unavailable"""
+    return isinstance(error, HttpResponseError) and error.status_code in STREAMING_UNSUPPORTED_STATUSES
+
+
+def _enum_value(value) -> str:
+    """Get the plain string of an SDK enum or string"""
+    return getattr(value, "value", value)
+
+
+def _content_text(content) -> str:
+    """Join the text parts of a message's content"""
+    if isinstance(content, str):
+        return content
+    return "".join(part.text.value for part in content or [] if getattr(part, "text", None))
+
+
+def _stream_event_to_dict(event_type, event_data) -> Optional[dict]:
+    """
+    Convert an agent run stream event to a dictionary
+    
+    Args:
+        event_type: AgentStreamEvent value
+        event_data: Event payload model
+        
+    Returns:
+        Event dictionary, or None for events callers don't need
+    """
+    event_type = _enum_value(event_type)
+    
+    if event_type == "thread.message.delta":
+        return {"type": "message_delta", "message_id": event_data.id, "text": event_data.text}
+    if event_type == "thread.message.completed":
+        return {"type": "message_completed", "message_id": event_data.id, "text": _content_text(event_data.content)}
+    if event_type.startswith("thread.run.step."):
+        if event_type == "thread.run.step.delta":
+            return None
+        return {
+            "type": "run_step",
+            "step_id": event_data.id,
+            "step_type": _enum_value(event_data.type),
+            "status": _enum_value(event_data.status)
+        }
+    if event_type.startswith("thread.run."):
+        return {"type": "run_status", "run_id": event_data.id, "status": _enum_value(event_data.status)}
+    if event_type == "error":
+        return {"type": "error", "error": str(event_data)}
+    return None
+
+
+def _run_to_dict(run) -> dict:
+    """Convert a thread run model to a dictionary"""
+    return {
+        "id": run.id,
+        "thread_id": run.thread_id,
+        "agent_id": run.agent_id,
+        "status": run.status,
+        "created_at": run.created_at,
+        "completed_at": run.completed_at
+    }
 
 
 class AIFoundryAgentCreator:
     """Creates and manages AI agents in Azure AI Foundry"""
     
-    def __init__(self, project_endpoint: str, model_deployment_name: str):
+    def __init__(
+        self,
+        project_endpoint: str,
+        model_deployment_name: str,
+        registry: Optional[AgentRegistry] = None
+    ):
         """
         Initialize the AI Foundry Agent Creator
         
         Args:
             project_endpoint: Azure AI Foundry project endpoint
             model_deployment_name: Name of the deployed model
+            registry: Agent registry used by get_or_create_agent (defaults to the local file)
         """
         self.project_endpoint = project_endpoint
         self.model_deployment_name = model_deployment_name
-        self.credential = DefaultAzureCredential()
-        self.client = AIProjectClient(
-            endpoint=self.project_endpoint,
-            credential=self.credential
-        )
+        self.registry = registry or AgentRegistry()
+        # Shared per process so the credential chain and connection pool are reused
+        self.credential = get_credential()
+        self.client = get_project_client(self.project_endpoint)
         
     def create_agent(
         self, 
@@ -65,19 +174,53 @@ class AIFoundryAgentCreator:
             )
             
             print(f"✅ Successfully created agent '{name}' with ID: {agent.id}")
-            return {
-                "id": agent.id,
-                "name": agent.name,
-                "instructions": agent.instructions,
-                "model": agent.model,
-                "tools": agent.tools,
-                "created_at": agent.created_at
-            }
+            return _agent_to_dict(agent)
             
         except Exception as e:
             print(f"❌ Error creating agent: {str(e)}")
             raise
     
+    def get_or_create_agent(
+        self,
+        name: str,
+        instructions: str,
+        tools: Optional[list] = None,
+        description: Optional[str] = None
+    ) -> dict:
+        """
+        Reuse a registered agent with the same definition, or create and register one
+        
+        Args:
+            name: Agent name
+            instructions: System instructions for the agent
+            tools: List of tools to enable for the agent
+            description: Optional description of the agent
+            
+        Returns:
+            Dictionary containing agent details
+        """
+        if tools is None:
+            tools = CodeInterpreterTool().definitions
+        key = agent_definition_key(
+            self.project_endpoint, name, self.model_deployment_name, instructions, tools, description
+        )
+        
+        agent_id = self.registry.get(key)
+        if agent_id:
+            try:
+                agent = self.client.agents.get_agent(agent_id)
+                print(f"♻️  Reusing agent '{name}' with ID: {agent.id}")
+                return _agent_to_dict(agent)
+            except ResourceNotFoundError:
+                print(f"ℹ️  Registered agent {agent_id} no longer exists, creating a new one")
+                self.registry.remove(key=key)
+            except Exception as e:
+                print(f"⚠️  Could not validate registered agent {agent_id}: {str(e)}")
+        
+        agent_info = self.create_agent(name, instructions, tools=tools, description=description)
+        self.registry.register(key, agent_info["id"], name)
+        return agent_info
+    
     def create_thread(self) -> dict:
         """
         Create a conversation thread
@@ -140,42 +283,204 @@ class AIFoundryAgentCreator:
                 agent_id=agent_id
             )
             print(f"✅ Agent run completed with status: {run.status}")
-            return {
-                "id": run.id,
-                "thread_id": run.thread_id,
-                "agent_id": run.agent_id,
-                "status": run.status,
-                "created_at": run.created_at,
-                "completed_at": run.completed_at
-            }
+            return _run_to_dict(run)
         except Exception as e:
             print(f"❌ Error running agent: {str(e)}")
             raise
     
-    def get_messages(self, thread_id: str) -> list:
+    def stream_run(
+        self,
+        thread_id: str,
+        agent_id: str,
+        poll_interval: float = 0.25,
+        max_poll_interval: float = 5.0
+    ) -> Iterator[dict]:
+        """
+        Run the agent on a thread and yield events as they arrive
+        
+        Consumes the run's event stream. If the service or SDK does not support
+        streaming, the run is created and polled with adaptive backoff instead; if the
+        stream breaks after the run was created, that run is polled to completion.
+        Closing the generator before the run finishes cancels the run.
+        
+        Args:
+            thread_id: Thread identifier
+            agent_id: Agent identifier
+            poll_interval: Initial polling interval in seconds (polling fallback only)
+            max_poll_interval: Maximum polling interval in seconds (polling fallback only)
+            
+        Yields:
+            Event dictionaries whose "type" is run_status, run_step, message_delta,
+            message_completed or error
+        """
+        run_state = {"id": None, "status": None}
+        try:
+            stream = None
+            runs = self.client.agents.runs
+            if not hasattr(runs, "stream"):
+                print("⚠️  Run streaming not supported by this SDK, falling back to polling")
+            else:
+                try:
+                    stream = runs.stream(thread_id=thread_id, agent_id=agent_id)
+                except HttpResponseError as e:
+                    if not _streaming_unsupported(e):
+                        raise
+                    print(f"⚠️  Run streaming unavailable, falling back to polling: {str(e)}")
+            
+            if stream is not None:
+                try:
+                    with stream as events:
+                        for event_type, event_data, _ in events:
+                            event = _stream_event_to_dict(event_type, event_data)
+                            if event is None:
+                                continue
+                            if event["type"] == "run_status":
+                                run_state.update(id=event["run_id"], status=event["status"])
+                            elif event["type"] == "message_completed":
+                                run_state["message_id"] = event["message_id"]
+                            yield event
+                except Exception as e:
+                    # Without a run id there is no telling whether a run exists, so don't start another
+                    if not run_state["id"] or run_state["status"] in TERMINAL_RUN_STATUSES:
+                        raise
+                    print(f"⚠️  Run stream interrupted, polling run {run_state['id']}: {str(e)}")
+                if not run_state["id"] or run_state["status"] in TERMINAL_RUN_STATUSES:
+                    return
+            
+            yield from self.poll_run(thread_id, agent_id, run_state, poll_interval, max_poll_interval)
+        finally:
+            if run_state["id"] and run_state["status"] not in TERMINAL_RUN_STATUSES:
+                try:
+                    self.client.agents.runs.cancel(thread_id=thread_id, run_id=run_state["id"])
+                    print(f"ℹ️  Cancelled run {run_state['id']}")
+                except Exception as e:
+                    print(f"⚠️  Could not cancel run {run_state['id']}: {str(e)}")
+    
+    def poll_run(
+        self,
+        thread_id: str,
+        agent_id: str,
+        run_state: dict,
+        poll_interval: float = 0.25,
+        max_poll_interval: float = 5.0,
+        run=None
+    ) -> Iterator[dict]:
+        """
+        Poll a run with adaptive backoff until it reaches a terminal status
+        
+        Args:
+            thread_id: Thread identifier
+            agent_id: Agent identifier (used when a run has to be created)
+            run_state: Dictionary with the run's "id" and last seen "status"; a run is
+                created when it has no id, and it is kept up to date while polling
+            poll_interval: Initial polling interval in seconds
+            max_poll_interval: Maximum polling interval in seconds
+            run: Already fetched run for run_state's id, saving one request
+            
+        Yields:
+            run_status events on every status change, then message_completed with the
+            latest assistant message if the run completed
+        """
+        if run is not None:
+            run_state["id"] = run.id
+        elif run_state["id"]:
+            run = self.client.agents.runs.get(thread_id=thread_id, run_id=run_state["id"])
+        else:
+            run = self.client.agents.runs.create(thread_id=thread_id, agent_id=agent_id)
+            run_state["id"] = run.id
+        delay = poll_interval
+        
+        while True:
+            status = _enum_value(run.status)
+            if status != run_state["status"]:
+                run_state["status"] = status
+                yield {"type": "run_status", "run_id": run.id, "status": status}
+                # Progress was made, so check again soon
+                delay = poll_interval
+            if status in TERMINAL_RUN_STATUSES:
+                break
+            time.sleep(delay)
+            delay = min(delay * 2, max_poll_interval)
+            run = self.client.agents.runs.get(thread_id=thread_id, run_id=run.id)
+        
+        if status == "completed":
+            message = self.get_latest_assistant_message(thread_id)
+            # A stream that broke off may already have delivered the message
+            if message and message["id"] != run_state.get("message_id"):
+                yield {"type": "message_completed", "message_id": message["id"], "text": _content_text(message["content"])}
+    
+    def iter_messages(
+        self,
+        thread_id: str,
+        limit: Optional[int] = None,
+        order: str = "desc",
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        page_size: int = 20
+    ) -> Iterator[dict]:
+        """
+        Lazily yield messages from a thread, fetching pages only as they are consumed
+        
+        Args:
+            thread_id: Thread identifier
+            limit: Maximum number of messages to yield (None for all)
+            order: "desc" for newest first or "asc" for oldest first
+            after: Message ID cursor; only messages after it are returned
+            before: Message ID cursor; only messages before it are returned
+            page_size: Messages per request (1-100)
+            
+        Yields:
+            Message dictionaries
+        """
+        pages = self.client.agents.messages.list(
+            thread_id=thread_id,
+            limit=_page_size(limit, page_size),
+            order=order,
+            before=before
+        ).by_page(continuation_token=after)
+        
+        count = 0
+        for page in pages:
+            for msg in page:
+                yield _message_to_dict(msg)
+                count += 1
+                if limit and count >= limit:
+                    return
+    
+    def get_latest_assistant_message(self, thread_id: str) -> Optional[dict]:
+        """
+        Get the newest assistant message of a thread without walking its history
+        
+        Args:
+            thread_id: Thread identifier
+            
+        Returns:
+            Message dictionary or None if the thread has no assistant message
+        """
+        try:
+            for msg in self.iter_messages(thread_id, order="desc", page_size=5):
+                if msg["role"] == "assistant":
+                    return msg
+            return None
+        except Exception as e:
+            print(f"❌ Error retrieving latest message: {str(e)}")
+            raise
+    
+    def get_messages(self, thread_id: str, limit: Optional[int] = None) -> list:
         """
         Retrieve messages from a thread
         
         Args:
             thread_id: Thread identifier
+            limit: Maximum number of messages to retrieve (None for all)
             
         Returns:
             List of messages
         """
         try:
-            messages = self.client.agents.messages.list(thread_id=thread_id)
-            # Convert ItemPaged to list
-            message_list = list(messages)
+            message_list = list(self.iter_messages(thread_id, limit=limit, page_size=MAX_MESSAGE_PAGE_SIZE))
             print(f"✅ Retrieved {len(message_list)} messages from thread")
-            return [
-                {
-                    "id": msg.id,
-                    "role": msg.role,
-                    "content": msg.content,
-                    "created_at": msg.created_at
-                }
-                for msg in message_list
-            ]
+            return message_list
         except Exception as e:
             print(f"❌ Error retrieving messages: {str(e)}")
             raise
@@ -193,10 +498,440 @@ class AIFoundryAgentCreator:
         try:
             self.client.agents.delete_agent(agent_id)
             print(f"✅ Agent {agent_id} deleted successfully")
+            self.registry.remove(agent_id=agent_id)
+            return True
+        except Exception as e:
+            print(f"❌ Error deleting agent: {str(e)}")
+            return False
+    
+    def delete_thread(self, thread_id: str) -> bool:
+        """
+        Delete a conversation thread
+        
+        Args:
+            thread_id: Thread identifier
+            
+        Returns:
+            True if successful
+        """
+        try:
+            self.client.agents.threads.delete(thread_id)
+            print(f"✅ Thread {thread_id} deleted successfully")
+            return True
+        except Exception as e:
+            print(f"❌ Error deleting thread: {str(e)}")
+            return False
+
+
+class AsyncAIFoundryAgentCreator:
+    """Async variant of AIFoundryAgentCreator built on azure.ai.projects.aio"""
+    
+    def __init__(
+        self,
+        project_endpoint: str,
+        model_deployment_name: str,
+        registry: Optional[AgentRegistry] = None
+    ):
+        """
+        Initialize the async AI Foundry Agent Creator
+        
+        Args:
+            project_endpoint: Azure AI Foundry project endpoint
+            model_deployment_name: Name of the deployed model
+            registry: Agent registry used by get_or_create_agent (defaults to the local file)
+        """
+        self.project_endpoint = project_endpoint
+        self.model_deployment_name = model_deployment_name
+        self.registry = registry or AgentRegistry()
+    
+    @property
+    def client(self):
+        """Shared async AI Project Client of the running event loop (cached per loop by azure_clients)"""
+        return get_async_project_client(self.project_endpoint)
+    
+    async def create_agent(
+        self, 
+        name: str, 
+        instructions: str,
+        tools: Optional[list] = None,
+        description: Optional[str] = None
+    ) -> dict:
+        """
+        Create an AI agent in Azure AI Foundry
+        
+        Args:
+            name: Agent name
+            instructions: System instructions for the agent
+            tools: List of tools to enable for the agent
+            description: Optional description of the agent
+            
+        Returns:
+            Dictionary containing agent details
+        """
+        try:
+            if tools is None:
+                tools = CodeInterpreterTool().definitions
+            
+            agent = await self.client.agents.create_agent(
+                model=self.model_deployment_name,
+                name=name,
+                instructions=instructions,
+                tools=tools,
+                description=description or f"AI Agent: {name}"
+            )
+            
+            print(f"✅ Successfully created agent '{name}' with ID: {agent.id}")
+            return _agent_to_dict(agent)
+            
+        except Exception as e:
+            print(f"❌ Error creating agent: {str(e)}")
+            raise
+    
+    async def get_or_create_agent(
+        self,
+        name: str,
+        instructions: str,
+        tools: Optional[list] = None,
+        description: Optional[str] = None
+    ) -> dict:
+        """
+        Reuse a registered agent with the same definition, or create and register one
+        
+        Args:
+            name: Agent name
+            instructions: System instructions for the agent
+            tools: List of tools to enable for the agent
+            description: Optional description of the agent
+            
+        Returns:
+            Dictionary containing agent details
+        """
+        if tools is None:
+            tools = CodeInterpreterTool().definitions
+        key = agent_definition_key(
+            self.project_endpoint, name, self.model_deployment_name, instructions, tools, description
+        )
+        
+        # Registry file I/O runs off the event loop
+        agent_id = await asyncio.to_thread(self.registry.get, key)
+        if agent_id:
+            try:
+                agent = await self.client.agents.get_agent(agent_id)
+                print(f"♻️  Reusing agent '{name}' with ID: {agent.id}")
+                return _agent_to_dict(agent)
+            except ResourceNotFoundError:
+                print(f"ℹ️  Registered agent {agent_id} no longer exists, creating a new one")
+                await asyncio.to_thread(self.registry.remove, key=key)
+            except Exception as e:
+                print(f"⚠️  Could not validate registered agent {agent_id}: {str(e)}")
+        
+        agent_info = await self.create_agent(name, instructions, tools=tools, description=description)
+        await asyncio.to_thread(self.registry.register, key, agent_info["id"], name)
+        return agent_info
+    
+    async def create_thread(self) -> dict:
+        """
+        Create a conversation thread
+        
+        Returns:
+            Dictionary containing thread details
+        """
+        try:
+            thread = await self.client.agents.threads.create()
+            print(f"✅ Created thread with ID: {thread.id}")
+            return {"id": thread.id, "created_at": thread.created_at}
+        except Exception as e:
+            print(f"❌ Error creating thread: {str(e)}")
+            raise
+    
+    async def send_message(self, thread_id: str, content: str, role: str = "user") -> dict:
+        """
+        Send a message to a thread
+        
+        Args:
+            thread_id: Thread identifier
+            content: Message content
+            role: Message role (user, assistant)
+            
+        Returns:
+            Dictionary containing message details
+        """
+        try:
+            message = await self.client.agents.messages.create(
+                thread_id=thread_id,
+                role=role,
+                content=content
+            )
+            print(f"✅ Message sent to thread {thread_id}")
+            return {
+                "id": message.id,
+                "thread_id": message.thread_id,
+                "role": message.role,
+                "content": message.content,
+                "created_at": message.created_at
+            }
+        except Exception as e:
+            print(f"❌ Error sending message: {str(e)}")
+            raise
+    
+    async def run_agent(self, thread_id: str, agent_id: str) -> dict:
+        """
+        Run the agent on a thread
+        
+        Args:
+            thread_id: Thread identifier
+            agent_id: Agent identifier
+            
+        Returns:
+            Dictionary containing run results
+        """
+        try:
+            run = await self.client.agents.runs.create_and_process(
+                thread_id=thread_id,
+                agent_id=agent_id
+            )
+            print(f"✅ Agent run completed with status: {run.status}")
+            return _run_to_dict(run)
+        except Exception as e:
+            print(f"❌ Error running agent: {str(e)}")
+            raise
+    
+    async def stream_run(
+        self,
+        thread_id: str,
+        agent_id: str,
+        poll_interval: float = 0.25,
+        max_poll_interval: float = 5.0
+    ) -> AsyncIterator[dict]:
+        """
+        Run the agent on a thread and yield events as they arrive
+        
+        Consumes the run's event stream. If the service or SDK does not support
+        streaming, the run is created and polled with adaptive backoff instead; if the
+        stream breaks after the run was created, that run is polled to completion.
+        Closing the generator before the run finishes cancels the run.
+        
+        Args:
+            thread_id: Thread identifier
+            agent_id: Agent identifier
+            poll_interval: Initial polling interval in seconds (polling fallback only)
+            max_poll_interval: Maximum polling interval in seconds (polling fallback only)
+            
+        Yields:
+            Event dictionaries whose "type" is run_status, run_step, message_delta,
+            message_completed or error
+        """
+        run_state = {"id": None, "status": None}
+        try:
+            stream = None
+            runs = self.client.agents.runs
+            if not hasattr(runs, "stream"):
+                print("⚠️  Run streaming not supported by this SDK, falling back to polling")
+            else:
+                try:
+                    stream = await runs.stream(thread_id=thread_id, agent_id=agent_id)
+                except HttpResponseError as e:
+                    if not _streaming_unsupported(e):
+                        raise
+                    print(f"⚠️  Run streaming unavailable, falling back to polling: {str(e)}")
+            
+            if stream is not None:
+                try:
+                    async with stream as events:
+                        async for event_type, event_data, _ in events:
+                            event = _stream_event_to_dict(event_type, event_data)
+                            if event is None:
+                                continue
+                            if event["type"] == "run_status":
+                                run_state.update(id=event["run_id"], status=event["status"])
+                            elif event["type"] == "message_completed":
+                                run_state["message_id"] = event["message_id"]
+                            yield event
+                except Exception as e:
+                    # Without a run id there is no telling whether a run exists, so don't start another
+                    if not run_state["id"] or run_state["status"] in TERMINAL_RUN_STATUSES:
+                        raise
+                    print(f"⚠️  Run stream interrupted, polling run {run_state['id']}: {str(e)}")
+                if not run_state["id"] or run_state["status"] in TERMINAL_RUN_STATUSES:
+                    return
+            
+            async for event in self.poll_run(thread_id, agent_id, run_state, poll_interval, max_poll_interval):
+                yield event
+        finally:
+            if run_state["id"] and run_state["status"] not in TERMINAL_RUN_STATUSES:
+                try:
+                    await self.client.agents.runs.cancel(thread_id=thread_id, run_id=run_state["id"])
+                    print(f"ℹ️  Cancelled run {run_state['id']}")
+                except Exception as e:
+                    print(f"⚠️  Could not cancel run {run_state['id']}: {str(e)}")
+    
+    async def poll_run(
+        self,
+        thread_id: str,
+        agent_id: str,
+        run_state: dict,
+        poll_interval: float = 0.25,
+        max_poll_interval: float = 5.0,
+        run=None
+    ) -> AsyncIterator[dict]:
+        """
+        Poll a run with adaptive backoff until it reaches a terminal status
+        
+        Args:
+            thread_id: Thread identifier
+            agent_id: Agent identifier (used when a run has to be created)
+            run_state: Dictionary with the run's "id" and last seen "status"; a run is
+                created when it has no id, and it is kept up to date while polling
+            poll_interval: Initial polling interval in seconds
+            max_poll_interval: Maximum polling interval in seconds
+            run: Already fetched run for run_state's id, saving one request
+            
+        Yields:
+            run_status events on every status change, then message_completed with the
+            latest assistant message if the run completed
+        """
+        if run is not None:
+            run_state["id"] = run.id
+        elif run_state["id"]:
+            run = await self.client.agents.runs.get(thread_id=thread_id, run_id=run_state["id"])
+        else:
+            run = await self.client.agents.runs.create(thread_id=thread_id, agent_id=agent_id)
+            run_state["id"] = run.id
+        delay = poll_interval
+        
+        while True:
+            status = _enum_value(run.status)
+            if status != run_state["status"]:
+                run_state["status"] = status
+                yield {"type": "run_status", "run_id": run.id, "status": status}
+                # Progress was made, so check again soon
+                delay = poll_interval
+            if status in TERMINAL_RUN_STATUSES:
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_poll_interval)
+            run = await self.client.agents.runs.get(thread_id=thread_id, run_id=run.id)
+        
+        if status == "completed":
+            message = await self.get_latest_assistant_message(thread_id)
+            # A stream that broke off may already have delivered the message
+            if message and message["id"] != run_state.get("message_id"):
+                yield {"type": "message_completed", "message_id": message["id"], "text": _content_text(message["content"])}
+    
+    async def iter_messages(
+        self,
+        thread_id: str,
+        limit: Optional[int] = None,
+        order: str = "desc",
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        page_size: int = 20
+    ) -> AsyncIterator[dict]:
+        """
+        Lazily yield messages from a thread, fetching pages only as they are consumed
+        
+        Args:
+            thread_id: Thread identifier
+            limit: Maximum number of messages to yield (None for all)
+            order: "desc" for newest first or "asc" for oldest first
+            after: Message ID cursor; only messages after it are returned
+            before: Message ID cursor; only messages before it are returned
+            page_size: Messages per request (1-100)
+            
+        Yields:
+            Message dictionaries
+        """
+        pages = self.client.agents.messages.list(
+            thread_id=thread_id,
+            limit=_page_size(limit, page_size),
+            order=order,
+            before=before
+        ).by_page(continuation_token=after)
+        
+        count = 0
+        async for page in pages:
+            async for msg in page:
+                yield _message_to_dict(msg)
+                count += 1
+                if limit and count >= limit:
+                    return
+    
+    async def get_latest_assistant_message(self, thread_id: str) -> Optional[dict]:
+        """
+        Get the newest assistant message of a thread without walking its history
+        
+        Args:
+            thread_id: Thread identifier
+            
+        Returns:
+            Message dictionary or None if the thread has no assistant message
+        """
+        try:
+            async for msg in self.iter_messages(thread_id, order="desc", page_size=5):
+                if msg["role"] == "assistant":
+                    return msg
+            return None
+        except Exception as e:
+            print(f"❌ Error retrieving latest message: {str(e)}")
+            raise
+    
+    async def get_messages(self, thread_id: str, limit: Optional[int] = None) -> list:
+        """
+        Retrieve messages from a thread
+        
+        Args:
+            thread_id: Thread identifier
+            limit: Maximum number of messages to retrieve (None for all)
+            
+        Returns:
+            List of messages
+        """
+        try:
+            message_list = [
+                msg async for msg in self.iter_messages(thread_id, limit=limit, page_size=MAX_MESSAGE_PAGE_SIZE)
+            ]
+            print(f"✅ Retrieved {len(message_list)} messages from thread")
+            return message_list
+        except Exception as e:
+            print(f"❌ Error retrieving messages: {str(e)}")
+            raise
+    
+    async def delete_agent(self, agent_id: str) -> bool:
+        """
+        Delete an agent
+        
+        Args:
+            agent_id: Agent identifier
+            
+        Returns:
+            True if successful
+        """
+        try:
+            await self.client.agents.delete_agent(agent_id)
+            print(f"✅ Agent {agent_id} deleted successfully")
+            await asyncio.to_thread(self.registry.remove, agent_id=agent_id)
             return True
         except Exception as e:
             print(f"❌ Error deleting agent: {str(e)}")
             return False
+    
+    async def delete_thread(self, thread_id: str) -> bool:
+        """
+        Delete a conversation thread
+        
+        Args:
+            thread_id: Thread identifier
+            
+        Returns:
+            True if successful
+        """
+        try:
+            await self.client.agents.threads.delete(thread_id)
+            print(f"✅ Thread {thread_id} deleted successfully")
+            return True
+        except Exception as e:
+            print(f"❌ Error deleting thread: {str(e)}")
+            return False
 
 
 def main():
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Azure Client Pool
+Process-wide credential and AI Project client provider shared by the agent creator
+and the Semantic Kernel wrapper, so the credential chain is probed once per process
+(and once per event loop for async clients)
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Dict
+
+# Token scope used by Azure AI Foundry project endpoints
+AI_FOUNDRY_SCOPE = "https://ai.azure.com/.default"
+
+_lock = threading.Lock()
+_credential = None
+_session = None
+_sync_clients: Dict[str, Any] = {}
+# Async credential, aiohttp session and clients of each event loop, keyed by the loop
+# itself rather than id(loop), which is reused once a loop is garbage-collected
+_async_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+
+
+def get_credential():
+    """
+    Get the process-wide DefaultAzureCredential for sync clients
+
+    Async clients use get_async_credential() instead, so token refreshes never run the
+    blocking credential chain on the event loop.
+
+    Returns:
+        DefaultAzureCredential instance
+    """
+    global _credential
+    with _lock:
+        if _credential is None:
+            from azure.identity import DefaultAzureCredential
+            _credential = DefaultAzureCredential()
+        return _credential
+
+
+def warm_credential(scope: str = AI_FOUNDRY_SCOPE) -> threading.Thread:
+    """
+    Acquire a token in the background so credential probing overlaps other startup work
+
+    Args:
+        scope: Token scope to request
+
+    Returns:
+        The started daemon thread
+    """
+    def _warm():
+        try:
+            get_credential().get_token(scope)
+            print("✅ Azure credential ready")
+        except Exception as e:
+            print(f"⚠️  Could not pre-fetch Azure token: {str(e)}")
+
+    thread = threading.Thread(target=_warm, name="credential-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def warm_async_credential(scope: str = AI_FOUNDRY_SCOPE) -> asyncio.Task:
+    """
+    Acquire a token with the running loop's async credential in the background
+
+    Args:
+        scope: Token scope to request
+
+    Returns:
+        The warm-up task
+    """
+    async def _warm():
+        try:
+            await get_async_credential().get_token(scope)
+            print("✅ Azure credential ready")
+        except Exception as e:
+            print(f"⚠️  Could not pre-fetch Azure token: {str(e)}")
+
+    return asyncio.ensure_future(_warm())
+
+
+def _get_transport(pool_size: int):
+    """Create a requests transport that shares one connection pool across sync clients"""
+    global _session
+    import requests
+    from requests.adapters import HTTPAdapter
+    from azure.core.pipeline.transport import RequestsTransport
+
+    if _session is None:
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+    return RequestsTransport(session=_session, session_owner=False)
+
+
+def get_project_client(endpoint: str, pool_size: int = 10):
+    """
+    Get the shared sync AIProjectClient for an endpoint
+
+    Args:
+        endpoint: Azure AI Foundry project endpoint
+        pool_size: Connection pool size of the shared HTTP session
+
+    Returns:
+        AIProjectClient instance
+    """
+    credential = get_credential()
+    with _lock:
+        client = _sync_clients.get(endpoint)
+        if client is None:
+            from azure.ai.projects import AIProjectClient
+            client = AIProjectClient(
+                endpoint=endpoint,
+                credential=credential,
+                transport=_get_transport(pool_size)
+            )
+            _sync_clients[endpoint] = client
+        return client
+
+
+def _async_pool() -> Dict[str, Any]:
+    """Get the pool of the running event loop (call with _lock held)"""
+    loop = asyncio.get_running_loop()
+    # Sessions keep their loop alive, so drop pools of loops that were closed without
+    # aclose_clients(); their connections died with the loop
+    for stale in [other for other in _async_pools.keys() if other.is_closed()]:
+        del _async_pools[stale]
+    pool = _async_pools.get(loop)
+    if pool is None:
+        pool = {"credential": None, "session": None, "clients": {}}
+        _async_pools[loop] = pool
+    return pool
+
+
+def get_async_credential():
+    """
+    Get the azure.identity.aio DefaultAzureCredential of the running event loop
+
+    Async credentials acquire tokens without blocking the loop, and like aiohttp
+    sessions they are bound to the loop that uses them, so one is kept per loop.
+
+    Returns:
+        azure.identity.aio.DefaultAzureCredential instance
+    """
+    with _lock:
+        pool = _async_pool()
+        if pool["credential"] is None:
+            from azure.identity.aio import DefaultAzureCredential as AsyncDefaultAzureCredential
+            pool["credential"] = AsyncDefaultAzureCredential()
+        return pool["credential"]
+
+
+def get_async_project_client(endpoint: str, pool_size: int = 100):
+    """
+    Get the shared async AIProjectClient for an endpoint on the running event loop
+
+    aiohttp sessions are bound to the loop that created them, so async clients are
+    cached per loop. All async clients on a loop share one aiohttp session and one
+    async credential.
+
+    Args:
+        endpoint: Azure AI Foundry project endpoint
+        pool_size: Connection limit of the shared aiohttp session
+
+    Returns:
+        azure.ai.projects.aio.AIProjectClient instance
+    """
+    credential = get_async_credential()
+    with _lock:
+        pool = _async_pool()
+        client = pool["clients"].get(endpoint)
+        if client is None:
+            import aiohttp
+            from azure.ai.projects.aio import AIProjectClient as AsyncAIProjectClient
+            from azure.core.pipeline.transport import AioHttpTransport
+
+            session = pool["session"]
+            if session is None or session.closed:
+                session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=pool_size))
+                pool["session"] = session
+
+            client = AsyncAIProjectClient(
+                endpoint=endpoint,
+                credential=credential,
+                transport=AioHttpTransport(session=session, session_owner=False)
+            )
+            pool["clients"][endpoint] = client
+        return client
+
+
+def close_clients():
+    """Close the shared sync clients and their HTTP session"""
+    global _session
+    with _lock:
+        clients = list(_sync_clients.values())
+        _sync_clients.clear()
+        session, _session = _session, None
+
+    for client in clients:
+        try:
+            client.close()
+        except Exception as e:
+            print(f"⚠️  Error closing client: {str(e)}")
+    if session is not None:
+        session.close()
+
+
+async def aclose_clients():
+    """Close the shared async clients, credential and aiohttp session of the running loop"""
+    with _lock:
+        pool = _async_pools.pop(asyncio.get_running_loop(), None)
+    if pool is None:
+        return
+
+    for client in pool["clients"].values():
+        try:
+            await client.close()
+        except Exception as e:
+            print(f"⚠️  Error closing async client: {str(e)}")
+    if pool["credential"] is not None:
+        try:
+            await pool["credential"].close()
+        except Exception as e:
+            print(f"⚠️  Error closing async credential: {str(e)}")
+    session = pool["session"]
+    if session is not None and not session.closed:
+        await session.close()
+
+
+def pool_info() -> Dict[str, Any]:
+    """
+    Describe the shared pool
+
+    Returns:
+        Dictionary with the number of cached sync and async clients
+    """
+    with _lock:
+        pools = list(_async_pools.values())
+        return {
+            "credential_created": _credential is not None,
+            "sync_clients": len(_sync_clients),
+            "async_loops": len(pools),
+            "async_clients": sum(len(pool["clients"]) for pool in pools)
+        }
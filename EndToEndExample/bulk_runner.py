@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Bulk Conversation Runner
+Pushes many independent prompts through one agent, each on its own thread, under a
+bounded concurrency limit, and reports throughput and latency percentiles
+"""
+
+import asyncio
+import json
+import math
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional
+
+from ai_foundry_agent_creator import AsyncAIFoundryAgentCreator, TERMINAL_RUN_STATUSES
+
+
+@dataclass
+class BulkResult:
+    """Outcome of one prompt"""
+    index: int
+    prompt: str
+    success: bool
+    response: Optional[str] = None
+    error: Optional[str] = None
+    latency: float = 0.0
+    thread_id: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = min(max(1, math.ceil(pct / 100 * len(sorted_values))), len(sorted_values))
+    return sorted_values[rank - 1]
+
+
+class BulkStats:
+    """Accumulates latency and throughput statistics for a bulk run"""
+    
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.succeeded = 0
+        self.failed = 0
+        self.started = time.perf_counter()
+    
+    def start(self):
+        """Restart the clock so elapsed time and throughput cover only the run itself"""
+        self.started = time.perf_counter()
+    
+    def record(self, result: BulkResult):
+        """Record a finished prompt"""
+        if result.success:
+            self.succeeded += 1
+            self.latencies.append(result.latency)
+        else:
+            self.failed += 1
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the run so far
+        
+        Returns:
+            Dictionary with counts, throughput and p50/p95/p99 latency of successful prompts
+        """
+        elapsed = time.perf_counter() - self.started
+        completed = self.succeeded + self.failed
+        latencies = sorted(self.latencies)
+        return {
+            "completed": completed,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "elapsed_seconds": round(elapsed, 3),
+            "throughput_per_sec": round(completed / elapsed, 3) if elapsed > 0 else 0.0,
+            "latency_p50": round(percentile(latencies, 50), 3),
+            "latency_p95": round(percentile(latencies, 95), 3),
+            "latency_p99": round(percentile(latencies, 99), 3),
+            "latency_max": round(latencies[-1], 3) if latencies else 0.0
+        }
+
+
+def read_prompts(path: str) -> Iterator[str]:
+    """
+    Stream prompts from a file
+    
+    .jsonl/.ndjson files are read as one JSON object per line with a "prompt" field;
+    any other file is read as one prompt per non-empty line.
+    
+    Args:
+        path: Prompts file path
+    
+    Yields:
+        Prompt strings
+    """
+    is_jsonl = path.lower().endswith((".jsonl", ".ndjson"))
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if is_jsonl:
+                record = json.loads(line)
+                prompt = record.get("prompt") if isinstance(record, dict) else record
+                if prompt:
+                    yield str(prompt)
+            else:
+                yield line
+
+
+class BulkConversationRunner:
+    """Fans prompts out across threads of one agent with bounded concurrency"""
+    
+    def __init__(
+        self,
+        creator: AsyncAIFoundryAgentCreator,
+        agent_id: str,
+        concurrency: int = 8,
+        delete_threads: bool = True,
+        poll_interval: float = 0.25,
+        max_poll_interval: float = 2.0
+    ):
+        """
+        Initialize the bulk runner
+        
+        Args:
+            creator: Async agent creator providing the project client
+            agent_id: Agent to run every prompt against
+            concurrency: Maximum number of conversations in flight
+            delete_threads: Delete each thread once its reply has been read
+            poll_interval: Initial run polling interval in seconds
+            max_poll_interval: Maximum run polling interval in seconds
+        """
+        self.creator = creator
+        self.agent_id = agent_id
+        self.concurrency = max(1, concurrency)
+        self.delete_threads = delete_threads
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.stats = BulkStats()
+    
+    async def run_one(self, index: int, prompt: str) -> BulkResult:
+        """
+        Run a single prompt on a new thread
+        
+        Args:
+            index: Position of the prompt in the input
+            prompt: User message
+        
+        Returns:
+            BulkResult for the prompt (failures are captured, not raised)
+        """
+        from azure.ai.agents.models import AgentThreadCreationOptions, ThreadMessageOptions
+        
+        agents = self.creator.client.agents
+        start = time.perf_counter()
+        thread_id = None
+        run_state = {"id": None, "status": None}
+        try:
+            # Create the thread, its message and the run in a single round trip
+            run = await agents.create_thread_and_run(
+                agent_id=self.agent_id,
+                thread=AgentThreadCreationOptions(messages=[ThreadMessageOptions(role="user", content=prompt)])
+            )
+            thread_id = run.thread_id
+            response = ""
+            async for event in self.creator.poll_run(
+                thread_id, self.agent_id, run_state, self.poll_interval, self.max_poll_interval, run=run
+            ):
+                if event["type"] == "message_completed":
+                    response = event["text"]
+            
+            status = run_state["status"]
+            if status != "completed":
+                return BulkResult(index, prompt, False, error=f"Run ended with status {status}",
+                                  latency=time.perf_counter() - start, thread_id=thread_id)
+            return BulkResult(index, prompt, True, response=response,
+                              latency=time.perf_counter() - start, thread_id=thread_id)
+        
+        except asyncio.CancelledError:
+            if run_state["id"] and run_state["status"] not in TERMINAL_RUN_STATUSES:
+                try:
+                    await agents.runs.cancel(thread_id=thread_id, run_id=run_state["id"])
+                except Exception:
+                    pass
+            raise
+        except Exception as e:
+            return BulkResult(index, prompt, False, error=str(e),
+                              latency=time.perf_counter() - start, thread_id=thread_id)
+        finally:
+            if self.delete_threads and thread_id:
+                try:
+                    await agents.threads.delete(thread_id)
+                except Exception as e:
+                    print(f"⚠️  Could not delete thread {thread_id}: {str(e)}")
+    
+    async def run(self, prompts: Iterable[str]) -> AsyncIterator[BulkResult]:
+        """
+        Run prompts concurrently and yield results as they complete
+        
+        Prompts are pulled from the iterable lazily, so large files are never loaded
+        whole. Results arrive in completion order; use BulkResult.index to restore input
+        order. Closing the iterator early cancels the conversations still in flight.
+        
+        Args:
+            prompts: Iterable of user messages
+        
+        Yields:
+            BulkResult per prompt
+        """
+        items = enumerate(prompts)
+        pending = set()
+        self.stats.start()
+        try:
+            while True:
+                while len(pending) < self.concurrency:
+                    item = next(items, None)
+                    if item is None:
+                        break
+                    pending.add(asyncio.create_task(self.run_one(*item)))
+                
+                if not pending:
+                    break
+                
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    self.stats.record(result)
+                    yield result
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+
+def print_bulk_summary(summary: Dict[str, Any]):
+    """Print a bulk run summary"""
+    print("\n📊 Bulk Run Summary:")
+    print(f"   Completed: {summary['completed']} ({summary['succeeded']} succeeded, {summary['failed']} failed)")
+    print(f"   Elapsed: {summary['elapsed_seconds']:.1f}s")
+    print(f"   Throughput: {summary['throughput_per_sec']:.2f} prompts/sec")
+    print(f"   Latency p50/p95/p99: {summary['latency_p50']:.2f}s / {summary['latency_p95']:.2f}s / "
+          f"{summary['latency_p99']:.2f}s (max {summary['latency_max']:.2f}s)")
@@ -6,14 +6,23 @@ Provides both programmatic and interactive interfaces
 
 import os
 import sys
+import json
 import asyncio
 import argparse
-from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 # Import our custom modules
-from ai_foundry_agent_creator import AIFoundryAgentCreator
+from agent_registry import AgentRegistry
+from azure_clients import warm_async_credential, close_clients, aclose_clients
+from ai_foundry_agent_creator import AsyncAIFoundryAgentCreator
 from semantic_kernel_agent_wrapper import SemanticKernelAgentWrapper, AgentConfig, InteractiveAgentSession
+from bulk_runner import BulkConversationRunner, read_prompts, print_bulk_summary
+from agent_server import run_agent_server
+
+# Definition of the Azure AI Foundry demo agent (also used by bulk mode)
+FOUNDRY_AGENT_NAME = "SemanticKernelDemoAgent"
+FOUNDRY_AGENT_INSTRUCTIONS = "You are an advanced AI assistant with comprehensive capabilities. You can analyze data, write code, solve complex problems, and provide detailed explanations. You have access to code interpretation tools and can perform calculations, data analysis, and generate visualizations when needed."
+FOUNDRY_AGENT_DESCRIPTION = "Production-ready AI agent with Semantic Kernel integration"
 
 
 def load_environment():
@@ -27,7 +36,9 @@ def load_environment():
         "MODEL_DEPLOYMENT_NAME": os.getenv("MODEL_DEPLOYMENT_NAME", "gpt-4o"),
         "AZURE_CLIENT_ID": os.getenv("AZURE_CLIENT_ID"),
         "AZURE_CLIENT_SECRET": os.getenv("AZURE_CLIENT_SECRET"),
-        "AZURE_TENANT_ID": os.getenv("AZURE_TENANT_ID")
+        "AZURE_TENANT_ID": os.getenv("AZURE_TENANT_ID"),
+        "SIMILARITY_CACHE_THRESHOLD": os.getenv("SIMILARITY_CACHE_THRESHOLD"),
+        "RESPONSE_CACHE_PATH": os.getenv("RESPONSE_CACHE_PATH")
     }
     
     return env_vars
@@ -44,61 +55,82 @@ def print_banner():
     print(banner)
 
 
-async def create_foundry_agent(env_vars: Dict[str, Any]) -> Dict[str, Any]:
+async def create_foundry_agent(env_vars: Dict[str, Any], registry: Optional[AgentRegistry] = None) -> Dict[str, Any]:
     """Create an agent using Azure AI Foundry APIs"""
     print("\n🏗️  Creating Azure AI Foundry Agent...")
     
-    creator = AIFoundryAgentCreator(
+    creator = AsyncAIFoundryAgentCreator(
         project_endpoint=env_vars["PROJECT_ENDPOINT"],
-        model_deployment_name=env_vars["MODEL_DEPLOYMENT_NAME"]
+        model_deployment_name=env_vars["MODEL_DEPLOYMENT_NAME"],
+        registry=registry
     )
     
-    # Create the agent
-    agent_info = creator.create_agent(
-        name="SemanticKernelDemoAgent",
-        instructions="You are an advanced AI assistant with comprehensive capabilities. You can analyze data, write code, solve complex problems, and provide detailed explanations. You have access to code interpretation tools and can perform calculations, data analysis, and generate visualizations when needed.",
-        description="Production-ready AI agent with Semantic Kernel integration"
+    # Reuse the registered agent for this definition, or create it
+    agent_info = await creator.get_or_create_agent(
+        name=FOUNDRY_AGENT_NAME,
+        instructions=FOUNDRY_AGENT_INSTRUCTIONS,
+        description=FOUNDRY_AGENT_DESCRIPTION
     )
     
     # Create a test thread and verify functionality
-    thread_info = creator.create_thread()
-    
-    creator.send_message(
-        thread_id=thread_info["id"],
-        content="Hello! Please introduce yourself and explain your capabilities."
-    )
+    thread_info = await creator.create_thread()
     
-    creator.run_agent(
-        thread_id=thread_info["id"],
-        agent_id=agent_info["id"]
-    )
-    
-    messages = creator.get_messages(thread_info["id"])
+    try:
+        await creator.send_message(
+            thread_id=thread_info["id"],
+            content="Hello! Please introduce yourself and explain your capabilities."
+        )
+        
+        await creator.run_agent(
+            thread_id=thread_info["id"],
+            agent_id=agent_info["id"]
+        )
+        
+        # Only the newest reply is needed, so fetch a single page instead of the whole history
+        reply = await creator.get_latest_assistant_message(thread_info["id"])
+    except BaseException:
+        await creator.delete_thread(thread_info["id"])
+        raise
     
     print("✅ Agent created and tested successfully!")
     print(f"   Agent ID: {agent_info['id']}")
-    print(f"   Test conversation had {len(messages)} messages")
+    print(f"   Test conversation {'received a reply' if reply else 'has no reply yet'}")
     
     return {
         "agent": agent_info,
         "thread": thread_info,
-        "messages": messages
+        "reply": reply
     }
 
 
-async def create_semantic_kernel_wrapper(env_vars: Dict[str, Any]) -> SemanticKernelAgentWrapper:
+async def discard_foundry_test_thread(env_vars: Dict[str, Any], foundry_result: Dict[str, Any]):
+    """Delete the test conversation of a Foundry setup whose sibling setup failed"""
+    creator = AsyncAIFoundryAgentCreator(
+        project_endpoint=env_vars["PROJECT_ENDPOINT"],
+        model_deployment_name=env_vars["MODEL_DEPLOYMENT_NAME"]
+    )
+    await creator.delete_thread(foundry_result["thread"]["id"])
+
+
+async def create_semantic_kernel_wrapper(env_vars: Dict[str, Any], registry: Optional[AgentRegistry] = None) -> SemanticKernelAgentWrapper:
     """Create and initialize Semantic Kernel wrapper"""
     print("\n🧠 Initializing Semantic Kernel Wrapper...")
     
+    # Setting a threshold enables the similarity response cache for stateless turns
+    similarity_threshold = env_vars.get("SIMILARITY_CACHE_THRESHOLD")
+    
     config = AgentConfig(
         project_endpoint=env_vars["PROJECT_ENDPOINT"],
         model_deployment_name=env_vars["MODEL_DEPLOYMENT_NAME"],
         agent_name="SemanticKernelProductionAgent",
         agent_instructions="You are a production-grade AI assistant powered by Semantic Kernel. You excel at complex reasoning, code generation, data analysis, and problem-solving. Provide accurate, helpful, and well-structured responses.",
-        agent_description="Production Semantic Kernel Azure AI Agent"
+        agent_description="Production Semantic Kernel Azure AI Agent",
+        similarity_cache=bool(similarity_threshold),
+        similarity_threshold=float(similarity_threshold) if similarity_threshold else 0.8,
+        response_cache_path=env_vars.get("RESPONSE_CACHE_PATH")
     )
     
-    wrapper = SemanticKernelAgentWrapper(config)
+    wrapper = SemanticKernelAgentWrapper(config, registry=registry)
     await wrapper.create_agent()
     
     print("✅ Semantic Kernel wrapper initialized successfully!")
@@ -136,7 +168,8 @@ async def run_test_scenarios(wrapper: SemanticKernelAgentWrapper):
         print(f"   Question: {test_case['message']}")
         
         try:
-            response = await wrapper.chat_with_agent(test_case['message'])
+            # Scenarios are independent, so run them stateless where they can be cached
+            response = await wrapper.chat_with_agent(test_case['message'], session_id=None)
             print(f"   ✅ Response: {response[:200]}{'...' if len(response) > 200 else ''}")
             
             results.append({
@@ -160,6 +193,47 @@ async def run_test_scenarios(wrapper: SemanticKernelAgentWrapper):
     return results
 
 
+async def run_bulk_mode(
+    env_vars: Dict[str, Any],
+    prompts_file: str,
+    concurrency: int,
+    output_path: Optional[str] = None,
+    registry: Optional[AgentRegistry] = None
+) -> Dict[str, Any]:
+    """Run every prompt in a file through the Foundry agent with bounded concurrency"""
+    print(f"\n📦 Running bulk prompts from {prompts_file} (concurrency {concurrency})...")
+    
+    creator = AsyncAIFoundryAgentCreator(
+        project_endpoint=env_vars["PROJECT_ENDPOINT"],
+        model_deployment_name=env_vars["MODEL_DEPLOYMENT_NAME"],
+        registry=registry
+    )
+    agent_info = await creator.get_or_create_agent(
+        name=FOUNDRY_AGENT_NAME,
+        instructions=FOUNDRY_AGENT_INSTRUCTIONS,
+        description=FOUNDRY_AGENT_DESCRIPTION
+    )
+    
+    runner = BulkConversationRunner(creator, agent_info["id"], concurrency=concurrency)
+    output = open(output_path, "w", encoding="utf-8") if output_path else None
+    try:
+        async for result in runner.run(read_prompts(prompts_file)):
+            status = "✅" if result.success else "❌"
+            detail = f"{result.latency:.2f}s" if result.success else result.error
+            print(f"   {status} #{result.index}: {detail}")
+            if output:
+                output.write(json.dumps(result.to_dict()) + "\n")
+    finally:
+        if output:
+            output.close()
+    
+    summary = runner.stats.summary()
+    print_bulk_summary(summary)
+    if output_path:
+        print(f"   Results written to {output_path}")
+    return summary
+
+
 async def run_interactive_mode(wrapper: SemanticKernelAgentWrapper):
     """Run interactive chat session"""
     print("\n💬 Starting Interactive Mode...")
@@ -170,12 +244,26 @@ async def run_interactive_mode(wrapper: SemanticKernelAgentWrapper):
 async def main():
     """Main application entry point"""
     parser = argparse.ArgumentParser(description="Azure AI Foundry + Semantic Kernel Demo")
-    parser.add_argument("--mode", choices=["foundry", "semantic", "test", "interactive", "all"], 
+    parser.add_argument("--mode", choices=["foundry", "semantic", "test", "interactive", "bulk", "serve", "all"], 
                        default="all", help="Execution mode")
     parser.add_argument("--skip-foundry", action="store_true", 
                        help="Skip Azure AI Foundry agent creation")
     parser.add_argument("--interactive", action="store_true", 
                        help="Run interactive session after setup")
+    parser.add_argument("--prompts-file", 
+                       help="Prompts for bulk mode (.txt one per line, or .jsonl with a 'prompt' field)")
+    parser.add_argument("--concurrency", type=int, default=8, 
+                       help="Maximum concurrent conversations in bulk mode")
+    parser.add_argument("--bulk-output", 
+                       help="Write bulk results as JSON lines to this file")
+    parser.add_argument("--host", default="0.0.0.0", 
+                       help="Interface to bind in serve mode")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")), 
+                       help="Port to listen on in serve mode")
+    parser.add_argument("--max-concurrency", type=int, default=64, 
+                       help="Maximum concurrent agent calls in serve mode")
+    parser.add_argument("--session-ttl", type=float, default=3600.0, 
+                       help="Seconds an idle session is kept in serve mode before its thread is deleted")
     
     args = parser.parse_args()
     
@@ -197,17 +285,52 @@ async def main():
     print(f"   Model: {env_vars['MODEL_DEPLOYMENT_NAME']}")
     print(f"   Mode: {args.mode}")
     
+    if args.mode == "bulk" and not args.prompts_file:
+        print("❌ --prompts-file is required for bulk mode")
+        sys.exit(1)
+    
+    # Probe the credential chain once, in the background, while the rest of startup runs
+    credential_warmup = warm_async_credential()
+    # One registry shared by every creator and wrapper in this process
+    registry = AgentRegistry()
+    
+    wrapper = None
     try:
-        # Create Azure AI Foundry agent (if not skipped)
-        if args.mode in ["foundry", "all"] and not args.skip_foundry:
-            foundry_result = await create_foundry_agent(env_vars)
-            if not foundry_result:
-                print("❌ Failed to create Azure AI Foundry agent")
-                sys.exit(1)
+        if args.mode == "bulk":
+            await run_bulk_mode(env_vars, args.prompts_file, args.concurrency, args.bulk_output, registry)
+            return
+        
+        if args.mode == "serve":
+            wrapper = await create_semantic_kernel_wrapper(env_vars, registry)
+            await run_agent_server(wrapper, args.host, args.port, args.max_concurrency, args.session_ttl)
+            return
         
-        # Create Semantic Kernel wrapper
+        # Create the Azure AI Foundry agent (if not skipped) and the Semantic Kernel
+        # wrapper concurrently so neither setup stalls the other
+        setup = {}
+        if args.mode in ["foundry", "all"] and not args.skip_foundry:
+            setup["foundry"] = create_foundry_agent(env_vars, registry)
         if args.mode in ["semantic", "test", "interactive", "all"]:
-            wrapper = await create_semantic_kernel_wrapper(env_vars)
+            setup["wrapper"] = create_semantic_kernel_wrapper(env_vars, registry)
+        
+        # Let every setup finish even if one fails, so none is left running unowned
+        results = dict(zip(setup, await asyncio.gather(*setup.values(), return_exceptions=True)))
+        if isinstance(results.get("wrapper"), SemanticKernelAgentWrapper):
+            # Owned from here on, so the finally block closes it on any exit
+            wrapper = results["wrapper"]
+        failures = [result for result in results.values() if isinstance(result, BaseException)]
+        if failures:
+            if isinstance(results.get("foundry"), dict):
+                await discard_foundry_test_thread(env_vars, results["foundry"])
+            raise failures[0]
+        
+        if "foundry" in results and not results["foundry"]:
+            print("❌ Failed to create Azure AI Foundry agent")
+            sys.exit(1)
+        
+        # Use the Semantic Kernel wrapper
+        if "wrapper" in results:
+            wrapper = results["wrapper"]
             
             # Run test scenarios
             if args.mode in ["test", "all"]:
@@ -232,6 +355,13 @@ async def main():
     except Exception as e:
         print(f"\n💥 Fatal Error: {str(e)}")
         sys.exit(1)
+    finally:
+        credential_warmup.cancel()
+        if wrapper is not None:
+            await wrapper.close_sessions()
+            await wrapper.aclose()
+        await aclose_clients()
+        close_clients()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,682 @@
+#!/usr/bin/env python3
+"""
+Response Cache
+Request coalescing, near-duplicate and persistent response caching for stateless
+agent calls
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_WHITESPACE = re.compile(r"\s+")
+# Sentence punctuation at the edge of a word; symbols and operators (+ - * / = # %
+# and so on) change a prompt's meaning, and so do separators inside numbers like 3.5
+_PUNCTUATION = re.compile(r"""[.,!?;:'"…“”‘’«»¡¿]+(?=\s|$)|(?:^|(?<=\s))[.,!?;:'"…“”‘’«»¡¿]+""")
+
+# Prime modulus of the MinHash permutations (largest prime below 2**32)
+_MINHASH_PRIME = 4294967291
+
+# Default location of the persistent response cache, overridable with RESPONSE_CACHE_PATH
+DEFAULT_RESPONSE_CACHE_PATH = ".response_cache.sqlite3"
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Casefold and collapse whitespace so trivially different prompts share a key"""
+    return _WHITESPACE.sub(" ", prompt).strip().casefold()
+
+
+def make_prompt_key(prompt: str, *scope: str) -> str:
+    """
+    Build a cache key from a prompt and the agent configuration it is answered by
+    
+    Args:
+        prompt: User message
+        *scope: Values identifying the agent (endpoint, model, name, instructions, ...)
+    
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for part in scope:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x00")
+    digest.update(normalize_prompt(prompt).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def response_cache_key(model_deployment_name: str, instructions: str, prompt: str) -> str:
+    """
+    Build a persistent cache key that stays valid across restarts and re-created agents
+    
+    Args:
+        model_deployment_name: Model deployment answering the prompt
+        instructions: Agent system instructions
+        prompt: User message
+    
+    Returns:
+        Hex SHA-256 digest
+    """
+    return make_prompt_key(prompt, model_deployment_name, instructions)
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls onto one upstream call
+    
+    The first caller for a key starts the call; callers arriving while it is in flight
+    wait for the same result. The upstream call runs as its own task, so one caller
+    being cancelled does not fail the others.
+    """
+    
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+    
+    async def do(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run factory() for key, or join the call already in flight for it
+        
+        Args:
+            key: Coalescing key
+            factory: Zero-argument callable returning the awaitable to run
+        
+        Returns:
+            The result of the (shared) call
+        """
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(factory())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t, key=key: self._done(key, t))
+        return await asyncio.shield(task)
+    
+    def _done(self, key: str, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing statistics
+        
+        Returns:
+            Dictionary with calls, upstream calls, coalesced calls and the coalescing ratio
+        """
+        return {
+            "calls": self.calls,
+            "upstream_calls": self.calls - self.coalesced,
+            "coalesced": self.coalesced,
+            "coalescing_ratio": round(self.coalesced / self.calls, 4) if self.calls else 0.0,
+            "in_flight": len(self._in_flight)
+        }
+
+
+@dataclass
+class _SimilarityEntry:
+    """Cached response with the MinHash signature of its prompt"""
+    namespace: str
+    text: str
+    signature: "np.ndarray"
+    band_keys: List[Tuple[str, int, bytes]]
+    response: str
+
+
+class SimilarityCache:
+    """
+    In-memory response cache that also matches near-duplicate prompts
+    
+    Prompts are normalized (casefolded, punctuation removed, whitespace collapsed) and
+    split into character shingles. Each prompt gets a MinHash signature, and the
+    signature is split into LSH bands so lookups only compare against prompts sharing
+    at least one band. A candidate is a hit when the estimated Jaccard similarity of
+    the shingle sets reaches the threshold. Entries are namespaced per agent and
+    evicted least recently used first.
+    
+    Not thread-safe; use it from a single event loop.
+    """
+    
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        max_entries: int = 1024,
+        num_perm: int = 64,
+        bands: int = 16,
+        shingle_size: int = 4,
+        seed: int = 1
+    ):
+        """
+        Initialize the similarity cache
+        
+        Args:
+            threshold: Minimum estimated Jaccard similarity for a hit (0-1]
+            max_entries: Maximum cached responses across all namespaces
+            num_perm: MinHash signature length
+            bands: Number of LSH bands (must divide num_perm); more bands find
+                less similar candidates at the cost of more comparisons
+            shingle_size: Characters per shingle
+            seed: Seed of the MinHash permutations
+        """
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold must be in (0, 1]")
+        if num_perm % bands:
+            raise ValueError("bands must divide num_perm")
+        
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        
+        # numpy is only needed when the similarity cache is enabled
+        import numpy as np
+        
+        self._np = np
+        self._prime = np.uint64(_MINHASH_PRIME)
+        # Coefficients of the hash permutations (a*x + b) mod p; kept below 2**31 so
+        # the products of 32-bit shingle hashes fit in uint64
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2**31, size=num_perm, dtype=np.uint64)[:, None]
+        self._b = rng.integers(0, 2**31, size=num_perm, dtype=np.uint64)[:, None]
+        
+        self._entries: "OrderedDict[int, _SimilarityEntry]" = OrderedDict()
+        self._exact: Dict[Tuple[str, str], int] = {}
+        self._buckets: Dict[Tuple[str, int, bytes], Set[int]] = {}
+        self._next_id = 0
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lookup_seconds = 0.0
+    
+    @staticmethod
+    def normalize(prompt: str) -> str:
+        """Casefold, drop sentence punctuation and collapse whitespace"""
+        return normalize_prompt(_PUNCTUATION.sub(" ", prompt))
+    
+    def shingles(self, text: str) -> Set[int]:
+        """
+        Hash the character shingles of normalized text
+        
+        Args:
+            text: Normalized prompt
+        
+        Returns:
+            Set of 32-bit shingle hashes
+        """
+        k = self.shingle_size
+        if len(text) <= k:
+            return {zlib.crc32(text.encode("utf-8"))}
+        return {zlib.crc32(text[i:i + k].encode("utf-8")) for i in range(len(text) - k + 1)}
+    
+    def signature(self, text: str) -> "np.ndarray":
+        """
+        Compute the MinHash signature of normalized text
+        
+        Args:
+            text: Normalized prompt
+        
+        Returns:
+            uint64 array of length num_perm
+        """
+        hashes = self._np.fromiter(self.shingles(text), dtype=self._np.uint64)
+        return ((self._a * hashes + self._b) % self._prime).min(axis=1)
+    
+    def _band_keys(self, namespace: str, signature: "np.ndarray") -> List[Tuple[str, int, bytes]]:
+        rows = self.rows
+        return [(namespace, band, signature[band * rows:(band + 1) * rows].tobytes())
+                for band in range(self.bands)]
+    
+    def lookup(self, namespace: str, prompt: str) -> Optional[Tuple[str, float]]:
+        """
+        Find the cached response of the most similar prompt
+        
+        Args:
+            namespace: Agent namespace
+            prompt: User message
+        
+        Returns:
+            (response, similarity) or None on a miss
+        """
+        start = time.perf_counter()
+        try:
+            text = self.normalize(prompt)
+            entry_id = self._exact.get((namespace, text))
+            if entry_id is not None:
+                self._entries.move_to_end(entry_id)
+                self.hits += 1
+                return self._entries[entry_id].response, 1.0
+            
+            signature = self.signature(text)
+            candidates = set()
+            for key in self._band_keys(namespace, signature):
+                candidates.update(self._buckets.get(key, ()))
+            
+            best_id, best_score = None, 0.0
+            for candidate in candidates:
+                score = float(self._np.count_nonzero(self._entries[candidate].signature == signature)) / self.num_perm
+                if score > best_score:
+                    best_id, best_score = candidate, score
+            
+            if best_id is None or best_score < self.threshold:
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            return self._entries[best_id].response, best_score
+        finally:
+            self._lookup_seconds += time.perf_counter() - start
+    
+    def get(self, namespace: str, prompt: str) -> Optional[str]:
+        """
+        Get the cached response for a prompt or a near-duplicate of it
+        
+        Args:
+            namespace: Agent namespace
+            prompt: User message
+        
+        Returns:
+            Cached response or None
+        """
+        match = self.lookup(namespace, prompt)
+        return match[0] if match else None
+    
+    def put(self, namespace: str, prompt: str, response: str):
+        """
+        Cache a response
+        
+        Args:
+            namespace: Agent namespace
+            prompt: User message the response answers
+            response: Agent response
+        """
+        text = self.normalize(prompt)
+        existing = self._exact.get((namespace, text))
+        if existing is not None:
+            self._entries[existing].response = response
+            self._entries.move_to_end(existing)
+            return
+        
+        signature = self.signature(text)
+        entry_id = self._next_id
+        self._next_id += 1
+        entry = _SimilarityEntry(namespace, text, signature, self._band_keys(namespace, signature), response)
+        self._entries[entry_id] = entry
+        self._exact[(namespace, text)] = entry_id
+        for key in entry.band_keys:
+            self._buckets.setdefault(key, set()).add(entry_id)
+        
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+    
+    def _remove(self, entry_id: int):
+        entry = self._entries.pop(entry_id)
+        del self._exact[(entry.namespace, entry.text)]
+        for key in entry.band_keys:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[key]
+    
+    def clear(self, namespace: Optional[str] = None):
+        """
+        Drop cached responses
+        
+        Args:
+            namespace: Only drop this agent's entries (default: everything)
+        """
+        for entry_id in [i for i, entry in self._entries.items()
+                         if namespace is None or entry.namespace == namespace]:
+            self._remove(entry_id)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+        
+        Returns:
+            Dictionary with entries, hits, misses, hit ratio, evictions and mean lookup time
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "mean_lookup_ms": round(self._lookup_seconds / lookups * 1000, 4) if lookups else 0.0
+        }
+
+
+class TieredResponseCache:
+    """
+    Two-tier response cache: an in-memory LRU in front of a SQLite store
+    
+    The SQLite file runs in WAL mode and survives restarts; keep it on a local disk,
+    since SQLite's WAL locking is unsafe on network filesystems. Entries expire after
+    their TTL. Compaction removes expired entries, trims the store to its entry and
+    byte caps by least recent access, and returns freed pages to the filesystem.
+    
+    get/put are thread-safe and block on SQLite; from an event loop use aget/aput,
+    which run SQLite work in worker threads and compact in the background, and
+    aclose. Memory-tier hits are recorded in SQLite in batches, with the next disk
+    operation, so compaction evicts by actual recency of use.
+    """
+    
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl: float = 24 * 3600,
+        max_memory_entries: int = 1024,
+        max_entries: int = 100_000,
+        max_bytes: int = 256 * 1024 * 1024,
+        compact_every: int = 500
+    ):
+        """
+        Initialize the tiered response cache
+        
+        Args:
+            path: SQLite file path (defaults to RESPONSE_CACHE_PATH or .response_cache.sqlite3)
+            ttl: Default entry lifetime in seconds
+            max_memory_entries: Maximum entries of the in-memory tier
+            max_entries: Maximum entries of the SQLite tier
+            max_bytes: Maximum total response size (UTF-8 bytes) of the SQLite tier
+            compact_every: Compact the SQLite tier after this many writes
+        """
+        self.path = path or os.getenv("RESPONSE_CACHE_PATH", DEFAULT_RESPONSE_CACHE_PATH)
+        self.ttl = ttl
+        self.max_memory_entries = max_memory_entries
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.compact_every = compact_every
+        
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        # Guards the memory tier and counters; never held during SQLite work
+        self._lock = threading.Lock()
+        # Serializes use of the SQLite connection
+        self._db_lock = threading.Lock()
+        self._writes = 0
+        self._compaction: Optional[asyncio.Future] = None
+        # Access times of memory-tier hits not yet written to SQLite
+        self._touched: Dict[str, float] = {}
+        
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        # auto_vacuum only takes effect before the first table is created
+        self._db.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                expires REAL NOT NULL,
+                accessed REAL NOT NULL
+            )
+        """)
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        # Kept in memory so stats() never queries SQLite; corrected on every compaction
+        self._disk_entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    
+    def _remember(self, key: str, response: str, expires: float):
+        """Put an entry in the memory tier, evicting least recently used entries"""
+        self._memory[key] = (response, expires)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+    
+    def _memory_get(self, key: str, now: float) -> Optional[str]:
+        """Look up the memory tier, dropping an expired entry"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= now:
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            self._touched[key] = now
+            self.memory_hits += 1
+            return entry[0]
+    
+    def _flush_touched(self):
+        """Write batched memory-tier access times to SQLite (call with _db_lock held)"""
+        with self._lock:
+            touched, self._touched = self._touched, {}
+        if touched:
+            self._db.executemany(
+                "UPDATE responses SET accessed = MAX(accessed, ?) WHERE key = ?",
+                [(accessed, key) for key, accessed in touched.items()]
+            )
+    
+    def _disk_get(self, key: str, now: float) -> Optional[str]:
+        """Look up the SQLite tier, promoting a hit into memory"""
+        with self._db_lock:
+            try:
+                self._flush_touched()
+                row = self._db.execute(
+                    "SELECT response, expires FROM responses WHERE key = ? AND expires > ?", (key, now)
+                ).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            except sqlite3.Error as e:
+                print(f"⚠️  Response cache read failed: {str(e)}")
+                row = None
+        
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self._remember(key, row[0], row[1])
+            self.disk_hits += 1
+            return row[0]
+    
+    def _disk_put(self, key: str, response: str, now: float, expires: float) -> bool:
+        """Write an entry to the SQLite tier; True when compaction is due"""
+        with self._db_lock:
+            try:
+                self._flush_touched()
+                exists = self._db.execute("SELECT 1 FROM responses WHERE key = ?", (key,)).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, size, created, expires, accessed) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, response, len(response.encode("utf-8")), now, expires, now)
+                )
+            except sqlite3.Error as e:
+                print(f"⚠️  Response cache write failed: {str(e)}")
+                return False
+        with self._lock:
+            if not exists:
+                self._disk_entries += 1
+            self._writes += 1
+            return self._writes % self.compact_every == 0
+    
+    def _prepare_put(self, key: str, response: str, ttl: Optional[float]) -> Tuple[float, float]:
+        """Put an entry in the memory tier and return its creation and expiry times"""
+        now = time.time()
+        expires = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._remember(key, response, expires)
+        return now, expires
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a response, promoting SQLite hits into memory
+        
+        Args:
+            key: Key from response_cache_key
+        
+        Returns:
+            Cached response or None if missing or expired
+        """
+        now = time.time()
+        response = self._memory_get(key, now)
+        if response is not None:
+            return response
+        return self._disk_get(key, now)
+    
+    async def aget(self, key: str) -> Optional[str]:
+        """
+        Look up a response without blocking the event loop on SQLite
+        
+        Args:
+            key: Key from response_cache_key
+        
+        Returns:
+            Cached response or None if missing or expired
+        """
+        now = time.time()
+        response = self._memory_get(key, now)
+        if response is not None:
+            return response
+        return await asyncio.to_thread(self._disk_get, key, now)
+    
+    def put(self, key: str, response: str, ttl: Optional[float] = None):
+        """
+        Store a response in both tiers
+        
+        Args:
+            key: Key from response_cache_key
+            response: Agent response
+            ttl: Lifetime in seconds (defaults to the cache TTL)
+        """
+        now, expires = self._prepare_put(key, response, ttl)
+        if self._disk_put(key, response, now, expires):
+            self.compact()
+    
+    async def aput(self, key: str, response: str, ttl: Optional[float] = None):
+        """
+        Store a response in both tiers without blocking the event loop on SQLite
+        
+        Compaction, when due, runs in the background.
+        
+        Args:
+            key: Key from response_cache_key
+            response: Agent response
+            ttl: Lifetime in seconds (defaults to the cache TTL)
+        """
+        now, expires = self._prepare_put(key, response, ttl)
+        if await asyncio.to_thread(self._disk_put, key, response, now, expires):
+            self.compact_in_background()
+    
+    def compact_in_background(self) -> asyncio.Future:
+        """
+        Start compacting in a worker thread unless a compaction is already running
+        
+        Returns:
+            Future of the running compaction's result
+        """
+        if self._compaction is None or self._compaction.done():
+            self._compaction = asyncio.ensure_future(asyncio.to_thread(self.compact))
+        return self._compaction
+    
+    def compact(self) -> int:
+        """
+        Remove expired entries, enforce the size caps and reclaim free space
+        
+        Returns:
+            Number of entries removed from the SQLite tier
+        """
+        now = time.time()
+        with self._lock:
+            for key in [k for k, (_, expires) in self._memory.items() if expires <= now]:
+                del self._memory[key]
+        
+        with self._db_lock:
+            try:
+                self._flush_touched()
+                removed = self._db.execute("DELETE FROM responses WHERE expires <= ?", (now,)).rowcount
+                
+                count, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+                if count > self.max_entries or total > self.max_bytes:
+                    # Walk entries from least to most recently accessed until both caps hold
+                    stale = []
+                    for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed"):
+                        if count <= self.max_entries and total <= self.max_bytes:
+                            break
+                        stale.append((key,))
+                        count -= 1
+                        total -= size
+                    self._db.executemany("DELETE FROM responses WHERE key = ?", stale)
+                    removed += len(stale)
+                with self._lock:
+                    self._disk_entries = count
+                
+                self._db.execute("PRAGMA incremental_vacuum")
+                self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error as e:
+                print(f"⚠️  Response cache compaction failed: {str(e)}")
+                return 0
+        return removed
+    
+    def clear(self):
+        """Drop every cached response"""
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+        with self._db_lock:
+            self._db.execute("DELETE FROM responses")
+        with self._lock:
+            self._disk_entries = 0
+    
+    def close(self):
+        """Record pending accesses and close the SQLite connection, waiting for a running compaction"""
+        with self._db_lock:
+            try:
+                self._flush_touched()
+            except sqlite3.Error as e:
+                print(f"⚠️  Could not record response cache accesses: {str(e)}")
+            self._db.close()
+    
+    async def aclose(self):
+        """Wait for a background compaction, then close without blocking the event loop"""
+        if self._compaction is not None:
+            await asyncio.gather(self._compaction, return_exceptions=True)
+        await asyncio.to_thread(self.close)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+        
+        Returns:
+            Dictionary with per-tier hits, misses, hit ratio and entry counts
+        """
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "path": self.path,
+                "memory_entries": len(self._memory),
+                "disk_entries": self._disk_entries,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0
+            }
@@ -5,16 +5,25 @@ Wraps Azure AI Foundry agents with Semantic Kernel functionality
 """
 
 import os
+import sys
+import time
+import signal
 import asyncio
-from typing import Optional, Dict, Any, List
+import threading
+from collections import deque
+from typing import Optional, Dict, Any, List, AsyncContextManager, AsyncIterator, Callable
 from dataclasses import dataclass
 
 from semantic_kernel import Kernel
-from semantic_kernel.agents import AzureAIAgent
+from semantic_kernel.agents import AzureAIAgent, AzureAIAgentThread
 # Azure AI Inference connection handled by AzureAIAgent
 from semantic_kernel.contents.chat_message_content import ChatMessageContent
-from azure.ai.projects import AIProjectClient
-from azure.identity import DefaultAzureCredential
+from semantic_kernel.contents.streaming_text_content import StreamingTextContent
+from semantic_kernel.contents.utils.author_role import AuthorRole
+
+from agent_registry import AgentRegistry, agent_definition_key
+from azure_clients import get_async_project_client
+from response_cache import SimilarityCache, SingleFlight, TieredResponseCache, make_prompt_key, response_cache_key
 
 
 @dataclass
@@ -25,6 +34,126 @@ class AgentConfig:
     agent_name: str = "SemanticKernelAgent"
     agent_instructions: str = "You are a helpful AI assistant."
     agent_description: str = "Semantic Kernel wrapped Azure AI agent"
+    reuse_agent: bool = True
+    coalesce_requests: bool = True
+    # Opt-in cache answering stateless near-duplicate prompts without calling the agent
+    similarity_cache: bool = False
+    similarity_threshold: float = 0.8
+    similarity_cache_size: int = 1024
+    # Opt-in persistent cache of exact stateless prompts kept across restarts
+    response_cache_path: Optional[str] = None
+    response_cache_ttl: float = 24 * 3600
+
+
+def _reply_text(chunk) -> str:
+    """
+    Get the text a streamed chunk adds to the agent's reply
+    
+    Code interpreter input (flagged with "code" metadata), non-assistant messages and
+    non-text items such as file references and annotations contribute nothing.
+    """
+    if chunk is None or chunk.role != AuthorRole.ASSISTANT or (chunk.metadata or {}).get("code"):
+        return ""
+    return "".join(item.text for item in chunk.items if isinstance(item, StreamingTextContent) and item.text)
+
+
+class AgentResponseStream:
+    """
+    Streaming agent response
+    
+    Iterate with `async for` to receive text chunks as they are generated, and
+    `await` the object (or call text()) for the full response. Time-to-first-token
+    and total latency are recorded for every call.
+    """
+    
+    def __init__(self, chunks: AsyncIterator[str], on_complete: Optional[Callable[[Dict[str, Any]], None]] = None):
+        """
+        Initialize the response stream
+        
+        Args:
+            chunks: Async iterator of text chunks
+            on_complete: Called with metrics() once the stream has finished
+        """
+        self._chunks = chunks
+        self._parts: List[str] = []
+        self._on_complete = on_complete
+        self.started_at = time.perf_counter()
+        self.first_token_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[BaseException] = None
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self) -> str:
+        if self.finished_at is not None:
+            raise StopAsyncIteration
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self._finish()
+            raise
+        except BaseException as e:
+            self._finish(e)
+            raise
+        
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        self._parts.append(chunk)
+        return chunk
+    
+    def _finish(self, error: Optional[BaseException] = None):
+        """Record completion and report metrics"""
+        self.finished_at = time.perf_counter()
+        self.error = error
+        if self._on_complete:
+            self._on_complete(self.metrics())
+    
+    async def text(self) -> str:
+        """
+        Consume any remaining chunks and return the full response text
+        
+        Returns:
+            The complete response
+        """
+        async for _ in self:
+            pass
+        return "".join(self._parts)
+    
+    def __await__(self):
+        return self.text().__await__()
+    
+    async def aclose(self):
+        """Stop streaming early and release the underlying request"""
+        if self.finished_at is None:
+            close = getattr(self._chunks, "aclose", None)
+            if close:
+                await close()
+            self._finish(asyncio.CancelledError("Response stream closed early"))
+    
+    @property
+    def time_to_first_token(self) -> Optional[float]:
+        """Seconds from the call until the first chunk arrived"""
+        return self.first_token_at - self.started_at if self.first_token_at else None
+    
+    @property
+    def total_latency(self) -> Optional[float]:
+        """Seconds from the call until the stream finished"""
+        return self.finished_at - self.started_at if self.finished_at else None
+    
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get latency metrics for this call
+        
+        Returns:
+            Dictionary with time_to_first_token, total_latency, chunks and success
+        """
+        return {
+            "time_to_first_token": self.time_to_first_token,
+            "total_latency": self.total_latency,
+            "chunks": len(self._parts),
+            "success": self.finished_at is not None and self.error is None
+        }
 
 
 class SemanticKernelAgentWrapper:
@@ -32,17 +161,33 @@ class SemanticKernelAgentWrapper:
     Wrapper class that integrates Azure AI Foundry agents with Semantic Kernel
     """
     
-    def __init__(self, config: AgentConfig):
+    def __init__(self, config: AgentConfig, registry: Optional[AgentRegistry] = None):
         """
         Initialize the Semantic Kernel Agent Wrapper
         
         Args:
             config: AgentConfig containing connection and agent details
+            registry: Agent registry used when config.reuse_agent is set (defaults to the local file)
         """
         self.config = config
+        self.registry = registry or AgentRegistry()
         self.kernel = None
         self.agent = None
         self.client = None
+        # Conversation threads by session ID, created on first use and reused across turns
+        self.sessions: Dict[str, AzureAIAgentThread] = {}
+        # Latency metrics of recent streamed responses
+        self.response_metrics = deque(maxlen=1000)
+        # Joins concurrent identical stateless requests onto one agent call
+        self.single_flight = SingleFlight()
+        self.similarity_cache = SimilarityCache(
+            threshold=config.similarity_threshold,
+            max_entries=config.similarity_cache_size
+        ) if config.similarity_cache else None
+        self.response_cache = TieredResponseCache(
+            config.response_cache_path,
+            ttl=config.response_cache_ttl
+        ) if config.response_cache_path else None
         self._initialize_kernel()
     
     def _initialize_kernel(self):
@@ -67,26 +212,11 @@ class SemanticKernelAgentWrapper:
             AzureAIAgent instance
         """
         try:
-            # Create AI Project Client using the async version
-            from azure.ai.projects.aio import AIProjectClient as AsyncAIProjectClient
+            # Use the shared async AI Project Client for this endpoint
+            self.client = get_async_project_client(self.config.project_endpoint)
             
-            self.client = AsyncAIProjectClient(
-                endpoint=self.config.project_endpoint,
-                credential=DefaultAzureCredential()
-            )
-            
-            # First create the agent using Azure AI Projects API
-            from azure.ai.agents.models import CodeInterpreterTool
-            
-            agent_definition = await self.client.agents.create_agent(
-                model=self.config.model_deployment_name,
-                name=self.config.agent_name,
-                instructions=self.config.agent_instructions,
-                tools=CodeInterpreterTool().definitions,
-                description=self.config.agent_description
-            )
-            
-            print(f"✅ Azure AI Agent '{agent_definition.name}' created with ID: {agent_definition.id}")
+            # First get or create the agent using Azure AI Projects API
+            agent_definition = await self._get_or_create_definition()
             
             # Now wrap it with Semantic Kernel
             self.agent = AzureAIAgent(
@@ -102,57 +232,225 @@ class SemanticKernelAgentWrapper:
             print(f"❌ Error creating agent: {str(e)}")
             raise
     
-    async def chat_with_agent(self, message: str) -> str:
+    async def _get_or_create_definition(self):
+        """Reuse the registered agent for this configuration, or create and register one"""
+        from azure.ai.agents.models import CodeInterpreterTool
+        from azure.core.exceptions import ResourceNotFoundError
+        
+        tools = CodeInterpreterTool().definitions
+        key = agent_definition_key(
+            self.config.project_endpoint,
+            self.config.agent_name,
+            self.config.model_deployment_name,
+            self.config.agent_instructions,
+            tools,
+            self.config.agent_description
+        )
+        
+        # Registry file I/O runs off the event loop
+        agent_id = await asyncio.to_thread(self.registry.get, key) if self.config.reuse_agent else None
+        if agent_id:
+            try:
+                agent_definition = await self.client.agents.get_agent(agent_id)
+                print(f"♻️  Reusing Azure AI Agent '{agent_definition.name}' with ID: {agent_definition.id}")
+                return agent_definition
+            except ResourceNotFoundError:
+                print(f"ℹ️  Registered agent {agent_id} no longer exists, creating a new one")
+                await asyncio.to_thread(self.registry.remove, key=key)
+            except Exception as e:
+                print(f"⚠️  Could not validate registered agent {agent_id}: {str(e)}")
+        
+        agent_definition = await self.client.agents.create_agent(
+            model=self.config.model_deployment_name,
+            name=self.config.agent_name,
+            instructions=self.config.agent_instructions,
+            tools=tools,
+            description=self.config.agent_description
+        )
+        
+        print(f"✅ Azure AI Agent '{agent_definition.name}' created with ID: {agent_definition.id}")
+        if self.config.reuse_agent:
+            await asyncio.to_thread(self.registry.register, key, agent_definition.id, agent_definition.name)
+        return agent_definition
+    
+    def _session_thread(self, session_id: Optional[str]) -> AzureAIAgentThread:
+        """
+        Get the thread for a session, or a temporary thread when session_id is None
+        
+        The server-side thread is only created when the first message is sent.
+        """
+        if session_id is None:
+            return AzureAIAgentThread(client=self.client)
+        
+        thread = self.sessions.get(session_id)
+        if thread is None:
+            thread = AzureAIAgentThread(client=self.client)
+            self.sessions[session_id] = thread
+        return thread
+    
+    async def _release_thread(self, thread: AzureAIAgentThread, session_id: Optional[str]):
+        """Delete a temporary (stateless) thread once its turn is over"""
+        if session_id is None and thread.id is not None:
+            try:
+                await thread.delete()
+            except Exception as e:
+                print(f"⚠️  Could not delete temporary thread {thread.id}: {str(e)}")
+    
+    async def reset_session(self, session_id: str = "default"):
+        """
+        Clear a session's conversation context
+        
+        The session's thread is deleted and a fresh one is created on the next turn.
+        
+        Args:
+            session_id: Session identifier
+        """
+        await self.delete_session(session_id)
+        self.sessions[session_id] = AzureAIAgentThread(client=self.client)
+    
+    async def delete_session(self, session_id: str = "default") -> bool:
+        """
+        Delete a session and its server-side thread
+        
+        Args:
+            session_id: Session identifier
+            
+        Returns:
+            True if the session existed
+        """
+        thread = self.sessions.pop(session_id, None)
+        if thread is None:
+            return False
+        try:
+            await thread.delete()
+        except Exception as e:
+            print(f"⚠️  Could not delete thread for session '{session_id}': {str(e)}")
+        return True
+    
+    async def close_sessions(self):
+        """Delete every session thread"""
+        for session_id in list(self.sessions):
+            await self.delete_session(session_id)
+    
+    async def aclose(self):
+        """Close the persistent response cache once any background compaction has finished"""
+        if self.response_cache is not None:
+            await self.response_cache.aclose()
+    
+    async def chat_with_agent(
+        self,
+        message: str,
+        session_id: Optional[str] = "default",
+        admission: Optional[Callable[[], AsyncContextManager]] = None
+    ) -> str:
         """
         Send a message to the agent and get a response
         
+        Stateless turns (session_id=None) are answered from the persistent response
+        cache when config.response_cache_path is set and the same prompt was answered
+        before, or from the similarity cache when config.similarity_cache is set and a
+        near-duplicate was; otherwise they share the agent call of an identical turn
+        already in flight when config.coalesce_requests is set.
+        
         Args:
             message: User message to send to the agent
+            session_id: Conversation to continue; None runs a stateless turn on a
+                temporary thread that is deleted afterwards
+            admission: Context manager factory entered only around an actual agent
+                call (not cache hits or coalesced followers), e.g. to take a
+                concurrency slot
             
         Returns:
             Agent's response as a string
         """
+        async def call_agent() -> str:
+            if admission is None:
+                return await self._chat_once(message, session_id)
+            async with admission():
+                return await self._chat_once(message, session_id)
+        
+        if session_id is not None:
+            return await call_agent()
+        
+        if self.response_cache is not None:
+            cached = await self.response_cache.aget(self._response_cache_key(message))
+            if cached is not None:
+                return cached
+        
+        if self.similarity_cache is not None:
+            cached = self.similarity_cache.get(self._cache_namespace(), message)
+            if cached is not None:
+                return cached
+        
+        if self.config.coalesce_requests:
+            return await self.single_flight.do(self._prompt_key(message), call_agent)
+        return await call_agent()
+    
+    async def _chat_once(self, message: str, session_id: Optional[str]) -> str:
+        """Run one turn against the agent and collect the full response"""
+        # Built on the streaming response so no intermediate messages are buffered
+        response = await self.chat_stream(message, session_id=session_id)
+        if response and session_id is None:
+            if self.response_cache is not None:
+                await self.response_cache.aput(self._response_cache_key(message), response)
+            if self.similarity_cache is not None:
+                self.similarity_cache.put(self._cache_namespace(), message, response)
+        return response or "No response received from agent"
+    
+    def _response_cache_key(self, message: str) -> str:
+        """Persistent cache key: independent of agent IDs so entries outlive re-created agents"""
+        return response_cache_key(self.config.model_deployment_name, self.config.agent_instructions, message)
+    
+    def _cache_namespace(self) -> str:
+        """Cache namespace of this agent, so agents never answer from each other's entries"""
+        return self.agent.id if self.agent else self.config.agent_name
+    
+    def _prompt_key(self, message: str) -> str:
+        """Key of a stateless request: the normalized message scoped to this agent's configuration"""
+        return make_prompt_key(
+            message,
+            self.config.project_endpoint,
+            self.config.model_deployment_name,
+            self.config.agent_name,
+            self.config.agent_instructions,
+            self.agent.id if self.agent else ""
+        )
+    
+    def chat_stream(self, message: str, session_id: Optional[str] = "default") -> AgentResponseStream:
+        """
+        Send a message to the agent and stream the response text
+        
+        Example:
+            response = wrapper.chat_stream("Hello")
+            async for chunk in response:
+                print(chunk, end="")
+            text = await response
+        
+        Args:
+            message: User message to send to the agent
+            session_id: Conversation to continue; None runs a stateless turn
+            
+        Returns:
+            AgentResponseStream of text chunks with latency metrics
+        """
         if not self.agent:
             raise RuntimeError("Agent not created. Call create_agent() first.")
         
-        try:
-            # Use invoke method which returns an async generator
-            messages = []
-            async for message_chunk in self.agent.invoke(message):
-                messages.append(message_chunk)
-            
-            if messages:
-                # Find the last assistant message
-                for msg in reversed(messages):
-                    if hasattr(msg, 'role') and msg.role == 'assistant':
-                        if hasattr(msg, 'content'):
-                            content = msg.content
-                            if isinstance(content, str):
-                                return content
-                            elif hasattr(content, 'text'):
-                                return str(content.text)
-                            elif hasattr(content, 'value'):
-                                return str(content.value)
-                            else:
-                                return str(content)
-                        else:
-                            return str(msg)
-                
-                # If no assistant message found, return info about what we got
-                return f"Received {len(messages)} messages but no assistant response found"
-            
-            return "No response received from agent"
-                
-        except Exception as e:
-            print(f"❌ Error getting agent response: {str(e)}")
-            raise
+        async def _chunks():
+            async for chunk in self.stream_chat_with_agent(message, session_id=session_id):
+                text = _reply_text(chunk)
+                if text:
+                    yield text
+        
+        return AgentResponseStream(_chunks(), on_complete=self.response_metrics.append)
     
-    async def stream_chat_with_agent(self, message: str):
+    async def stream_chat_with_agent(self, message: str, session_id: Optional[str] = "default"):
         """
         Stream a conversation with the agent
         
         Args:
             message: User message to send to the agent
+            session_id: Conversation to continue; None runs a stateless turn
             
         Yields:
             Streaming response chunks
@@ -160,20 +458,24 @@ class SemanticKernelAgentWrapper:
         if not self.agent:
             raise RuntimeError("Agent not created. Call create_agent() first.")
         
+        thread = self._session_thread(session_id)
         try:
-            async for chunk in self.agent.invoke_stream(message):
-                yield chunk
+            async for response in self.agent.invoke_stream(messages=message, thread=thread):
+                yield response.message
                 
         except Exception as e:
             print(f"❌ Error streaming agent response: {str(e)}")
             raise
+        finally:
+            await self._release_thread(thread, session_id)
     
-    async def invoke_agent(self, message: str) -> List[ChatMessageContent]:
+    async def invoke_agent(self, message: str, session_id: Optional[str] = "default") -> List[ChatMessageContent]:
         """
-        Invoke the agent and get full message history
+        Invoke the agent and get all messages it produced for this turn
         
         Args:
             message: User message to send to the agent
+            session_id: Conversation to continue; None runs a stateless turn
             
         Returns:
             List of ChatMessageContent objects
@@ -181,13 +483,15 @@ class SemanticKernelAgentWrapper:
         if not self.agent:
             raise RuntimeError("Agent not created. Call create_agent() first.")
         
+        thread = self._session_thread(session_id)
         try:
-            response = await self.agent.invoke(message)
-            return response
+            return [response.message async for response in self.agent.invoke(messages=message, thread=thread)]
             
         except Exception as e:
             print(f"❌ Error invoking agent: {str(e)}")
             raise
+        finally:
+            await self._release_thread(thread, session_id)
     
     def get_agent_info(self) -> Dict[str, Any]:
         """
@@ -204,62 +508,178 @@ class SemanticKernelAgentWrapper:
             "model": self.config.model_deployment_name,
             "instructions": self.config.agent_instructions,
             "description": self.config.agent_description,
-            "endpoint": self.config.project_endpoint
+            "endpoint": self.config.project_endpoint,
+            "sessions": len(self.sessions),
+            "coalescing": self.single_flight.stats(),
+            "similarity_cache": self.similarity_cache.stats() if self.similarity_cache else None,
+            "response_cache": self.response_cache.stats() if self.response_cache else None
         }
 
 
+class AsyncLineReader:
+    """Reads stdin on a background thread and hands lines to the event loop through an asyncio.Queue"""
+    
+    def __init__(self, stream=None):
+        """
+        Initialize the line reader
+        
+        Args:
+            stream: Text stream to read (defaults to sys.stdin)
+        """
+        self.stream = stream or sys.stdin
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop = None
+        self._thread = None
+    
+    def start(self):
+        """Start the reader thread (must be called from the event loop)"""
+        if self._thread is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._thread = threading.Thread(target=self._read_lines, name="stdin-reader", daemon=True)
+        self._thread.start()
+    
+    def _read_lines(self):
+        """Blocking read loop; runs on the reader thread"""
+        while True:
+            try:
+                line = self.stream.readline()
+            except (OSError, ValueError):
+                line = ""
+            # An empty string means end of input
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, line.rstrip("\n") if line else None)
+            if not line:
+                return
+    
+    async def readline(self, prompt: str = "") -> Optional[str]:
+        """
+        Wait for the next line without blocking the event loop
+        
+        Args:
+            prompt: Text printed before waiting
+            
+        Returns:
+            The line without its newline, or None at end of input
+        """
+        self.start()
+        if prompt:
+            print(prompt, end="", flush=True)
+        return await self._queue.get()
+    
+    def feed_eof(self):
+        """Wake up a pending readline() as if input had ended"""
+        if self._queue is not None:
+            self._queue.put_nowait(None)
+
+
 class InteractiveAgentSession:
     """Interactive session manager for the Semantic Kernel Agent"""
     
-    def __init__(self, wrapper: SemanticKernelAgentWrapper):
+    def __init__(self, wrapper: SemanticKernelAgentWrapper, reader: Optional[AsyncLineReader] = None):
         self.wrapper = wrapper
+        self.reader = reader or AsyncLineReader()
+        self._reply_task: Optional[asyncio.Task] = None
+    
+    def _on_interrupt(self):
+        """Ctrl-C cancels the reply in flight, or ends the session while waiting for input"""
+        if self._reply_task is not None and not self._reply_task.done():
+            self._reply_task.cancel()
+        else:
+            print("\n\n👋 Session interrupted. Goodbye!")
+            self.reader.feed_eof()
+    
+    async def _run_reply(self, coro) -> bool:
+        """Run a reply as a cancellable task; returns False if it was interrupted"""
+        self._reply_task = asyncio.create_task(coro)
+        try:
+            await self._reply_task
+            return True
+        except asyncio.CancelledError:
+            # Only swallow cancellations triggered by Ctrl-C, not of the session itself
+            if asyncio.current_task().cancelling():
+                raise
+            print("\n⏹️  Response interrupted")
+            return False
+        finally:
+            self._reply_task = None
+    
+    async def _stream_reply(self, message: str):
+        """Print a streamed reply with its latency"""
+        print(f"\n🤖 Agent (streaming): ", end="", flush=True)
+        response = self.wrapper.chat_stream(message)
+        async for chunk in response:
+            print(chunk, end="", flush=True)
+        print()  # New line after streaming
         
+        metrics = response.metrics()
+        if metrics["time_to_first_token"] is not None:
+            print(f"   ⏱️  First token {metrics['time_to_first_token']:.2f}s, total {metrics['total_latency']:.2f}s")
+    
+    async def _chat_reply(self, message: str):
+        """Print a complete reply"""
+        print(f"\n🤖 Agent: ", end="", flush=True)
+        response = await self.wrapper.chat_with_agent(message)
+        print(response)
+    
     async def start_interactive_session(self):
         """Start an interactive chat session with the agent"""
         print("\n🤖 Starting interactive session with Semantic Kernel Agent")
         print("💡 Type 'quit', 'exit', or 'bye' to end the session")
         print("💡 Type 'info' to see agent information")
+        print("💡 Type 'reset' to start a new conversation")
         print("💡 Type 'stream' before your message to get streaming responses")
+        print("💡 Press Ctrl-C to interrupt a response")
         print("-" * 60)
         
-        while True:
-            try:
-                user_input = input("\n👤 You: ").strip()
-                
-                if user_input.lower() in ['quit', 'exit', 'bye']:
-                    print("👋 Goodbye!")
-                    break
-                
-                if user_input.lower() == 'info':
-                    info = self.wrapper.get_agent_info()
-                    print(f"\n📋 Agent Info:")
-                    for key, value in info.items():
-                        print(f"   {key}: {value}")
-                    continue
-                
-                if user_input.lower().startswith('stream '):
-                    message = user_input[7:]  # Remove 'stream ' prefix
-                    print(f"\n🤖 Agent (streaming): ", end="", flush=True)
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGINT, self._on_interrupt)
+            handles_sigint = True
+        except (NotImplementedError, RuntimeError):
+            # Signal handlers are unavailable on Windows event loops
+            handles_sigint = False
+        
+        try:
+            while True:
+                try:
+                    user_input = await self.reader.readline("\n👤 You: ")
+                    if user_input is None:
+                        break
+                    user_input = user_input.strip()
                     
-                    full_response = ""
-                    async for chunk in self.wrapper.stream_chat_with_agent(message):
-                        if chunk and hasattr(chunk, 'content'):
-                            content = str(chunk.content)
-                            print(content, end="", flush=True)
-                            full_response += content
-                    print()  # New line after streaming
-                    continue
-                
-                if user_input:
-                    print(f"\n🤖 Agent: ", end="", flush=True)
-                    response = await self.wrapper.chat_with_agent(user_input)
-                    print(response)
-                
-            except KeyboardInterrupt:
-                print("\n\n👋 Session interrupted. Goodbye!")
-                break
-            except Exception as e:
-                print(f"\n❌ Error: {str(e)}")
+                    if user_input.lower() in ['quit', 'exit', 'bye']:
+                        print("👋 Goodbye!")
+                        break
+                    
+                    if user_input.lower() == 'info':
+                        info = self.wrapper.get_agent_info()
+                        print(f"\n📋 Agent Info:")
+                        for key, value in info.items():
+                            print(f"   {key}: {value}")
+                        continue
+                    
+                    if user_input.lower() == 'reset':
+                        await self.wrapper.reset_session()
+                        print("🔄 Conversation reset")
+                        continue
+                    
+                    if user_input.lower().startswith('stream '):
+                        message = user_input[7:]  # Remove 'stream ' prefix
+                        await self._run_reply(self._stream_reply(message))
+                        continue
+                    
+                    if user_input:
+                        await self._run_reply(self._chat_reply(user_input))
+                    
+                except KeyboardInterrupt:
+                    print("\n\n👋 Session interrupted. Goodbye!")
+                    break
+                except Exception as e:
+                    print(f"\n❌ Error: {str(e)}")
+        finally:
+            if handles_sigint:
+                loop.remove_signal_handler(signal.SIGINT)
 
 
 async def main():
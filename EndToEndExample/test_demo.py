@@ -11,7 +11,7 @@ from pathlib import Path
 # Add current directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from ai_foundry_agent_creator import AIFoundryAgentCreator
+from ai_foundry_agent_creator import AIFoundryAgentCreator, AsyncAIFoundryAgentCreator
 from semantic_kernel_agent_wrapper import AgentConfig, SemanticKernelAgentWrapper
 
 
@@ -51,6 +51,13 @@ def test_class_initialization():
         )
         print("✅ AIFoundryAgentCreator initialized successfully")
         
+        # Test AsyncAIFoundryAgentCreator initialization (client is resolved lazily)
+        async_creator = AsyncAIFoundryAgentCreator(
+            project_endpoint="https://test.endpoint.com",
+            model_deployment_name="gpt-4o-mini"
+        )
+        print("✅ AsyncAIFoundryAgentCreator initialized successfully")
+        
         # Test AgentConfig
         config = AgentConfig(
             project_endpoint="https://test.endpoint.com",
@@ -154,6 +161,686 @@ def test_semantic_kernel_initialization():
         return False
 
 
+def test_chat_stream_skips_code():
+    """Test that streamed replies leave out code interpreter input and non-text content"""
+    print("\n💬 Testing streamed reply filtering...")
+    
+    try:
+        from semantic_kernel.contents import (
+            StreamingChatMessageContent, StreamingFileReferenceContent, StreamingTextContent
+        )
+        from semantic_kernel.contents.utils.author_role import AuthorRole
+        
+        def chunk(*items, role=AuthorRole.ASSISTANT, metadata=None):
+            return StreamingChatMessageContent(role=role, items=list(items), choice_index=0, metadata=metadata or {})
+        
+        def text(value):
+            return StreamingTextContent(text=value, choice_index=0)
+        
+        async def fake_stream(message, session_id="default"):
+            yield chunk(text("Let me "))
+            # Code interpreter input as SemanticKernel streams it
+            yield chunk(text("print(6 * 7)"), metadata={"code": True})
+            yield chunk(StreamingFileReferenceContent(file_id="file_1"))
+            yield chunk(text("{\"result\": 42}"), role=AuthorRole.TOOL)
+            yield chunk(text("check: "), text("42"))
+            yield None
+        
+        wrapper = SemanticKernelAgentWrapper(AgentConfig(
+            project_endpoint="https://test.endpoint.com/api/projects/test",
+            model_deployment_name="gpt-4o-mini"
+        ))
+        wrapper.agent = object()
+        wrapper.stream_chat_with_agent = fake_stream
+        
+        async def run():
+            response = wrapper.chat_stream("What is 6 * 7?")
+            return [part async for part in response], await response
+        
+        parts, reply = asyncio.run(run())
+        assert parts == ["Let me ", "check: 42"], parts
+        assert reply == "Let me check: 42"
+        
+        print("✅ Code interpreter input kept out of the reply")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Streamed reply filtering test failed: {str(e)}")
+        return False
+
+
+def test_shared_client_pool():
+    """Test that agent creators share one credential and client per endpoint"""
+    print("\n🔗 Testing shared client pool...")
+    
+    try:
+        from azure_clients import pool_info, close_clients
+        
+        first = AIFoundryAgentCreator("https://test.endpoint.com/api/projects/test", "gpt-4o-mini")
+        second = AIFoundryAgentCreator("https://test.endpoint.com/api/projects/test", "gpt-4o-mini")
+        
+        assert first.credential is second.credential
+        assert first.client is second.client
+        assert pool_info()["sync_clients"] >= 1
+        
+        close_clients()
+        
+        # Async creators get a non-blocking credential and a client bound to the running loop
+        import asyncio
+        from azure_clients import aclose_clients, get_async_credential
+        
+        creator = AsyncAIFoundryAgentCreator("https://test.endpoint.com/api/projects/test", "gpt-4o-mini")
+        
+        async def async_pool():
+            client = creator.client
+            assert client is AsyncAIFoundryAgentCreator("https://test.endpoint.com/api/projects/test", "gpt-4o-mini").client
+            assert type(get_async_credential()).__module__.startswith("azure.identity.aio")
+            await aclose_clients()
+            return client
+        
+        # The same creator used on a new loop resolves that loop's client
+        first_loop_client = asyncio.run(async_pool())
+        assert asyncio.run(async_pool()) is not first_loop_client
+        
+        print("✅ Credential and client shared across creators")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Shared client pool test failed: {str(e)}")
+        return False
+
+
+def test_run_streaming_fallback():
+    """Test that run streaming only falls back to polling without creating duplicate runs"""
+    print("\n📡 Testing run streaming fallback...")
+    
+    try:
+        from types import SimpleNamespace
+        from azure.core.exceptions import HttpResponseError, ServiceResponseError
+        
+        def http_error(status_code):
+            error = HttpResponseError(message=f"status {status_code}")
+            error.status_code = status_code
+            return error
+        
+        def run(status):
+            return SimpleNamespace(id="run_1", status=status)
+        
+        class FakeStream:
+            """Context manager yielding (event_type, event_data, raw) like the SDK's run stream"""
+            
+            def __init__(self, events, error=None):
+                self.events = events
+                self.error = error
+            
+            def __enter__(self):
+                return self
+            
+            def __exit__(self, *exc):
+                return False
+            
+            async def __aenter__(self):
+                return self
+            
+            async def __aexit__(self, *exc):
+                return False
+            
+            def __iter__(self):
+                yield from self.events
+                if self.error:
+                    raise self.error
+            
+            async def __aiter__(self):
+                for event in self:
+                    yield event
+        
+        class FakeRuns:
+            def __init__(self, stream=None, stream_error=None, statuses=("queued", "in_progress", "completed")):
+                self.stream_result = stream
+                self.stream_error = stream_error
+                self.statuses = list(statuses)
+                self.calls = []
+            
+            def stream(self, thread_id, agent_id):
+                self.calls.append("stream")
+                if self.stream_error:
+                    raise self.stream_error
+                return self.stream_result
+            
+            def create(self, thread_id, agent_id):
+                self.calls.append("create")
+                return run(self.statuses.pop(0))
+            
+            def get(self, thread_id, run_id):
+                self.calls.append(f"get {run_id}")
+                return run(self.statuses.pop(0))
+            
+            def cancel(self, thread_id, run_id):
+                self.calls.append("cancel")
+        
+        def creator_with(runs):
+            creator = AIFoundryAgentCreator("https://test.endpoint.com/api/projects/test", "gpt-4o-mini")
+            creator.client = SimpleNamespace(agents=SimpleNamespace(runs=runs))
+            creator.get_latest_assistant_message = lambda thread_id: {"id": "msg_1", "role": "assistant", "content": "Hi"}
+            return creator
+        
+        def collect(runs):
+            events = creator_with(runs).stream_run("thread_1", "agent_1", poll_interval=0)
+            return [(event["type"], event.get("status") or event.get("text")) for event in events]
+        
+        # Streaming rejected by the service: one run is created and polled
+        runs = FakeRuns(stream_error=http_error(501))
+        assert collect(runs) == [
+            ("run_status", "queued"), ("run_status", "in_progress"), ("run_status", "completed"),
+            ("message_completed", "Hi")
+        ]
+        assert runs.calls == ["stream", "create", "get run_1", "get run_1"]
+        
+        # Any other failure to start may have created a run, so it is raised instead
+        runs = FakeRuns(stream_error=http_error(500))
+        try:
+            collect(runs)
+            raise AssertionError("expected the stream error to be raised")
+        except HttpResponseError:
+            pass
+        assert runs.calls == ["stream"]
+        
+        # A stream breaking off mid-run resumes polling the same run without repeating the message
+        created = SimpleNamespace(id="run_1", status="in_progress")
+        message = SimpleNamespace(id="msg_1", content="Hi")
+        events = [("thread.run.created", created, None), ("thread.message.completed", message, None)]
+        runs = FakeRuns(stream=FakeStream(events, ServiceResponseError("connection reset")), statuses=["completed"])
+        assert collect(runs) == [("run_status", "in_progress"), ("message_completed", "Hi"), ("run_status", "completed")]
+        assert runs.calls == ["stream", "get run_1"]
+        
+        # The async creator behaves the same
+        async def async_collect(runs):
+            async def stream(thread_id, agent_id):
+                return FakeRuns.stream(runs, thread_id, agent_id)
+            
+            async def get(thread_id, run_id):
+                return FakeRuns.get(runs, thread_id, run_id)
+            
+            async def latest(thread_id):
+                return {"id": "msg_1", "role": "assistant", "content": "Hi"}
+            
+            client = SimpleNamespace(agents=SimpleNamespace(runs=SimpleNamespace(stream=stream, get=get)))
+            creator = type("FakeAsyncCreator", (AsyncAIFoundryAgentCreator,), {"client": client})(
+                "https://test.endpoint.com/api/projects/test", "gpt-4o-mini"
+            )
+            creator.get_latest_assistant_message = latest
+            return [event["type"] async for event in creator.stream_run("thread_1", "agent_1", poll_interval=0)]
+        
+        runs = FakeRuns(stream=FakeStream(events, ServiceResponseError("connection reset")), statuses=["completed"])
+        assert asyncio.run(async_collect(runs)) == ["run_status", "message_completed", "run_status"]
+        assert runs.calls == ["stream", "get run_1"]
+        
+        print("✅ Polling fallback reuses the streamed run")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Run streaming fallback test failed: {str(e)}")
+        return False
+
+
+def test_message_paging():
+    """Test that message iteration stops paging at the limit and passes its cursors to the SDK"""
+    print("\n📜 Testing message paging...")
+    
+    try:
+        from types import SimpleNamespace
+        
+        class FakePager:
+            """Message list result whose pages are only fetched as they are consumed"""
+            
+            def __init__(self, messages, page_size, calls):
+                self.messages = messages
+                self.page_size = page_size
+                self.calls = calls
+            
+            def _pages(self, continuation_token):
+                self.calls.append(("by_page", continuation_token))
+                for start in range(0, len(self.messages), self.page_size):
+                    self.calls.append(("page", start // self.page_size))
+                    yield self.messages[start:start + self.page_size]
+            
+            def by_page(self, continuation_token=None):
+                return self._pages(continuation_token)
+        
+        class FakeAsyncPage:
+            def __init__(self, messages):
+                self.messages = messages
+            
+            async def __aiter__(self):
+                for msg in self.messages:
+                    yield msg
+        
+        class FakeAsyncPager(FakePager):
+            async def _async_pages(self, continuation_token):
+                for page in FakePager._pages(self, continuation_token):
+                    yield FakeAsyncPage(page)
+            
+            def by_page(self, continuation_token=None):
+                return self._async_pages(continuation_token)
+        
+        messages = [
+            SimpleNamespace(id=f"msg_{i}", role="user", content=f"message {i}", created_at=i) for i in range(10)
+        ]
+        
+        def fake_client(pager_type, calls):
+            def list_messages(**kwargs):
+                calls.append(("list", kwargs))
+                return pager_type(messages, kwargs["limit"], calls)
+            
+            return SimpleNamespace(agents=SimpleNamespace(messages=SimpleNamespace(list=list_messages)))
+        
+        # A limit of 5 with pages of 3 stops after the second page
+        calls = []
+        creator = AIFoundryAgentCreator("https://test.endpoint.com/api/projects/test", "gpt-4o-mini")
+        creator.client = fake_client(FakePager, calls)
+        ids = [msg["id"] for msg in creator.iter_messages(
+            "thread_1", limit=5, order="asc", after="msg_a", before="msg_b", page_size=3
+        )]
+        assert ids == ["msg_0", "msg_1", "msg_2", "msg_3", "msg_4"], ids
+        assert calls == [
+            ("list", {"thread_id": "thread_1", "limit": 3, "order": "asc", "before": "msg_b"}),
+            ("by_page", "msg_a"), ("page", 0), ("page", 1)
+        ], calls
+        
+        # A limit smaller than the page size shrinks the page request
+        calls = []
+        creator.client = fake_client(FakePager, calls)
+        assert len(list(creator.iter_messages("thread_1", limit=2))) == 2
+        assert calls[0][1]["limit"] == 2 and calls[1:] == [("by_page", None), ("page", 0)], calls
+        
+        # The async creator pages the same way
+        calls = []
+        creator = type("FakeAsyncCreator", (AsyncAIFoundryAgentCreator,), {"client": fake_client(FakeAsyncPager, calls)})(
+            "https://test.endpoint.com/api/projects/test", "gpt-4o-mini"
+        )
+        
+        async def async_ids():
+            return [msg["id"] async for msg in creator.iter_messages(
+                "thread_1", limit=5, order="asc", after="msg_a", before="msg_b", page_size=3
+            )]
+        
+        assert asyncio.run(async_ids()) == ["msg_0", "msg_1", "msg_2", "msg_3", "msg_4"]
+        assert calls == [
+            ("list", {"thread_id": "thread_1", "limit": 3, "order": "asc", "before": "msg_b"}),
+            ("by_page", "msg_a"), ("page", 0), ("page", 1)
+        ], calls
+        
+        print("✅ Message paging stops at the limit and forwards cursors")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Message paging test failed: {str(e)}")
+        return False
+
+
+def test_agent_registry():
+    """Test agent registry keys and persistence without network calls"""
+    print("\n🗂️  Testing agent registry...")
+    
+    try:
+        import tempfile
+        from agent_registry import AgentRegistry, agent_definition_key
+        
+        key = agent_definition_key("https://test.endpoint.com", "TestAgent", "gpt-4o-mini", "Be helpful.")
+        assert key == agent_definition_key("https://test.endpoint.com/", "TestAgent", "gpt-4o-mini", "Be helpful.")
+        assert key != agent_definition_key("https://test.endpoint.com", "TestAgent", "gpt-4o-mini", "Be brief.")
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "registry.json")
+            AgentRegistry(path).register(key, "asst_123", "TestAgent")
+            
+            # A fresh instance reads the persisted entry
+            registry = AgentRegistry(path)
+            assert registry.get(key) == "asst_123"
+            assert registry.remove(agent_id="asst_123")
+            assert registry.get(key) is None
+            
+            # Writers with their own registry instances (as separate replicas would
+            # have) never drop each other's entries or leave temp files behind
+            import threading
+            
+            def register(i):
+                AgentRegistry(path).register(f"key_{i}", f"asst_{i}", "TestAgent")
+            
+            writers = [threading.Thread(target=register, args=(i,)) for i in range(16)]
+            for writer in writers:
+                writer.start()
+            for writer in writers:
+                writer.join()
+            assert len(AgentRegistry(path).entries()) == 16
+            assert sorted(os.listdir(tmp)) == ["registry.json", "registry.json.lock"]
+        
+        print("✅ Agent registry persisted and reused entries")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Agent registry test failed: {str(e)}")
+        return False
+
+
+def test_bulk_stats():
+    """Test bulk run statistics and prompt file parsing"""
+    print("\n📦 Testing bulk runner statistics...")
+    
+    try:
+        import tempfile
+        from bulk_runner import BulkConversationRunner, BulkResult, BulkStats, percentile, read_prompts
+        
+        assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.0
+        assert percentile([1.0, 2.0, 3.0, 4.0], 99) == 4.0
+        
+        stats = BulkStats()
+        for i, latency in enumerate([0.5, 1.0, 1.5]):
+            stats.record(BulkResult(i, f"prompt {i}", True, response="ok", latency=latency))
+        stats.record(BulkResult(3, "prompt 3", False, error="failed"))
+        summary = stats.summary()
+        assert summary["succeeded"] == 3 and summary["failed"] == 1
+        assert summary["latency_p50"] == 1.0
+        
+        # Time spent between building the runner and starting it is not counted
+        runner = BulkConversationRunner(None, "agent_1")
+        runner.stats.started -= 60
+        
+        async def drain():
+            return [result async for result in runner.run([])]
+        
+        assert asyncio.run(drain()) == []
+        assert runner.stats.summary()["elapsed_seconds"] < 1
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "prompts.jsonl")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('{"prompt": "first"}\n\n{"prompt": "second"}\n')
+            assert list(read_prompts(path)) == ["first", "second"]
+        
+        print("✅ Bulk statistics and prompt parsing work")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Bulk runner test failed: {str(e)}")
+        return False
+
+
+def test_agent_server_setup():
+    """Test that the HTTP server registers its routes without network calls"""
+    print("\n🌐 Testing agent server setup...")
+    
+    try:
+        from agent_server import AgentServer
+        
+        config = AgentConfig(
+            project_endpoint="https://test.endpoint.com/api/projects/test",
+            model_deployment_name="gpt-4o-mini"
+        )
+        server = AgentServer(SemanticKernelAgentWrapper(config), max_concurrency=4)
+        
+        routes = {(route.method, route.resource.canonical) for route in server.app.router.routes()}
+        assert ("POST", "/chat") in routes
+        assert ("POST", "/chat/stream") in routes
+        assert ("GET", "/healthz") in routes
+        
+        # No agent has been created yet
+        stats = server.stats()
+        assert stats["status"] == "starting" and stats["in_flight"] == 0
+        
+        print("✅ Agent server routes registered")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Agent server setup failed: {str(e)}")
+        return False
+
+
+def test_agent_server_sessions():
+    """Test request validation, per-session ordering and idle session eviction"""
+    print("\n🧵 Testing agent server sessions...")
+    
+    try:
+        from aiohttp.test_utils import TestClient, TestServer
+        from agent_server import AgentServer
+        from response_cache import SingleFlight
+        from semantic_kernel_agent_wrapper import AgentResponseStream
+        
+        class FakeWrapper:
+            """Answers after `release` is set, tracking sessions like the real wrapper"""
+            
+            def __init__(self):
+                self.agent = object()
+                self.sessions = {}
+                self.deleted = []
+                self.single_flight = SingleFlight()
+                self.release = asyncio.Event()
+            
+            def chat_stream(self, message, session_id="default"):
+                async def chunks():
+                    self.sessions.setdefault(session_id, object())
+                    await self.release.wait()
+                    yield f"echo {message}"
+                return AgentResponseStream(chunks())
+            
+            async def chat_with_agent(self, message, session_id="default", admission=None):
+                async with admission():
+                    return f"echo {message}"
+            
+            async def delete_session(self, session_id):
+                self.deleted.append(session_id)
+                return self.sessions.pop(session_id, None) is not None
+        
+        async def run():
+            wrapper = FakeWrapper()
+            server = AgentServer(wrapper, max_concurrency=2, queue_timeout=0.5, session_ttl=3600)
+            async with TestClient(TestServer(server.app)) as client:
+                # Bodies that aren't a JSON object are rejected
+                for kwargs in ({"data": "not json"}, {"json": ["hi"]}, {"json": {"session_id": "a"}}):
+                    assert (await client.post("/chat", **kwargs)).status == 400
+                
+                # A second turn of a busy session waits for the first without taking a slot
+                first = asyncio.ensure_future(client.post("/chat", json={"message": "1", "session_id": "a"}))
+                second = asyncio.ensure_future(client.post("/chat", json={"message": "2", "session_id": "a"}))
+                await asyncio.sleep(0.1)
+                assert server.stats()["in_flight"] == 1
+                stateless = await client.post("/chat", json={"message": "3"})
+                assert stateless.status == 200
+                wrapper.release.set()
+                assert [(await r).status for r in (first, second)] == [200, 200]
+                
+                # Idle sessions are deleted with their threads
+                assert await server.evict_sessions() == 0
+                server.session_ttl = 0
+                assert await server.evict_sessions() == 1
+                assert wrapper.deleted == ["a"] and wrapper.sessions == {}
+                assert server.stats()["evicted_sessions"] == 1
+        
+        async def burst():
+            # Identical stateless prompts share one agent call, and only that call takes a slot
+            wrapper = SemanticKernelAgentWrapper(AgentConfig(
+                project_endpoint="https://test.endpoint.com/api/projects/test",
+                model_deployment_name="gpt-4o-mini"
+            ))
+            wrapper.agent = type("Agent", (), {"id": "asst_test"})()
+            upstream_calls = []
+            
+            def chat_stream(message, session_id="default"):
+                async def chunks():
+                    upstream_calls.append(message)
+                    await asyncio.sleep(0.1)
+                    yield "42"
+                return AgentResponseStream(chunks())
+            
+            wrapper.chat_stream = chat_stream
+            server = AgentServer(wrapper, max_concurrency=1, max_waiting=0)
+            async with TestClient(TestServer(server.app)) as client:
+                responses = await asyncio.gather(*(
+                    client.post("/chat", json={"message": "What is 6 * 7?"}) for _ in range(5)
+                ))
+                assert [r.status for r in responses] == [200] * 5
+                assert upstream_calls == ["What is 6 * 7?"]
+                assert server.stats()["rejected"] == 0
+        
+        asyncio.run(run())
+        asyncio.run(burst())
+        
+        print("✅ Sessions are ordered, validated and evicted")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Agent server sessions test failed: {str(e)}")
+        return False
+
+
+def test_request_coalescing():
+    """Test that concurrent identical calls share one upstream call"""
+    print("\n🔗 Testing request coalescing...")
+    
+    try:
+        import asyncio
+        from response_cache import SingleFlight, make_prompt_key
+        
+        assert make_prompt_key("  What is  AI? ", "agent") == make_prompt_key("what is ai?", "agent")
+        assert make_prompt_key("What is AI?", "agent") != make_prompt_key("What is AI?", "other")
+        
+        upstream_calls = []
+        
+        async def answer():
+            upstream_calls.append(1)
+            await asyncio.sleep(0.01)
+            return "42"
+        
+        async def run():
+            flight = SingleFlight()
+            results = await asyncio.gather(*(flight.do("key", answer) for _ in range(5)))
+            return results, flight.stats()
+        
+        results, stats = asyncio.run(run())
+        assert results == ["42"] * 5
+        assert len(upstream_calls) == 1
+        assert stats["coalesced"] == 4 and stats["coalescing_ratio"] == 0.8
+        
+        print("✅ Concurrent identical requests coalesced")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Request coalescing test failed: {str(e)}")
+        return False
+
+
+def test_similarity_cache():
+    """Test near-duplicate lookups, namespaces and LRU eviction of the similarity cache"""
+    print("\n🧩 Testing similarity cache...")
+    
+    try:
+        from response_cache import SimilarityCache
+        
+        cache = SimilarityCache(threshold=0.8, max_entries=2)
+        prompt = "How do I configure a private endpoint for my Azure AI Foundry project?"
+        cache.put("agent-a", prompt, "Use a private link.")
+        
+        assert cache.get("agent-a", "how do I configure a private endpoint for my Azure AI Foundry project") == "Use a private link."
+        assert cache.get("agent-a", "What is the capital of France?") is None
+        assert cache.get("agent-b", prompt) is None
+        
+        # Only sentence punctuation is dropped; operators and symbols keep prompts apart
+        assert cache.normalize("Hello, world! \"Quoted\"?") == "hello world quoted"
+        assert cache.normalize("Solve 3x + 15 = 42") != cache.normalize("Solve 3x - 15 = 42")
+        assert cache.normalize("What is C++?") != cache.normalize("What is C#?")
+        assert cache.normalize("Round 3.5") != cache.normalize("Round 3,5")
+        operators = SimilarityCache(threshold=0.8)
+        operators.put("agent-a", "Solve 3x + 15 = 42", "x = 9")
+        operators.put("agent-a", "What is C++?", "A language")
+        assert operators.get("agent-a", "Solve 3x - 15 = 42") is None
+        assert operators.get("agent-a", "What is C#?") is None
+        assert operators.get("agent-a", "what is c++") == "A language"
+        
+        cache.put("agent-a", "first filler prompt", "1")
+        cache.put("agent-a", "second filler prompt", "2")
+        assert cache.get("agent-a", prompt) is None
+        assert cache.stats()["evictions"] == 1
+        
+        print("✅ Similarity cache matches near-duplicates per agent")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Similarity cache test failed: {str(e)}")
+        return False
+
+
+def test_tiered_response_cache():
+    """Test that persisted responses survive a restart and expire after their TTL"""
+    print("\n💾 Testing tiered response cache...")
+    
+    try:
+        import tempfile
+        from response_cache import TieredResponseCache, response_cache_key
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.sqlite3")
+            key = response_cache_key("gpt-4o-mini", "Be helpful.", "Hello")
+            assert key == response_cache_key("gpt-4o-mini", "Be helpful.", "  hello ")
+            assert key != response_cache_key("gpt-4o", "Be helpful.", "Hello")
+            
+            cache = TieredResponseCache(path, max_entries=2)
+            cache.put(key, "Hi there!")
+            cache.put(response_cache_key("gpt-4o-mini", "Be helpful.", "Bye"), "Goodbye!", ttl=-1)
+            cache.close()
+            
+            # A new instance (warm restart) starts with an empty memory tier
+            restarted = TieredResponseCache(path, max_entries=2)
+            assert restarted.get(key) == "Hi there!"
+            assert restarted.get(response_cache_key("gpt-4o-mini", "Be helpful.", "Bye")) is None
+            assert restarted.compact() == 1
+            stats = restarted.stats()
+            assert stats["disk_hits"] == 1 and stats["disk_entries"] == 1
+            restarted.close()
+            
+            # The async API keeps the event loop free while SQLite is busy
+            async def async_cache():
+                cache = TieredResponseCache(path, compact_every=1)
+                cache._db_lock.acquire()
+                lookup = asyncio.ensure_future(cache.aget(response_cache_key("gpt-4o-mini", "Be helpful.", "Hi")))
+                await asyncio.sleep(0.05)
+                assert not lookup.done()
+                # Stats come from memory, so they don't wait for SQLite either
+                try:
+                    stats = await asyncio.wait_for(asyncio.to_thread(cache.stats), timeout=1)
+                finally:
+                    cache._db_lock.release()
+                assert stats["disk_entries"] == 1
+                assert await lookup is None
+                
+                await cache.aput(key, "Hello again!")
+                assert await cache._compaction == 0
+                cache._memory.clear()
+                assert await cache.aget(key) == "Hello again!"
+                await cache.aclose()
+            
+            asyncio.run(async_cache())
+            
+            # Memory-tier hits count as uses, so compaction evicts the unused entry
+            cache = TieredResponseCache(path, max_entries=1)
+            cache.clear()
+            popular = response_cache_key("gpt-4o-mini", "Be helpful.", "Popular")
+            cache.put(popular, "Often asked")
+            cache.put(response_cache_key("gpt-4o-mini", "Be helpful.", "Rare"), "Asked once")
+            assert cache.get(popular) == "Often asked"
+            assert cache.compact() == 1
+            cache._memory.clear()
+            assert cache.get(popular) == "Often asked"
+            assert cache.stats()["disk_entries"] == 1
+            cache.close()
+        
+        print("✅ Tiered response cache persists and expires entries")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Tiered response cache test failed: {str(e)}")
+        return False
+
+
 def main():
     """Run all demo tests"""
     print("🧪 Azure AI Foundry + Semantic Kernel Demo Tests")
@@ -165,6 +852,17 @@ def main():
         ("Class Initialization", test_class_initialization),
         ("Configuration Validation", test_agent_config_validation),
         ("Semantic Kernel Init", test_semantic_kernel_initialization),
+        ("Streamed Reply Filtering", test_chat_stream_skips_code),
+        ("Shared Client Pool", test_shared_client_pool),
+        ("Run Streaming Fallback", test_run_streaming_fallback),
+        ("Message Paging", test_message_paging),
+        ("Agent Registry", test_agent_registry),
+        ("Bulk Runner Stats", test_bulk_stats),
+        ("Agent Server Setup", test_agent_server_setup),
+        ("Agent Server Sessions", test_agent_server_sessions),
+        ("Request Coalescing", test_request_coalescing),
+        ("Similarity Cache", test_similarity_cache),
+        ("Tiered Response Cache", test_tiered_response_cache),
     ]
     
     results = []
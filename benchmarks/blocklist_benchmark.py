@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Blocklist Benchmark Suite
+=========================
+
+Reproducible benchmarks for local blocklist matching and blocklist provisioning:
+
+- Matcher build, compile and memory-map load time across term counts
+- Local matching throughput (prompts/sec and MB/sec) for exact, normalized and mapped matchers
+- BlocklistManager / AsyncBlocklistManager provisioning throughput against a local HTTP
+  stand-in for the Content Safety endpoint with configurable latency
+
+Results are written as JSON so runs can be compared between releases.
+
+Examples:
+    python benchmarks/blocklist_benchmark.py
+    python benchmarks/blocklist_benchmark.py --term-counts 200,10000,100000,1000000 --output results.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import socket
+import string
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List
+
+# Add repository root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from blocklist_matcher import BlocklistMatcher, compile_artifact, load_matcher
+from create_blocklists import (
+    AdaptiveRateLimiter,
+    AsyncBlocklistManager,
+    BlocklistManager,
+    get_blocklist_definitions,
+)
+
+
+def generate_terms(count: int, seed: int) -> List[str]:
+    """Generate deterministic word-like terms of one to three words"""
+    rng = random.Random(seed)
+    terms = set()
+    while len(terms) < count:
+        words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+                 for _ in range(rng.randint(1, 3))]
+        terms.add(" ".join(words))
+    return sorted(terms)
+
+
+def generate_prompts(terms: List[str], count: int, length: int, hit_rate: float, seed: int) -> List[str]:
+    """Generate deterministic prompts, a hit_rate share of which contain a term"""
+    rng = random.Random(seed)
+    filler = ["the", "please", "explain", "how", "data", "report", "summary", "with", "for",
+              "quarterly", "results", "python", "function", "write", "analysis", "about"]
+    prompts = []
+    for _ in range(count):
+        words = []
+        while sum(len(w) + 1 for w in words) < length:
+            words.append(rng.choice(filler))
+        if rng.random() < hit_rate:
+            words.insert(rng.randrange(len(words)), rng.choice(terms))
+        prompts.append(" ".join(words))
+    return prompts
+
+
+def time_call(func, *args, **kwargs):
+    """Run a callable once and return (result, elapsed seconds)"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def measure_scan(matcher: BlocklistMatcher, prompts: List[str], min_seconds: float) -> Dict:
+    """Scan the prompts repeatedly for at least min_seconds and report throughput"""
+    total_bytes = sum(len(p.encode("utf-8")) for p in prompts)
+    rounds, elapsed, hits = 0, 0.0, 0
+    while elapsed < min_seconds:
+        start = time.perf_counter()
+        hits = sum(1 for p in prompts if matcher.scan(p))
+        elapsed += time.perf_counter() - start
+        rounds += 1
+    
+    scanned = rounds * len(prompts)
+    return {
+        "prompts_per_sec": round(scanned / elapsed, 1),
+        "mb_per_sec": round(rounds * total_bytes / elapsed / 1e6, 3),
+        "us_per_prompt": round(elapsed / scanned * 1e6, 2),
+        "hit_ratio": round(hits / len(prompts), 3)
+    }
+
+
+def bench_matching(term_counts: List[int], args) -> List[Dict]:
+    """Benchmark matcher build, compile, load and scan across term counts"""
+    results = []
+    default_terms = _default_terms()
+    
+    for count in term_counts:
+        if count <= len(default_terms):
+            terms = default_terms[:count]
+        else:
+            terms = generate_terms(count, args.seed)
+        prompts = generate_prompts(terms, args.prompts, args.prompt_length, args.hit_rate, args.seed)
+        definitions = [{"name": "bench", "terms": terms}]
+        print(f"\n📏 {count} terms")
+        
+        entry = {"term_count": count}
+        for normalize in (False, True):
+            mode = "normalized" if normalize else "exact"
+            matcher, build_seconds = time_call(BlocklistMatcher.from_definitions, definitions, normalize)
+            
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "bench.blkm")
+                with contextlib.redirect_stdout(io.StringIO()):
+                    _, compile_seconds = time_call(compile_artifact, definitions, path, normalize)
+                mapped, load_seconds = time_call(load_matcher, path)
+                
+                entry[mode] = {
+                    "states": len(matcher.goto),
+                    "build_seconds": round(build_seconds, 4),
+                    "compile_seconds": round(compile_seconds, 4),
+                    "artifact_bytes": os.path.getsize(path),
+                    "load_seconds": round(load_seconds, 6),
+                    "scan": measure_scan(matcher, prompts, args.min_seconds),
+                    "mapped_scan": measure_scan(mapped, prompts, args.min_seconds)
+                }
+                mapped.close()
+            del matcher
+            
+            scan = entry[mode]["scan"]
+            print(f"  {mode:<10} build {build_seconds:.3f}s, load {load_seconds * 1000:.2f}ms, "
+                  f"{scan['prompts_per_sec']:.0f} prompts/s, {scan['mb_per_sec']:.2f} MB/s")
+        results.append(entry)
+    
+    return results
+
+
+def _default_terms() -> List[str]:
+    """The real political and religious terms"""
+    return [t for d in get_blocklist_definitions() for t in d["terms"]]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Minimal Content Safety blocklist endpoint that answers after a fixed latency"""
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def setup(self):
+        super().setup()
+        # Avoid delayed-ACK stalls on keep-alive connections
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    
+    def _reply(self, status: int, body: Dict):
+        data = json.dumps(body).encode("utf-8")
+        head = (f"HTTP/1.1 {status} OK\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\n\r\n").encode("ascii")
+        self.wfile.write(head + data)
+    
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if self.latency:
+            time.sleep(self.latency)
+        
+        path = self.path.split("?", 1)[0]
+        if path.endswith(":addOrUpdateBlocklistItems"):
+            self._reply(200, {"blocklistItems": body.get("blocklistItems", [])})
+        elif path.endswith("text:analyze"):
+            self._reply(200, {"blocklistsMatch": [], "categoriesAnalysis": []})
+        elif path.endswith("/blocklists"):
+            self._reply(200, {"value": []})
+        else:
+            self._reply(200, {"blocklistName": path.rsplit("/", 1)[-1]})
+    
+    do_GET = do_PATCH = do_POST = _handle
+
+
+def start_stand_in(latency: float):
+    """Start the stand-in server on a free local port"""
+    handler = type("LatencyHandler", (StandInHandler,), {"latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def bench_provisioning(args) -> Dict:
+    """Benchmark sync and async provisioning against the local stand-in"""
+    terms = generate_terms(args.provision_terms, args.seed)
+    server, endpoint = start_stand_in(args.latency)
+    print(f"\n🌐 Provisioning {len(terms)} terms against stand-in ({args.latency * 1000:.0f}ms latency)")
+    
+    def limiter():
+        # Start and stay at the configured rate so the transport, not the limiter, is measured
+        return AdaptiveRateLimiter(rate=args.rate, burst=args.rate, max_rate=args.rate)
+    
+    results = {"terms": len(terms), "latency_ms": args.latency * 1000, "rate_limit": args.rate}
+    
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            with BlocklistManager(endpoint, "bench", rate_limiter=limiter()) as manager:
+                start = time.perf_counter()
+                manager.create_blocklist("bench", "benchmark")
+                for i in range(0, len(terms), 100):
+                    manager.add_blocklist_items("bench", terms[i:i + 100])
+                sync_seconds = time.perf_counter() - start
+            
+            async def provision_async():
+                async with AsyncBlocklistManager(endpoint, "bench", max_concurrency=args.concurrency,
+                                                 rate_limiter=limiter()) as async_manager:
+                    start = time.perf_counter()
+                    await async_manager.provision_blocklist("bench", "benchmark", terms)
+                    return time.perf_counter() - start
+            
+            async_seconds = asyncio.run(provision_async())
+    finally:
+        server.shutdown()
+        server.server_close()
+    
+    requests_sent = 1 + (len(terms) + 99) // 100
+    for mode, seconds in (("sync", sync_seconds), ("async", async_seconds)):
+        results[mode] = {
+            "seconds": round(seconds, 3),
+            "requests_per_sec": round(requests_sent / seconds, 1),
+            "terms_per_sec": round(len(terms) / seconds, 1)
+        }
+        print(f"  {mode:<6} {seconds:.2f}s ({results[mode]['requests_per_sec']:.0f} req/s)")
+    results["async"]["max_concurrency"] = args.concurrency
+    return results
+
+
+def environment_info() -> Dict:
+    """Describe the machine and revision the benchmark ran on"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count()
+    }
+
+
+def main():
+    """Run the benchmark suite and write the results as JSON"""
+    parser = argparse.ArgumentParser(description="Benchmark blocklist matching and provisioning")
+    parser.add_argument("--term-counts", default="200,1000,10000,100000",
+                        help="Comma-separated term counts for matching (1000000 needs several GB of RAM)")
+    parser.add_argument("--prompts", type=int, default=500, help="Prompts per matching run")
+    parser.add_argument("--prompt-length", type=int, default=300, help="Approximate prompt length in characters")
+    parser.add_argument("--hit-rate", type=float, default=0.1, help="Share of prompts containing a term")
+    parser.add_argument("--min-seconds", type=float, default=1.0, help="Minimum time per scan measurement")
+    parser.add_argument("--provision-terms", type=int, default=5000, help="Terms uploaded in the provisioning run")
+    parser.add_argument("--latency", type=float, default=0.02, help="Stand-in response latency in seconds")
+    parser.add_argument("--concurrency", type=int, default=8, help="Async provisioning concurrency")
+    parser.add_argument("--rate", type=int, default=1000, help="Rate limit in requests/sec for provisioning")
+    parser.add_argument("--skip-matching", action="store_true", help="Skip the matching benchmarks")
+    parser.add_argument("--skip-provisioning", action="store_true", help="Skip the provisioning benchmarks")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for generated terms and prompts")
+    parser.add_argument("--output", default="benchmark_results.json", help="Path of the JSON results file")
+    args = parser.parse_args()
+    
+    print("🏁 Blocklist Benchmark Suite")
+    print("=" * 60)
+    
+    results = {"environment": environment_info(), "parameters": vars(args)}
+    if not args.skip_matching:
+        term_counts = [int(c) for c in args.term_counts.split(",") if c.strip()]
+        results["matching"] = bench_matching(term_counts, args)
+    if not args.skip_provisioning:
+        results["provisioning"] = bench_provisioning(args)
+    
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    
+    print("\n" + "=" * 60)
+    print(f"📊 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,668 @@
+#!/usr/bin/env python3
+"""
+Local Blocklist Matcher - Aho-Corasick Pre-screen for Blocklist Terms
+=====================================================================
+
+Builds a multi-pattern matcher from the same term lists used for the Azure Content Safety
+blocklists, so prompts that literally contain a blocked phrase can be rejected in-process
+with a single linear scan before any network round trip.
+
+With normalize=True, prompts and terms are folded through the same single-pass pipeline
+(compatibility normalization, case folding, homoglyph and leetspeak maps, separator collapsing)
+and every term is indexed under its common spacing variants, so casing, lookalike characters,
+digit substitutions and inserted punctuation do not evade the scan.
+
+The automaton can be compiled once into a binary artifact that worker processes memory-map
+read-only, so replicas share one page-cached copy and start without building anything.
+"""
+
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import unicodedata
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# Compiled artifact layout: header, then little-endian uint32 arrays, then a UTF-8 string blob
+ARTIFACT_MAGIC = b"BLKM"
+ARTIFACT_VERSION = 1
+ARTIFACT_HEADER = struct.Struct("<4s7I32s")
+ARTIFACT_HEADER_SIZE = 64
+PATTERN_FIELDS = 5
+FLAG_NORMALIZE = 1
+
+
+@dataclass
+class BlocklistMatch:
+    """A blocklist term found in a text"""
+    term: str
+    blocklist_name: str
+    start: int
+    end: int
+
+
+# Bumped whenever the folding tables change, so compiled artifacts are rebuilt
+NORMALIZATION_VERSION = 1
+
+# Latin lookalikes from other scripts that survive compatibility normalization
+HOMOGLYPHS = {
+    # Cyrillic
+    'а': 'a', 'в': 'b', 'е': 'e', 'ё': 'e', 'к': 'k', 'м': 'm', 'н': 'h', 'о': 'o', 'р': 'p',
+    'с': 'c', 'т': 't', 'у': 'y', 'х': 'x', 'ѕ': 's', 'і': 'i', 'ї': 'i', 'ј': 'j', 'һ': 'h',
+    'ԁ': 'd', 'ԛ': 'q', 'ԝ': 'w', 'ӏ': 'l',
+    # Greek
+    'α': 'a', 'β': 'b', 'ε': 'e', 'η': 'n', 'ι': 'i', 'κ': 'k', 'ν': 'v', 'ο': 'o', 'ρ': 'p',
+    'τ': 't', 'υ': 'u', 'χ': 'x', 'ω': 'w',
+    # Latin extensions and IPA
+    'ı': 'i', 'ȷ': 'j', 'ɑ': 'a', 'ɡ': 'g', 'ɩ': 'i', 'ʀ': 'r', 'ʏ': 'y', 'ꞵ': 'b',
+}
+
+# Digits and symbols commonly substituted for letters
+LEETSPEAK = {
+    '0': 'o', '1': 'i', '3': 'e', '4': 'a', '5': 's', '7': 't', '8': 'b', '9': 'g',
+    '@': 'a', '$': 's', '€': 'e', '£': 'l',
+}
+
+_FOLD_CACHE: Dict[str, str] = {}
+
+
+def _fold_char(ch: str) -> str:
+    """
+    Fold one character to its matching form
+    
+    Returns the folded letters, ' ' for a separator, or '' for characters that are
+    dropped entirely (combining marks and invisible format characters).
+    """
+    folded = _FOLD_CACHE.get(ch)
+    if folded is not None:
+        return folded
+    
+    folded = ""
+    if ch in LEETSPEAK:
+        folded = LEETSPEAK[ch]
+    else:
+        # Compatibility decomposition also splits accents off their base letters
+        for part in unicodedata.normalize("NFKD", ch).casefold():
+            part = HOMOGLYPHS.get(part, part)
+            category = unicodedata.category(part)
+            if category in ("Mn", "Me", "Cf"):
+                continue
+            if part.isalnum():
+                folded += LEETSPEAK.get(part, part)
+            elif not folded.endswith(" "):
+                folded += " "
+    
+    _FOLD_CACHE[ch] = folded
+    return folded
+
+
+def normalize_for_matching(text: str) -> Tuple[str, List[int]]:
+    """
+    Normalize a text for obfuscation-resistant matching in a single pass
+    
+    Applies compatibility folding (NFKC/NFKD with accents stripped), case folding, the
+    homoglyph and leetspeak maps, and collapses whitespace and punctuation runs to one space.
+    
+    Args:
+        text: Text to normalize
+    
+    Returns:
+        The normalized text and, for each of its characters, the index of the original
+        character it came from
+    """
+    chars = []
+    origin = []
+    for index, ch in enumerate(text):
+        for folded in _fold_char(ch):
+            if folded == " " and (not chars or chars[-1] == " "):
+                continue
+            chars.append(folded)
+            origin.append(index)
+    
+    if chars and chars[-1] == " ":
+        chars.pop()
+        origin.pop()
+    return "".join(chars), origin
+
+
+def term_variants(term: str) -> List[str]:
+    """
+    Get the normalized forms a term is indexed under
+    
+    Besides the normalized phrase, multi-word terms are indexed with the spaces removed
+    ("whitehouse") and every term is indexed letter-spaced ("v o t e f o r"), so those
+    evasions are caught by the same single scan.
+    """
+    normalized, _ = normalize_for_matching(term)
+    if not normalized:
+        return []
+    
+    variants = [normalized]
+    joined = normalized.replace(" ", "")
+    for variant in (joined, " ".join(joined)):
+        if variant not in variants and len(joined) > 1:
+            variants.append(variant)
+    return variants
+
+
+def _is_word_char(ch: str) -> bool:
+    """Characters that continue a word, so a match next to them is not on a word boundary"""
+    return ch.isalnum() or ch == '_'
+
+
+class BlocklistMatcher:
+    """Aho-Corasick automaton over blocklist terms with word-boundary aware matching"""
+    
+    def __init__(self, normalize: bool = False):
+        """
+        Initialize an empty matcher; add terms, then call build()
+        
+        Args:
+            normalize: Match through normalize_for_matching() and index term variants
+        """
+        self.normalize = normalize
+        # State 0 is the root
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[List[int]] = [[]]
+        # (term, blocklist name, length of the matched key)
+        self.patterns: List[Tuple[str, str, int]] = []
+        self._seen = set()
+        self.built = False
+    
+    def add_term(self, term: str, blocklist_name: str):
+        """Add a single term belonging to a blocklist"""
+        if self.normalize:
+            keys = term_variants(term)
+        else:
+            keys = [term.strip().lower()] if term.strip() else []
+        
+        for key in keys:
+            if (key, blocklist_name) not in self._seen:
+                self._seen.add((key, blocklist_name))
+                self._insert(key, term.strip(), blocklist_name)
+    
+    def _insert(self, key: str, term: str, blocklist_name: str):
+        """Add one key to the trie, reporting it as the given term"""
+        state = 0
+        for ch in key:
+            next_state = self.goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][ch] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+            state = next_state
+        
+        self.outputs[state].append(len(self.patterns))
+        self.patterns.append((term, blocklist_name, len(key)))
+        self.built = False
+    
+    def add_terms(self, blocklist_name: str, terms: List[str]):
+        """Add every term of a blocklist"""
+        for term in terms:
+            self.add_term(term, blocklist_name)
+    
+    def build(self) -> "BlocklistMatcher":
+        """Compute failure links breadth-first and merge outputs along them"""
+        queue = deque()
+        for state in self.goto[0].values():
+            self.fail[state] = 0
+            queue.append(state)
+        
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(ch, 0)
+                # Parents are processed first, so the fallback's outputs are already complete
+                self.outputs[next_state] = self.outputs[next_state] + self.outputs[self.fail[next_state]]
+        
+        self.built = True
+        return self
+    
+    def scan(self, text: str, first_only: bool = False) -> List[BlocklistMatch]:
+        """
+        Find blocklist terms in a text with one pass over its characters
+        
+        Args:
+            text: Text to screen
+            first_only: Stop at the first match
+        
+        Returns:
+            Matches on word boundaries, in order of their end position
+        """
+        if not self.built:
+            self.build()
+        
+        key_text, origin = self._prepare(text)
+        goto, fail, outputs, patterns = self.goto, self.fail, self.outputs, self.patterns
+        matches = []
+        state = 0
+        
+        for pos, ch in enumerate(key_text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            
+            for pattern_id in outputs[state]:
+                term, blocklist_name, length = patterns[pattern_id]
+                match = self._locate(key_text, origin, pos, length, term, blocklist_name)
+                if match is None:
+                    continue
+                matches.append(match)
+                if first_only:
+                    return matches
+        
+        return matches
+    
+    def first_match(self, text: str) -> Optional[BlocklistMatch]:
+        """Get the first blocklist term found in a text, if any"""
+        matches = self.scan(text, first_only=True)
+        return matches[0] if matches else None
+    
+    def is_blocked(self, text: str) -> bool:
+        """Check whether a text contains any blocklist term"""
+        return self.first_match(text) is not None
+    
+    def matched_terms(self, text: str) -> Dict[str, List[str]]:
+        """Get the distinct matched terms in a text grouped by blocklist name"""
+        result: Dict[str, List[str]] = {}
+        for match in self.scan(text):
+            terms = result.setdefault(match.blocklist_name, [])
+            if match.term not in terms:
+                terms.append(match.term)
+        return result
+    
+    def _prepare(self, text: str) -> Tuple[str, Optional[List[int]]]:
+        """Get the text to scan and, unless it lines up with the input, its origin map"""
+        if self.normalize:
+            return normalize_for_matching(text)
+        
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            return lowered, None
+        # Some characters lowercase to several; map each lowered position back to the original
+        return self._lower_with_origin(text)
+    
+    def _locate(
+        self,
+        key_text: str,
+        origin: Optional[List[int]],
+        pos: int,
+        length: int,
+        term: str,
+        blocklist_name: str
+    ) -> Optional[BlocklistMatch]:
+        """Turn a key ending at pos into a match on the input, or None if it is inside a word"""
+        start, end = pos - length + 1, pos + 1
+        if not self._on_boundary(key_text, start, end):
+            return None
+        if origin is not None:
+            start, end = origin[start], origin[pos] + 1
+        return BlocklistMatch(term, blocklist_name, start, end)
+    
+    @staticmethod
+    def _lower_with_origin(text: str) -> Tuple[str, List[int]]:
+        """Lowercase a text and record the original index of every lowered character"""
+        chars = []
+        origin = []
+        for index, ch in enumerate(text):
+            for lowered in ch.lower():
+                chars.append(lowered)
+                origin.append(index)
+        return "".join(chars), origin
+    
+    @staticmethod
+    def _on_boundary(text: str, start: int, end: int) -> bool:
+        """Check that a match is not part of a longer word on either side"""
+        if start > 0 and _is_word_char(text[start]) and _is_word_char(text[start - 1]):
+            return False
+        if end < len(text) and _is_word_char(text[end - 1]) and _is_word_char(text[end]):
+            return False
+        return True
+    
+    def to_bytes(self, content_hash: str) -> bytes:
+        """
+        Serialize the built automaton into the compiled artifact format
+        
+        Args:
+            content_hash: Hex SHA-256 of the term set, stored in the header
+        
+        Returns:
+            Artifact bytes
+        """
+        if not self.built:
+            self.build()
+        
+        # Transitions in CSR form, sorted by character so lookups can binary search
+        trans_start, trans_chars, trans_targets = [0], [], []
+        for edges in self.goto:
+            for ch, target in sorted(edges.items()):
+                trans_chars.append(ord(ch))
+                trans_targets.append(target)
+            trans_start.append(len(trans_chars))
+        
+        out_start, out_ids = [0], []
+        for pattern_ids in self.outputs:
+            out_ids.extend(pattern_ids)
+            out_start.append(len(out_ids))
+        
+        strings = bytearray()
+        name_offsets: Dict[str, Tuple[int, int]] = {}
+        pattern_table = []
+        for term, blocklist_name, length in self.patterns:
+            if blocklist_name not in name_offsets:
+                encoded = blocklist_name.encode("utf-8")
+                name_offsets[blocklist_name] = (len(strings), len(encoded))
+                strings += encoded
+            encoded = term.encode("utf-8")
+            pattern_table.extend([len(strings), len(encoded), *name_offsets[blocklist_name], length])
+            strings += encoded
+        
+        arrays = [trans_start, trans_chars, trans_targets, self.fail, out_start, out_ids, pattern_table]
+        header = ARTIFACT_HEADER.pack(
+            ARTIFACT_MAGIC, ARTIFACT_VERSION, len(self.goto), len(trans_chars), len(out_ids),
+            len(self.patterns), len(strings), FLAG_NORMALIZE if self.normalize else 0,
+            bytes.fromhex(content_hash)
+        )
+        body = b"".join(struct.pack(f"<{len(values)}I", *values) for values in arrays)
+        return header.ljust(ARTIFACT_HEADER_SIZE, b"\0") + body + bytes(strings)
+    
+    @classmethod
+    def from_definitions(cls, definitions: List[Dict], normalize: bool = False) -> "BlocklistMatcher":
+        """
+        Build a matcher from blocklist definitions
+        
+        Args:
+            definitions: Dictionaries with 'name' and 'terms' keys
+            normalize: Match obfuscated variants of the terms
+        
+        Returns:
+            Built BlocklistMatcher
+        """
+        matcher = cls(normalize=normalize)
+        for definition in definitions:
+            matcher.add_terms(definition["name"], definition["terms"])
+        return matcher.build()
+
+
+class MappedBlocklistMatcher(BlocklistMatcher):
+    """Read-only matcher backed by a memory-mapped compiled artifact"""
+    
+    def __init__(self, path: str, expected_hash: Optional[str] = None):
+        """
+        Map a compiled artifact without building anything
+        
+        Args:
+            path: Path to an artifact written by compile_artifact()
+            expected_hash: Reject the artifact unless its content hash matches
+        """
+        if sys.byteorder != "little":
+            raise RuntimeError("Compiled blocklist artifacts require a little-endian host")
+        
+        with open(path, "rb") as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ValueError(f"Blocklist artifact {path} is empty") from None
+        
+        views = []
+        try:
+            if len(self._mmap) < ARTIFACT_HEADER_SIZE:
+                raise ValueError(f"Blocklist artifact {path} is truncated ({len(self._mmap)} bytes)")
+            (magic, version, num_states, num_transitions, num_outputs,
+             num_patterns, strings_len, flags, digest) = ARTIFACT_HEADER.unpack_from(self._mmap, 0)
+            if magic != ARTIFACT_MAGIC or version != ARTIFACT_VERSION:
+                raise ValueError(f"Not a version {ARTIFACT_VERSION} blocklist artifact: {path}")
+            
+            self.content_hash = digest.hex()
+            if expected_hash and expected_hash != self.content_hash:
+                raise ValueError(f"Blocklist artifact {path} is stale (hash {self.content_hash[:12]})")
+            
+            counts = (num_states + 1, num_transitions, num_transitions, num_states,
+                      num_states + 1, num_outputs, num_patterns * PATTERN_FIELDS)
+            expected_size = ARTIFACT_HEADER_SIZE + 4 * sum(counts) + strings_len
+            if len(self._mmap) != expected_size:
+                raise ValueError(
+                    f"Blocklist artifact {path} is truncated or corrupt "
+                    f"({len(self._mmap)} bytes, header describes {expected_size})"
+                )
+            
+            view = memoryview(self._mmap)
+            views.append(view)
+            offset = ARTIFACT_HEADER_SIZE
+            for count in counts:
+                views.append(view[offset:offset + 4 * count].cast("I"))
+                offset += 4 * count
+            views.append(view[offset:offset + strings_len])
+        except BaseException:
+            # Views must be released before the map can be closed
+            for section in reversed(views):
+                section.release()
+            self._mmap.close()
+            raise
+        
+        (self.trans_start, self.trans_chars, self.trans_targets, self.fail,
+         self.out_start, self.out_ids, self.pattern_table, self.strings) = views[1:]
+        
+        self.num_states = num_states
+        self.num_patterns = num_patterns
+        self.normalize = bool(flags & FLAG_NORMALIZE)
+        self.built = True
+        # The root fans out widest, so keep its edges in a small dict
+        self._root = {
+            chr(self.trans_chars[i]): self.trans_targets[i]
+            for i in range(self.trans_start[0], self.trans_start[1])
+        }
+        self._pattern_cache: Dict[int, Tuple[str, str, int]] = {}
+    
+    def add_term(self, term: str, blocklist_name: str):
+        raise TypeError("MappedBlocklistMatcher is read-only; recompile the artifact instead")
+    
+    def build(self) -> "MappedBlocklistMatcher":
+        return self
+    
+    def close(self):
+        """Release the memory map"""
+        for name in ("trans_start", "trans_chars", "trans_targets", "fail",
+                     "out_start", "out_ids", "pattern_table", "strings"):
+            getattr(self, name).release()
+        self._mmap.close()
+    
+    def _next_state(self, state: int, code: int) -> Optional[int]:
+        """Binary search a state's sorted transitions for a character"""
+        low, high = self.trans_start[state], self.trans_start[state + 1]
+        chars = self.trans_chars
+        while low < high:
+            mid = (low + high) // 2
+            if chars[mid] < code:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self.trans_start[state + 1] and chars[low] == code:
+            return self.trans_targets[low]
+        return None
+    
+    def _pattern(self, pattern_id: int) -> Tuple[str, str, int]:
+        """Decode a pattern's term and blocklist name from the string blob"""
+        pattern = self._pattern_cache.get(pattern_id)
+        if pattern is None:
+            base = pattern_id * PATTERN_FIELDS
+            term_off, term_len, name_off, name_len, length = self.pattern_table[base:base + PATTERN_FIELDS]
+            pattern = (
+                bytes(self.strings[term_off:term_off + term_len]).decode("utf-8"),
+                bytes(self.strings[name_off:name_off + name_len]).decode("utf-8"),
+                length
+            )
+            self._pattern_cache[pattern_id] = pattern
+        return pattern
+    
+    def scan(self, text: str, first_only: bool = False) -> List[BlocklistMatch]:
+        """
+        Find blocklist terms in a text with one pass over its characters
+        
+        Args:
+            text: Text to screen
+            first_only: Stop at the first match
+        
+        Returns:
+            Matches on word boundaries, in order of their end position
+        """
+        key_text, origin = self._prepare(text)
+        fail, out_start, out_ids, root = self.fail, self.out_start, self.out_ids, self._root
+        matches = []
+        state = 0
+        
+        for pos, ch in enumerate(key_text):
+            code = ord(ch)
+            while True:
+                if state == 0:
+                    state = root.get(ch, 0)
+                    break
+                next_state = self._next_state(state, code)
+                if next_state is not None:
+                    state = next_state
+                    break
+                state = fail[state]
+            
+            for index in range(out_start[state], out_start[state + 1]):
+                term, blocklist_name, length = self._pattern(out_ids[index])
+                match = self._locate(key_text, origin, pos, length, term, blocklist_name)
+                if match is None:
+                    continue
+                matches.append(match)
+                if first_only:
+                    return matches
+        
+        return matches
+
+
+def definitions_hash(definitions: List[Dict], normalize: bool = False) -> str:
+    """Get a hex SHA-256 over the normalized term set of blocklist definitions"""
+    mode = f"n{NORMALIZATION_VERSION}" if normalize else "exact"
+    digest = hashlib.sha256(f"v{ARTIFACT_VERSION}:{mode}".encode("utf-8"))
+    for name, term in sorted({(d["name"], t.strip().lower()) for d in definitions for t in d["terms"]}):
+        digest.update(name.encode("utf-8") + b"\0" + term.encode("utf-8") + b"\n")
+    return digest.hexdigest()
+
+
+def read_artifact_hash(path: str) -> Optional[str]:
+    """Read the content hash from an artifact header, or None if it is missing or invalid"""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(ARTIFACT_HEADER.size)
+        magic, version, *_, digest = ARTIFACT_HEADER.unpack(header)
+    except (OSError, struct.error):
+        return None
+    if magic != ARTIFACT_MAGIC or version != ARTIFACT_VERSION:
+        return None
+    return digest.hex()
+
+
+def compile_artifact(definitions: List[Dict], path: str, normalize: bool = False) -> str:
+    """
+    Compile blocklist definitions into a memory-mappable artifact
+    
+    The file is left untouched when its content hash already matches, and is otherwise
+    replaced atomically so running workers keep their existing mapping.
+    
+    Args:
+        definitions: Dictionaries with 'name' and 'terms' keys
+        path: Output path
+        normalize: Compile an obfuscation-aware matcher
+    
+    Returns:
+        Content hash of the compiled term set
+    """
+    definitions = [{"name": d["name"], "terms": list(d["terms"])} for d in definitions]
+    content_hash = definitions_hash(definitions, normalize)
+    if read_artifact_hash(path) == content_hash:
+        print(f"ℹ️  Blocklist artifact is up to date: {path} ({content_hash[:12]})")
+        return content_hash
+    
+    # Sorted input makes the artifact bytes reproducible for the same term set
+    matcher = BlocklistMatcher(normalize=normalize)
+    for name, term in sorted((d["name"], t) for d in definitions for t in d["terms"]):
+        matcher.add_term(term, name)
+    data = matcher.build().to_bytes(content_hash)
+    
+    # A unique temp file in the target directory, so concurrent compiles never share one
+    temp = tempfile.NamedTemporaryFile(
+        dir=os.path.dirname(os.path.abspath(path)),
+        prefix=f".{os.path.basename(path)}.",
+        suffix=".tmp",
+        delete=False
+    )
+    try:
+        with temp:
+            temp.write(data)
+        # NamedTemporaryFile is private to its creator; workers only need to read the artifact
+        os.chmod(temp.name, 0o644)
+        os.replace(temp.name, path)
+    except BaseException:
+        os.unlink(temp.name)
+        raise
+    
+    print(f"✅ Compiled {len(matcher.patterns)} patterns into {path} ({len(data)} bytes, {content_hash[:12]})")
+    return content_hash
+
+
+def load_matcher(path: str, expected_hash: Optional[str] = None) -> MappedBlocklistMatcher:
+    """Memory-map a compiled blocklist artifact"""
+    return MappedBlocklistMatcher(path, expected_hash)
+
+
+def build_default_matcher(normalize: bool = False) -> BlocklistMatcher:
+    """Build a matcher over the political and religious blocklist terms"""
+    from create_blocklists import get_blocklist_definitions
+    
+    return BlocklistMatcher.from_definitions(get_blocklist_definitions(), normalize)
+
+
+def main():
+    """Screen texts given on the command line against the local blocklist terms"""
+    parser = argparse.ArgumentParser(description="Screen text against the local blocklist terms")
+    parser.add_argument("texts", nargs="*", help="Texts to screen")
+    parser.add_argument("--compile", metavar="PATH",
+                        help="Compile the blocklist terms into a memory-mappable artifact")
+    parser.add_argument("--artifact", metavar="PATH",
+                        help="Screen with a compiled artifact instead of building the matcher")
+    parser.add_argument("--normalize", action="store_true",
+                        help="Match obfuscated terms (homoglyphs, leetspeak, inserted punctuation)")
+    args = parser.parse_args()
+    
+    if args.compile:
+        from create_blocklists import get_blocklist_definitions
+        
+        compile_artifact(get_blocklist_definitions(), args.compile, args.normalize)
+        return
+    
+    if args.artifact:
+        matcher = load_matcher(args.artifact)
+        print(f"✅ Mapped {args.artifact} with {matcher.num_patterns} patterns ({matcher.num_states} states)")
+    else:
+        matcher = build_default_matcher(args.normalize)
+        print(f"✅ Matcher built with {len(matcher.patterns)} patterns ({len(matcher.goto)} states)")
+    
+    for text in args.texts:
+        matches = matcher.matched_terms(text)
+        if matches:
+            print(f"🚫 {text}")
+            for blocklist_name, terms in matches.items():
+                print(f"   {blocklist_name}: {', '.join(terms)}")
+        else:
+            print(f"✅ {text}")
+
+
+if __name__ == "__main__":
+    main()
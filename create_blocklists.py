@@ -6,20 +6,375 @@ Azure Content Safety - Create Custom Blocklists for Political and Religious Cont
 This script creates custom blocklists in Azure Content Safety for political and religious content filtering.
 """
 
+import argparse
+import asyncio
+import copy
+import csv
+import hashlib
+import json
+import os
+import random
 import requests
+import threading
 import time
-from typing import List, Dict
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Optional, Tuple, Iterable, Iterator, AsyncIterable, AsyncIterator, Union
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Content Safety limits for addOrUpdateBlocklistItems
+MAX_BLOCKLIST_ITEMS_PER_REQUEST = 100
+MAX_BLOCKLIST_ITEM_LENGTH = 128
+MAX_REQUEST_PAYLOAD_BYTES = 64 * 1024
+
+class AdaptiveRateLimiter:
+    """Token-bucket rate limiter that adapts to 429/503 throttling from the service"""
+    
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: int = 10,
+        min_rate: float = 0.5,
+        max_rate: float = 100.0,
+        increase_step: float = 0.5,
+        max_retries: int = 5,
+        base_backoff: float = 0.5,
+        max_backoff: float = 30.0
+    ):
+        """
+        Initialize the rate limiter
+        
+        Args:
+            rate: Initial requests per second
+            burst: Bucket capacity (requests that may be sent back to back)
+            min_rate: Lower bound the rate is cut to under throttling
+            max_rate: Upper bound the rate grows to while requests succeed
+            increase_step: Requests per second added after each success
+            max_retries: Retries for a throttled request before giving up
+            base_backoff: First backoff delay when no Retry-After is sent
+            max_backoff: Cap for backoff and Retry-After delays
+        """
+        self.rate = rate
+        self.capacity = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+        
+        # Reporting
+        self.requests = 0
+        self.throttle_responses = 0
+        self.throttled_seconds = 0.0
+    
+    def _reserve(self) -> float:
+        """Take a token and return how long the caller must wait before sending"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            self.requests += 1
+            return max(0.0, -self.tokens / self.rate, self.blocked_until - now)
+    
+    def acquire(self):
+        """Block until a request may be sent"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+    
+    async def acquire_async(self):
+        """Wait without blocking the event loop until a request may be sent"""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+    
+    def record_response(self, status_code: int, headers, attempt: int) -> bool:
+        """
+        Adapt the rate to a response
+        
+        Args:
+            status_code: HTTP status of the response
+            headers: Response headers
+            attempt: Zero-based attempt number of the request
+            
+        Returns:
+            True if the request was throttled and should be retried
+        """
+        now = time.monotonic()
+        
+        if status_code not in (429, 503):
+            with self.lock:
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
+                # Pause pre-emptively when the service says the window is used up
+                if headers.get('x-ratelimit-remaining-requests') == '0':
+                    reset = _parse_delay_seconds(headers.get('x-ratelimit-reset-requests'))
+                    if reset:
+                        self._block(now, min(reset, self.max_backoff))
+            return False
+        
+        delay = _retry_after_seconds(headers)
+        if delay is None:
+            # Full jitter keeps concurrent callers from retrying in lockstep
+            delay = random.uniform(0, min(self.max_backoff, self.base_backoff * (2 ** attempt)))
+        else:
+            delay = min(self.max_backoff, delay) + random.uniform(0, self.base_backoff)
+        
+        with self.lock:
+            self.throttle_responses += 1
+            # Concurrent requests throttled in the same window only cut the rate once
+            if now >= self.blocked_until:
+                self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+            self._block(now, delay)
+        return attempt < self.max_retries
+    
+    def _block(self, now: float, delay: float):
+        """Hold every caller until now + delay, counting only newly blocked time"""
+        until = now + delay
+        if until > self.blocked_until:
+            self.throttled_seconds += until - max(self.blocked_until, now)
+            self.blocked_until = until
+    
+    def stats(self) -> Dict:
+        """Get throttling statistics"""
+        return {
+            "requests": self.requests,
+            "throttle_responses": self.throttle_responses,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+            "current_rate": round(self.rate, 2)
+        }
+
+
+def _parse_delay_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a delay header given in seconds, e.g. '2', '1.5' or '1.5s'"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value.strip().rstrip('s')))
+    except ValueError:
+        return None
+
+
+def _retry_after_seconds(headers) -> Optional[float]:
+    """Read the server-requested retry delay from response headers"""
+    for name in ('retry-after-ms', 'x-ms-retry-after-ms'):
+        delay = _parse_delay_seconds(headers.get(name))
+        if delay is not None:
+            return delay / 1000
+    
+    retry_after = headers.get('Retry-After')
+    delay = _parse_delay_seconds(retry_after)
+    if delay is not None or not retry_after:
+        return delay
+    
+    # Retry-After may also be an HTTP date
+    try:
+        return max(0.0, (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def diff_blocklist_items(existing_items: List[Dict], terms: Iterable[str]) -> Tuple[List[str], List[str], int]:
+    """
+    Compute the changes that turn a blocklist's current items into the desired terms
+    
+    Args:
+        existing_items: Items as returned by the list-items API
+        terms: Desired blocklist terms
+        
+    Returns:
+        Terms to add, item IDs to remove, and the number of terms already present
+    """
+    terms = list(terms)
+    desired = set(terms)
+    present = set()
+    to_remove = []
+    
+    for item in existing_items:
+        text = item.get('text')
+        if text in desired and text not in present:
+            present.add(text)
+        else:
+            # Stale terms and duplicate copies of a kept term are both removed
+            to_remove.append(item['blocklistItemId'])
+    
+    # Preserve the caller's term order for the additions
+    to_add = list(dict.fromkeys(term for term in terms if term not in present))
+    return to_add, to_remove, len(present)
+
+
+def _batches(items: List, batch_size: int = 100) -> List[List]:
+    """Split items into API-sized batches"""
+    return [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+
+class ScreeningCache:
+    """LRU cache with TTL eviction for text analysis results"""
+    
+    def __init__(self, max_size: int = 10000, ttl: float = 300.0):
+        """
+        Initialize the screening cache
+        
+        Args:
+            max_size: Maximum number of cached results
+            ttl: Seconds a cached result stays valid
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        # Bumped whenever a blocklist changes, so keys built before the change never match again
+        self.blocklist_versions: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def make_key(self, text: str, blocklist_names: List[str], halt_on_blocklist_hit: bool = False) -> str:
+        """Hash the normalized text together with the current version of each blocklist"""
+        normalized = " ".join(text.casefold().split())
+        with self.lock:
+            versions = [(name, self.blocklist_versions.get(name, 0)) for name in sorted(set(blocklist_names))]
+        digest = hashlib.sha256(normalized.encode("utf-8"))
+        digest.update(json.dumps([versions, halt_on_blocklist_hit]).encode("utf-8"))
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """Get a copy of a cached result, or None if it is missing or expired"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self.entries[key]
+                    self.evictions += 1
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        # Callers may modify their result; later hits must not see that
+        return copy.deepcopy(entry[1])
+    
+    def put(self, key: str, result: Dict):
+        """Cache a copy of a result, evicting the least recently used entries beyond max_size"""
+        result = copy.deepcopy(result)
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, result)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+    
+    def invalidate(self, blocklist_name: str):
+        """Invalidate every cached result that screened against a blocklist"""
+        with self.lock:
+            self.blocklist_versions[blocklist_name] = self.blocklist_versions.get(blocklist_name, 0) + 1
+    
+    def clear(self):
+        """Drop all cached results"""
+        with self.lock:
+            self.entries.clear()
+    
+    def stats(self) -> Dict:
+        """Get cache statistics"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
 
 class BlocklistManager:
     """Manage Azure Content Safety blocklists"""
     
-    def __init__(self, endpoint: str, api_key: str):
+    def __init__(
+        self,
+        endpoint: str,
+        api_key: str,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        timeout: float = 30.0,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        screening_cache: Optional[ScreeningCache] = None
+    ):
+        """
+        Initialize the blocklist manager
+        
+        Args:
+            endpoint: Azure Content Safety endpoint
+            api_key: Content Safety subscription key
+            pool_size: Maximum number of pooled keep-alive connections
+            max_retries: Retries for transient connection and server errors
+            timeout: Per-request timeout in seconds
+            rate_limiter: Limiter shared by all calls (one is created if omitted)
+            screening_cache: Cache for analyze_text() results (disabled if omitted)
+        """
         self.endpoint = endpoint.rstrip('/')
         self.api_key = api_key
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        self.screening_cache = screening_cache
         self.headers = {
             'Ocp-Apim-Subscription-Key': api_key,
             'Content-Type': 'application/json'
         }
+        self.session = self._create_session(pool_size, max_retries)
+    
+    def _create_session(self, pool_size: int, max_retries: int) -> requests.Session:
+        """Create a pooled keep-alive session with a retry adapter mounted"""
+        session = requests.Session()
+        session.headers.update(self.headers)
+        
+        # Blocklist create/add calls are idempotent upserts, so PATCH and POST are safe to retry.
+        # 429/503 are left to the rate limiter so it can slow down instead of retrying blindly.
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=0.5,
+            status_forcelist=[500, 502, 504],
+            respect_retry_after_header=False,
+            allowed_methods=frozenset(["GET", "PATCH", "POST", "DELETE"]),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+    
+    def close(self):
+        """Close the pooled session and release its connections"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _request(self, method: str, url: str, payload: Optional[Dict] = None) -> requests.Response:
+        """Send a request through the rate limiter, retrying while the service throttles"""
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            response = self.session.request(method, url, json=payload, timeout=self.timeout)
+            if not self.rate_limiter.record_response(response.status_code, response.headers, attempt):
+                return response
+            attempt += 1
+    
+    def _invalidate_cache(self, blocklist_name: str):
+        """Invalidate cached screening results for a blocklist that changed"""
+        if self.screening_cache is not None:
+            self.screening_cache.invalidate(blocklist_name)
     
     def create_blocklist(self, blocklist_name: str, description: str) -> bool:
         """Create a new blocklist"""
@@ -30,7 +385,7 @@ class BlocklistManager:
         }
         
         try:
-            response = requests.patch(url, headers=self.headers, json=payload)
+            response = self._request("PATCH", url, payload)
             
             if response.status_code in [200, 201]:
                 print(f"✅ Created blocklist: {blocklist_name}")
@@ -58,7 +413,7 @@ class BlocklistManager:
         }
         
         try:
-            response = requests.post(url, headers=self.headers, json=payload)
+            response = self._request("POST", url, payload)
             
             if response.status_code == 200:
                 result = response.json()
@@ -72,13 +427,16 @@ class BlocklistManager:
         except Exception as e:
             print(f"❌ Error adding items to blocklist {blocklist_name}: {str(e)}")
             return False
+        finally:
+            # The list may have changed even if the call failed part-way
+            self._invalidate_cache(blocklist_name)
     
     def get_blocklist(self, blocklist_name: str) -> Dict:
         """Get blocklist information"""
         url = f"{self.endpoint}/contentsafety/text/blocklists/{blocklist_name}?api-version=2024-09-01"
         
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self._request("GET", url)
             
             if response.status_code == 200:
                 return response.json()
@@ -95,7 +453,7 @@ class BlocklistManager:
         url = f"{self.endpoint}/contentsafety/text/blocklists?api-version=2024-09-01"
         
         try:
-            response = requests.get(url, headers=self.headers)
+            response = self._request("GET", url)
             
             if response.status_code == 200:
                 result = response.json()
@@ -107,6 +465,690 @@ class BlocklistManager:
         except Exception as e:
             print(f"❌ Error listing blocklists: {str(e)}")
             return []
+    
+    def describe_blocklists(self, blocklist_names: Optional[List[str]] = None, max_concurrency: int = 8) -> List[Dict]:
+        """
+        Fetch details for many blocklists concurrently
+        
+        Args:
+            blocklist_names: Blocklists to describe (all blocklists if omitted)
+            max_concurrency: Maximum concurrent requests (keep at or below pool_size)
+            
+        Returns:
+            One combined entry per blocklist, in listing order; entries whose details
+            could not be fetched keep the fields from the listing
+        """
+        if blocklist_names is None:
+            listed = self.list_blocklists()
+        else:
+            listed = [{"blocklistName": name} for name in blocklist_names]
+        
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            details = executor.map(self.get_blocklist, [b.get('blocklistName') for b in listed])
+            return [{**summary, **detail} for summary, detail in zip(listed, details)]
+    
+    def list_blocklist_items(self, blocklist_name: str, page_size: int = 1000) -> Optional[List[Dict]]:
+        """
+        List every item in a blocklist, following the paginated list-items API
+        
+        Args:
+            blocklist_name: Blocklist to read
+            page_size: Items requested per page
+            
+        Returns:
+            List of blocklist items, or None if any page could not be fetched
+        """
+        url = f"{self.endpoint}/contentsafety/text/blocklists/{blocklist_name}/blocklistItems?api-version=2024-09-01&maxpagesize={page_size}"
+        items = []
+        
+        try:
+            while url:
+                response = self._request("GET", url)
+                
+                if response.status_code != 200:
+                    print(f"❌ Failed to list items in blocklist {blocklist_name}: {response.status_code} - {response.text}")
+                    return None
+                
+                result = response.json()
+                items.extend(result.get('value', []))
+                url = result.get('nextLink')
+            return items
+            
+        except Exception as e:
+            print(f"❌ Error listing items in blocklist {blocklist_name}: {str(e)}")
+            return None
+    
+    def remove_blocklist_items(self, blocklist_name: str, item_ids: List[str]) -> bool:
+        """Remove items from a blocklist by ID (batch operation)"""
+        url = f"{self.endpoint}/contentsafety/text/blocklists/{blocklist_name}:removeBlocklistItems?api-version=2024-09-01"
+        
+        payload = {
+            "blocklistItemIds": item_ids
+        }
+        
+        try:
+            response = self._request("POST", url, payload)
+            
+            if response.status_code in [200, 204]:
+                print(f"✅ Removed {len(item_ids)} items from blocklist: {blocklist_name}")
+                return True
+            else:
+                print(f"❌ Failed to remove items from blocklist {blocklist_name}: {response.status_code} - {response.text}")
+                return False
+                
+        except Exception as e:
+            print(f"❌ Error removing items from blocklist {blocklist_name}: {str(e)}")
+            return False
+        finally:
+            # The list may have changed even if the call failed part-way
+            self._invalidate_cache(blocklist_name)
+    
+    def sync_blocklist(
+        self,
+        blocklist_name: str,
+        description: str,
+        terms: List[str],
+        existing: Optional[Dict] = None
+    ) -> Optional[Dict]:
+        """
+        Bring a blocklist in line with the given terms, sending only the changes
+        
+        Args:
+            blocklist_name: Blocklist to sync
+            description: Desired blocklist description
+            terms: Desired blocklist terms
+            existing: The blocklist as returned by list_blocklists(), or None if it does not exist yet
+            
+        Returns:
+            Counts of added, removed and unchanged items, or None on failure
+        """
+        if existing is None or existing.get('description') != description:
+            if not self.create_blocklist(blocklist_name, description):
+                return None
+        
+        current_items = self.list_blocklist_items(blocklist_name) if existing is not None else []
+        if current_items is None:
+            return None
+        
+        to_add, to_remove, unchanged = diff_blocklist_items(current_items, terms)
+        
+        # Add before removing so the list never has a gap in coverage
+        for batch in chunk_terms(to_add):
+            if not self.add_blocklist_items(blocklist_name, batch):
+                return None
+        for batch in _batches(to_remove):
+            if not self.remove_blocklist_items(blocklist_name, batch):
+                return None
+        
+        return {"added": len(to_add), "removed": len(to_remove), "unchanged": unchanged}
+    
+    def analyze_text(self, text: str, blocklist_names: List[str], halt_on_blocklist_hit: bool = False) -> Dict:
+        """Screen a text against blocklists and the harm categories"""
+        url = f"{self.endpoint}/contentsafety/text:analyze?api-version=2024-09-01"
+        
+        payload = {
+            "text": text,
+            "blocklistNames": blocklist_names,
+            "haltOnBlocklistHit": halt_on_blocklist_hit
+        }
+        
+        cache_key = None
+        if self.screening_cache is not None:
+            cache_key = self.screening_cache.make_key(text, blocklist_names, halt_on_blocklist_hit)
+            cached = self.screening_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        try:
+            response = self._request("POST", url, payload)
+            
+            if response.status_code == 200:
+                result = response.json()
+                if cache_key is not None:
+                    self.screening_cache.put(cache_key, result)
+                return result
+            else:
+                print(f"❌ Failed to analyze text: {response.status_code} - {response.text}")
+                return {}
+                
+        except Exception as e:
+            print(f"❌ Error analyzing text: {str(e)}")
+            return {}
+    
+    def analyze_texts(
+        self,
+        texts: Iterable[str],
+        blocklist_names: List[str],
+        max_concurrency: int = 8
+    ) -> Iterator[Tuple[str, Dict]]:
+        """
+        Screen many texts with concurrent in-flight requests
+        
+        Texts are dispatched as they are read, with at most 2 * max_concurrency outstanding,
+        so arbitrarily long iterables are screened in constant memory.
+        
+        Args:
+            texts: Texts to screen
+            blocklist_names: Blocklists to screen against
+            max_concurrency: Maximum concurrent requests (keep at or below pool_size)
+            
+        Yields:
+            (text, analysis result) pairs in input order
+        """
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            pending = deque()
+            for text in texts:
+                pending.append((text, executor.submit(self.analyze_text, text, blocklist_names)))
+                # Hand back finished results at the head, and wait on it once the window is full
+                while pending and (pending[0][1].done() or len(pending) >= 2 * max_concurrency):
+                    head_text, future = pending.popleft()
+                    yield head_text, future.result()
+            
+            while pending:
+                head_text, future = pending.popleft()
+                yield head_text, future.result()
+
+
+async def _pump_texts(texts: Union[Iterable[str], AsyncIterable[str]], queue: asyncio.Queue, end: object):
+    """
+    Feed texts from an iterable or async iterable into a bounded queue, then the end marker
+    
+    The end marker is queued even if the source raises, so the consumer never waits
+    forever; the source's exception stays on this task for the consumer to re-raise.
+    """
+    cancelled = False
+    try:
+        if hasattr(texts, '__aiter__'):
+            async for text in texts:
+                await queue.put(text)
+        else:
+            for text in texts:
+                await queue.put(text)
+    except asyncio.CancelledError:
+        # The consumer is gone, so nobody would drain the queue
+        cancelled = True
+        raise
+    finally:
+        if not cancelled:
+            await queue.put(end)
+
+
+async def _next_text_batch(
+    queue: asyncio.Queue,
+    end: object,
+    batch_window: float,
+    max_batch_size: int,
+    head: Optional[asyncio.Future]
+) -> Tuple[List[str], bool]:
+    """
+    Collect the texts that arrive within one batch window
+    
+    Returns early with an empty batch if the in-flight head finishes first, so its result
+    can be yielded without waiting on a slow source.
+    
+    Returns:
+        The batch and whether the source is exhausted
+    """
+    getter = asyncio.ensure_future(queue.get())
+    await asyncio.wait({getter, head} if head else {getter}, return_when=asyncio.FIRST_COMPLETED)
+    if not getter.done():
+        getter.cancel()
+        return [], False
+    
+    text = getter.result()
+    if text is end:
+        return [], True
+    
+    batch = [text]
+    deadline = asyncio.get_running_loop().time() + batch_window
+    while len(batch) < max_batch_size:
+        remaining = deadline - asyncio.get_running_loop().time()
+        if remaining <= 0:
+            break
+        try:
+            text = await asyncio.wait_for(queue.get(), remaining)
+        except asyncio.TimeoutError:
+            break
+        if text is end:
+            return batch, True
+        batch.append(text)
+    return batch, False
+
+
+class AsyncBlocklistManager:
+    """Manage Azure Content Safety blocklists with asyncio and concurrent batch uploads"""
+    
+    def __init__(
+        self,
+        endpoint: str,
+        api_key: str,
+        max_concurrency: int = 8,
+        pool_size: int = 20,
+        timeout: float = 30.0,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+        screening_cache: Optional[ScreeningCache] = None
+    ):
+        """
+        Initialize the async blocklist manager
+        
+        Args:
+            endpoint: Azure Content Safety endpoint
+            api_key: Content Safety subscription key
+            max_concurrency: Maximum number of requests in flight at once
+            pool_size: Maximum number of pooled keep-alive connections
+            timeout: Per-request timeout in seconds
+            rate_limiter: Limiter shared by all calls (one is created if omitted)
+            screening_cache: Cache for analyze_text() results (disabled if omitted)
+        """
+        self.endpoint = endpoint.rstrip('/')
+        self.api_key = api_key
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        self.screening_cache = screening_cache
+        self.max_concurrency = max_concurrency
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.headers = {
+            'Ocp-Apim-Subscription-Key': api_key,
+            'Content-Type': 'application/json'
+        }
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.session = None
+    
+    def _get_session(self):
+        """Create the pooled aiohttp session on first use"""
+        if self.session is None:
+            # aiohttp is only needed for the async path
+            import aiohttp
+            
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self.session
+    
+    async def close(self):
+        """Close the pooled session and release its connections"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+    
+    async def _request(self, method: str, url: str, payload: Optional[Dict] = None):
+        """Send a request under the concurrency and rate limits and return (status, body)"""
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire_async()
+            async with self.semaphore:
+                async with self._get_session().request(method, url, json=payload) as response:
+                    status, text = response.status, await response.text()
+                    headers = response.headers
+            if not self.rate_limiter.record_response(status, headers, attempt):
+                return status, text
+            attempt += 1
+    
+    def _invalidate_cache(self, blocklist_name: str):
+        """Invalidate cached screening results for a blocklist that changed"""
+        if self.screening_cache is not None:
+            self.screening_cache.invalidate(blocklist_name)
+    
+    async def create_blocklist(self, blocklist_name: str, description: str) -> bool:
+        """Create a new blocklist"""
+        url = f"{self.endpoint}/contentsafety/text/blocklists/{blocklist_name}?api-version=2024-09-01"
+        
+        try:
+            status, text = await self._request("PATCH", url, {"description": description})
+            
+            if status in [200, 201]:
+                print(f"✅ Created blocklist: {blocklist_name}")
+                return True
+            elif status == 409:
+                print(f"ℹ️  Blocklist already exists: {blocklist_name}")
+                return True
+            else:
+                print(f"❌ Failed to create blocklist {blocklist_name}: {status} - {text}")
+                return False
+                
+        except Exception as e:
+            print(f"❌ Error creating blocklist {blocklist_name}: {str(e)}")
+            return False
+    
+    async def add_blocklist_items(self, blocklist_name: str, items: List[str]) -> bool:
+        """Add items to a blocklist (batch operation)"""
+        url = f"{self.endpoint}/contentsafety/text/blocklists/{blocklist_name}:addOrUpdateBlocklistItems?api-version=2024-09-01"
+        
+        payload = {
+            "blocklistItems": [{"description": item, "text": item} for item in items]
+        }
+        
+        try:
+            status, text = await self._request("POST", url, payload)
+            
+            if status == 200:
+                added_count = len(json.loads(text).get('blocklistItems', []))
+                print(f"✅ Added {added_count} items to blocklist: {blocklist_name}")
+                return True
+            else:
+                print(f"❌ Failed to add items to blocklist {blocklist_name}: {status} - {text}")
+                return False
+                
+        except Exception as e:
+            print(f"❌ Error adding items to blocklist {blocklist_name}: {str(e)}")
+            return False
+        finally:
+            # The list may have changed even if the call failed part-way
+            self._invalidate_cache(blocklist_name)
+    
+    async def get_blocklist(self, blocklist_name: str) -> Dict:
+        """Get blocklist information"""
+        url = f"{self.endpoint}/contentsafety/text/blocklists/{blocklist_name}?api-version=2024-09-01"
+        
+        try:
+            status, text = await self._request("GET", url)
+            
+            if status == 200:
+                return json.loads(text)
+            else:
+                print(f"❌ Failed to get blocklist {blocklist_name}: {status} - {text}")
+                return {}
+                
+        except Exception as e:
+            print(f"❌ Error getting blocklist {blocklist_name}: {str(e)}")
+            return {}
+    
+    async def list_blocklists(self) -> List[Dict]:
+        """List all blocklists"""
+        url = f"{self.endpoint}/contentsafety/text/blocklists?api-version=2024-09-01"
+        
+        try:
+            status, text = await self._request("GET", url)
+            
+            if status == 200:
+                return json.loads(text).get('value', [])
+            else:
+                print(f"❌ Failed to list blocklists: {status} - {text}")
+                return []
+                
+        except Exception as e:
+            print(f"❌ Error listing blocklists: {str(e)}")
+            return []
+    
+    async def describe_blocklists(self, blocklist_names: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Fetch details for many blocklists concurrently under the manager's concurrency limit
+        
+        Args:
+            blocklist_names: Blocklists to describe (all blocklists if omitted)
+            
+        Returns:
+            One combined entry per blocklist, in listing order; entries whose details
+            could not be fetched keep the fields from the listing
+        """
+        if blocklist_names is None:
+            listed = await self.list_blocklists()
+        else:
+            listed = [{"blocklistName": name} for name in blocklist_names]
+        
+        details = await asyncio.gather(*(self.get_blocklist(b.get('blocklistName')) for b in listed))
+        return [{**summary, **detail} for summary, detail in zip(listed, details)]
+    
+    async def upload_terms(self, blocklist_name: str, terms: Iterable[str]) -> int:
+        """
+        Upload terms to a blocklist with batches in flight concurrently
+        
+        Terms are chunked as they are read and at most 2 * max_concurrency batches are
+        outstanding, so generators over very large term files upload in constant memory.
+        
+        Args:
+            blocklist_name: Target blocklist
+            terms: Terms to add
+            
+        Returns:
+            Number of batches that failed
+        """
+        failed = 0
+        in_flight = set()
+        
+        for batch in chunk_terms(terms):
+            if len(in_flight) >= 2 * self.max_concurrency:
+                done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                failed += sum(1 for task in done if not task.result())
+            in_flight.add(asyncio.ensure_future(self.add_blocklist_items(blocklist_name, batch)))
+        
+        if in_flight:
+            done, _ = await asyncio.wait(in_flight)
+            failed += sum(1 for task in done if not task.result())
+        return failed
+    
+    async def provision_blocklist(self, blocklist_name: str, description: str, terms: Iterable[str]) -> bool:
+        """Create a blocklist and upload its terms"""
+        if not await self.create_blocklist(blocklist_name, description):
+            return False
+        
+        failed_batches = await self.upload_terms(blocklist_name, terms)
+        if failed_batches:
+            print(f"❌ {failed_batches} batch(es) failed for blocklist: {blocklist_name}")
+        return failed_batches == 0
+    
+    async def provision_blocklists(self, definitions: List[Dict]) -> Dict[str, bool]:
+        """
+        Create and populate several blocklists concurrently
+        
+        Args:
+            definitions: Dictionaries with 'name', 'description' and 'terms' keys
+            
+        Returns:
+            Mapping of blocklist name to success
+        """
+        results = await asyncio.gather(
+            *(self.provision_blocklist(d["name"], d["description"], d["terms"]) for d in definitions)
+        )
+        return {d["name"]: success for d, success in zip(definitions, results)}
+    
+    async def list_blocklist_items(self, blocklist_name: str, page_size: int = 1000) -> Optional[List[Dict]]:
+        """
+        List every item in a blocklist, following the paginated list-items API
+        
+        Args:
+            blocklist_name: Blocklist to read
+            page_size: Items requested per page
+            
+        Returns:
+            List of blocklist items, or None if any page could not be fetched
+        """
+        url = f"{self.endpoint}/contentsafety/text/blocklists/{blocklist_name}/blocklistItems?api-version=2024-09-01&maxpagesize={page_size}"
+        items = []
+        
+        try:
+            while url:
+                status, text = await self._request("GET", url)
+                
+                if status != 200:
+                    print(f"❌ Failed to list items in blocklist {blocklist_name}: {status} - {text}")
+                    return None
+                
+                result = json.loads(text)
+                items.extend(result.get('value', []))
+                url = result.get('nextLink')
+            return items
+            
+        except Exception as e:
+            print(f"❌ Error listing items in blocklist {blocklist_name}: {str(e)}")
+            return None
+    
+    async def remove_blocklist_items(self, blocklist_name: str, item_ids: List[str]) -> bool:
+        """Remove items from a blocklist by ID (batch operation)"""
+        url = f"{self.endpoint}/contentsafety/text/blocklists/{blocklist_name}:removeBlocklistItems?api-version=2024-09-01"
+        
+        try:
+            status, text = await self._request("POST", url, {"blocklistItemIds": item_ids})
+            
+            if status in [200, 204]:
+                print(f"✅ Removed {len(item_ids)} items from blocklist: {blocklist_name}")
+                return True
+            else:
+                print(f"❌ Failed to remove items from blocklist {blocklist_name}: {status} - {text}")
+                return False
+                
+        except Exception as e:
+            print(f"❌ Error removing items from blocklist {blocklist_name}: {str(e)}")
+            return False
+        finally:
+            # The list may have changed even if the call failed part-way
+            self._invalidate_cache(blocklist_name)
+    
+    async def sync_blocklist(
+        self,
+        blocklist_name: str,
+        description: str,
+        terms: List[str],
+        existing: Optional[Dict] = None
+    ) -> Optional[Dict]:
+        """
+        Bring a blocklist in line with the given terms, sending only the changes
+        
+        Args:
+            blocklist_name: Blocklist to sync
+            description: Desired blocklist description
+            terms: Desired blocklist terms
+            existing: The blocklist as returned by list_blocklists(), or None if it does not exist yet
+            
+        Returns:
+            Counts of added, removed and unchanged items, or None on failure
+        """
+        if existing is None or existing.get('description') != description:
+            if not await self.create_blocklist(blocklist_name, description):
+                return None
+        
+        current_items = await self.list_blocklist_items(blocklist_name) if existing is not None else []
+        if current_items is None:
+            return None
+        
+        to_add, to_remove, unchanged = diff_blocklist_items(current_items, terms)
+        
+        # Add before removing so the list never has a gap in coverage
+        if await self.upload_terms(blocklist_name, to_add):
+            return None
+        removed = await asyncio.gather(*(self.remove_blocklist_items(blocklist_name, b) for b in _batches(to_remove)))
+        if not all(removed):
+            return None
+        
+        return {"added": len(to_add), "removed": len(to_remove), "unchanged": unchanged}
+    
+    async def sync_blocklists(self, definitions: List[Dict]) -> Dict[str, Optional[Dict]]:
+        """
+        Sync several blocklists concurrently, sending only added and removed items
+        
+        Args:
+            definitions: Dictionaries with 'name', 'description' and 'terms' keys
+            
+        Returns:
+            Mapping of blocklist name to its sync summary (None on failure)
+        """
+        existing = {b.get('blocklistName'): b for b in await self.list_blocklists()}
+        results = await asyncio.gather(
+            *(self.sync_blocklist(d["name"], d["description"], d["terms"], existing.get(d["name"]))
+              for d in definitions)
+        )
+        return {d["name"]: summary for d, summary in zip(definitions, results)}
+    
+    async def analyze_text(self, text: str, blocklist_names: List[str], halt_on_blocklist_hit: bool = False) -> Dict:
+        """Screen a text against blocklists and the harm categories"""
+        url = f"{self.endpoint}/contentsafety/text:analyze?api-version=2024-09-01"
+        
+        payload = {
+            "text": text,
+            "blocklistNames": blocklist_names,
+            "haltOnBlocklistHit": halt_on_blocklist_hit
+        }
+        
+        cache_key = None
+        if self.screening_cache is not None:
+            cache_key = self.screening_cache.make_key(text, blocklist_names, halt_on_blocklist_hit)
+            cached = self.screening_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        try:
+            status, body = await self._request("POST", url, payload)
+            
+            if status == 200:
+                result = json.loads(body)
+                if cache_key is not None:
+                    self.screening_cache.put(cache_key, result)
+                return result
+            else:
+                print(f"❌ Failed to analyze text: {status} - {body}")
+                return {}
+                
+        except Exception as e:
+            print(f"❌ Error analyzing text: {str(e)}")
+            return {}
+    
+    async def analyze_stream(
+        self,
+        texts: Union[Iterable[str], AsyncIterable[str]],
+        blocklist_names: List[str],
+        batch_window: float = 0.01,
+        max_batch_size: Optional[int] = None,
+        max_pending: Optional[int] = None
+    ) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        Screen a stream of texts with micro-batched concurrent requests
+        
+        Texts arriving within batch_window of each other are coalesced and dispatched
+        together; the manager's semaphore caps requests in flight. Wrap the generator in
+        contextlib.aclosing() when breaking out early so outstanding requests are cancelled.
+        
+        Args:
+            texts: Iterable or async iterable of texts
+            blocklist_names: Blocklists to screen against
+            batch_window: Seconds to wait for more texts before dispatching a batch
+            max_batch_size: Texts per batch (defaults to max_concurrency)
+            max_pending: Dispatched texts awaiting their turn to be yielded (defaults to 4 * max_concurrency)
+            
+        Yields:
+            (text, analysis result) pairs in input order
+        """
+        max_batch_size = max_batch_size or self.max_concurrency
+        max_pending = max_pending or 4 * self.max_concurrency
+        
+        queue = asyncio.Queue(maxsize=max_batch_size)
+        end = object()
+        producer = asyncio.ensure_future(_pump_texts(texts, queue, end))
+        pending = deque()
+        exhausted = False
+        
+        try:
+            while not exhausted or pending:
+                # Hand back finished results at the head, in input order
+                while pending and pending[0][1].done():
+                    text, task = pending.popleft()
+                    yield text, task.result()
+                
+                if exhausted or len(pending) >= max_pending:
+                    if pending:
+                        await asyncio.wait({pending[0][1]})
+                    continue
+                
+                batch, exhausted = await _next_text_batch(
+                    queue, end, batch_window, max_batch_size, pending[0][1] if pending else None
+                )
+                for text in batch:
+                    pending.append((text, asyncio.ensure_future(self.analyze_text(text, blocklist_names))))
+                
+                if exhausted:
+                    # Surface errors raised while reading the source
+                    await producer
+        finally:
+            producer.cancel()
+            for _, task in pending:
+                task.cancel()
 
 
 def get_political_terms() -> List[str]:
@@ -184,95 +1226,310 @@ def get_religious_terms() -> List[str]:
     ]
 
 
-def main():
-    """Main function to create blocklists"""
+def read_terms(path: str, column: str = "term") -> Iterator[str]:
+    """
+    Stream raw terms from a term file without loading it into memory
     
-    print("\n" + "="*70)
-    print("AZURE CONTENT SAFETY - BLOCKLIST CREATION")
-    print("="*70)
-    print("Creating custom blocklists for political and religious content")
-    print("="*70)
+    Args:
+        path: A .csv file (column named `column`, else the first column), a .jsonl file
+            (strings or objects with a `column` key), or a text file with one term per line
+        column: Column or key holding the term
+        
+    Yields:
+        Raw terms in file order
+    """
+    extension = os.path.splitext(path)[1].lower()
+    
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if extension == ".csv":
+            reader = csv.reader(f)
+            header = next(reader, [])
+            index = header.index(column) if column in header else 0
+            if column not in header and header:
+                # No header row naming the column, so the first row is a term too
+                yield header[0]
+            for row in reader:
+                if len(row) > index:
+                    yield row[index]
+        elif extension in (".jsonl", ".ndjson"):
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                term = record if isinstance(record, str) else record.get(column)
+                if isinstance(term, str):
+                    yield term
+        else:
+            for line in f:
+                if not line.lstrip().startswith("#"):
+                    yield line
+
+
+def normalize_terms(terms: Iterable[str], max_length: int = MAX_BLOCKLIST_ITEM_LENGTH) -> Iterator[str]:
+    """Collapse whitespace, lowercase and drop empty or over-long terms"""
+    skipped = 0
+    for term in terms:
+        term = " ".join(term.split()).lower()
+        if not term:
+            continue
+        if len(term) > max_length:
+            skipped += 1
+            continue
+        yield term
+    
+    if skipped:
+        print(f"⚠️  Skipped {skipped} terms longer than {max_length} characters")
+
+
+def dedupe_terms(terms: Iterable[str]) -> Iterator[str]:
+    """
+    Drop repeated terms while streaming
+    
+    Only a 64-bit digest per distinct term is kept, so memory tracks the number of
+    distinct terms rather than the file size.
+    """
+    seen = set()
+    for term in terms:
+        digest = hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest()
+        if digest not in seen:
+            seen.add(digest)
+            yield term
+
+
+def chunk_terms(
+    terms: Iterable[str],
+    max_items: int = MAX_BLOCKLIST_ITEMS_PER_REQUEST,
+    max_bytes: int = MAX_REQUEST_PAYLOAD_BYTES
+) -> Iterator[List[str]]:
+    """
+    Group terms into batches that respect both the item limit and the payload size limit
+    
+    Args:
+        terms: Terms to batch
+        max_items: Maximum items per addOrUpdateBlocklistItems request
+        max_bytes: Maximum JSON payload size per request
+        
+    Yields:
+        Lists of terms
+    """
+    overhead = len(json.dumps({"blocklistItems": []}))
+    # Each term is sent as both description and text, plus the ", " list separator
+    item_overhead = len(json.dumps({"description": "", "text": ""})) - 4 + 2
+    batch, size = [], overhead
+    
+    for term in terms:
+        # json.dumps escapes non-ASCII by default, so its length is the encoded size
+        item_size = 2 * len(json.dumps(term)) + item_overhead
+        if batch and (len(batch) >= max_items or size + item_size > max_bytes):
+            yield batch
+            batch, size = [], overhead
+        batch.append(term)
+        size += item_size
+    
+    if batch:
+        yield batch
+
+
+def stream_terms(path: str, column: str = "term") -> Iterator[str]:
+    """Read, normalize and dedupe the terms in a file as a single streaming pipeline"""
+    return dedupe_terms(normalize_terms(read_terms(path, column)))
+
+
+def get_blocklist_definitions(term_files: Optional[Dict[str, str]] = None) -> List[Dict]:
+    """
+    Get the blocklists to provision with their descriptions and terms
+    
+    Args:
+        term_files: Optional mapping of blocklist name to a term file; the file's terms are
+            streamed in place of the built-in list, or define a new blocklist
+            
+    Returns:
+        List of dictionaries with 'name', 'description' and 'terms' keys
+    """
+    definitions = [
+        {
+            "name": "political-content-filter",
+            "description": "Custom blocklist for political content as per company policy - blocks political discussions, election content, and partisan topics",
+            "terms": get_political_terms()
+        },
+        {
+            "name": "religious-content-filter",
+            "description": "Custom blocklist for religious content as per company policy - blocks religious discussions, theological content, and faith-based topics",
+            "terms": get_religious_terms()
+        }
+    ]
+    
+    for name, path in (term_files or {}).items():
+        definition = next((d for d in definitions if d["name"] == name), None)
+        if definition is None:
+            definition = {"name": name, "description": f"Custom blocklist loaded from {os.path.basename(path)}"}
+            definitions.append(definition)
+        definition["terms"] = stream_terms(path)
+    
+    return definitions
+
+
+def provision_blocklists(
+    endpoint: str,
+    api_key: str,
+    sync: bool = False,
+    term_files: Optional[Dict[str, str]] = None
+):
+    """Create blocklists one after the other with the synchronous manager"""
     
     # Initialize the blocklist manager
     try:
         manager = BlocklistManager(
-            endpoint="",
-            api_key=""
+            endpoint=endpoint,
+            api_key=api_key
         )
         print("✅ Blocklist manager initialized")
     except Exception as e:
         print(f"❌ Failed to initialize blocklist manager: {str(e)}")
         return
     
-    # List existing blocklists
-    print("\n📋 Existing blocklists:")
-    existing_blocklists = manager.list_blocklists()
-    if existing_blocklists:
-        for blocklist in existing_blocklists:
-            print(f"  - {blocklist.get('blocklistName', 'Unknown')} ({blocklist.get('description', 'No description')})")
-    else:
-        print("  No existing blocklists found")
-    
-    # Create political content blocklist
-    print("\n🏛️  Creating political content blocklist...")
-    political_success = manager.create_blocklist(
-        blocklist_name="political-content-filter",
-        description="Custom blocklist for political content as per company policy - blocks political discussions, election content, and partisan topics"
-    )
-    
-    if political_success:
-        print("📝 Adding political terms to blocklist...")
-        political_terms = get_political_terms()
-        print(f"Adding {len(political_terms)} political terms...")
-        
-        # Add terms in batches of 100 (API limit)
-        batch_size = 100
-        for i in range(0, len(political_terms), batch_size):
-            batch = political_terms[i:i + batch_size]
-            success = manager.add_blocklist_items("political-content-filter", batch)
-            if success:
-                print(f"  ✅ Added batch {i//batch_size + 1} ({len(batch)} terms)")
-            else:
-                print(f"  ❌ Failed to add batch {i//batch_size + 1}")
-            time.sleep(1)  # Rate limiting
-    
-    # Create religious content blocklist
-    print("\n⛪ Creating religious content blocklist...")
-    religious_success = manager.create_blocklist(
-        blocklist_name="religious-content-filter", 
-        description="Custom blocklist for religious content as per company policy - blocks religious discussions, theological content, and faith-based topics"
-    )
-    
-    if religious_success:
-        print("📝 Adding religious terms to blocklist...")
-        religious_terms = get_religious_terms()
-        print(f"Adding {len(religious_terms)} religious terms...")
-        
-        # Add terms in batches of 100 (API limit)
-        batch_size = 100
-        for i in range(0, len(religious_terms), batch_size):
-            batch = religious_terms[i:i + batch_size]
-            success = manager.add_blocklist_items("religious-content-filter", batch)
+    # Reuse one pooled session for every call and close it when done
+    with manager:
+        # List existing blocklists
+        print("\n📋 Existing blocklists:")
+        existing_blocklists = manager.list_blocklists()
+        if existing_blocklists:
+            for blocklist in existing_blocklists:
+                print(f"  - {blocklist.get('blocklistName', 'Unknown')} ({blocklist.get('description', 'No description')})")
+        else:
+            print("  No existing blocklists found")
+        
+        existing_by_name = {b.get('blocklistName'): b for b in existing_blocklists}
+        for definition in get_blocklist_definitions(term_files):
+            name = definition["name"]
+            
+            if sync:
+                # Only send the items that differ from what the service already has
+                print(f"\n🔄 Syncing blocklist: {name}...")
+                summary = manager.sync_blocklist(
+                    name, definition["description"], definition["terms"], existing_by_name.get(name)
+                )
+                print_sync_summary(name, summary)
+                continue
+            
+            print(f"\n🗂️  Creating blocklist: {name}...")
+            success = manager.create_blocklist(
+                blocklist_name=name,
+                description=definition["description"]
+            )
+            
             if success:
-                print(f"  ✅ Added batch {i//batch_size + 1} ({len(batch)} terms)")
-            else:
-                print(f"  ❌ Failed to add batch {i//batch_size + 1}")
-            time.sleep(1)  # Rate limiting
+                print("📝 Adding terms to blocklist...")
+                
+                # Batches respect both the 100-item API limit and the payload size limit
+                for number, batch in enumerate(chunk_terms(definition["terms"]), 1):
+                    success = manager.add_blocklist_items(name, batch)
+                    if success:
+                        print(f"  ✅ Added batch {number} ({len(batch)} terms)")
+                    else:
+                        print(f"  ❌ Failed to add batch {number}")
+        
+        # Verify created blocklists, fetching their details concurrently
+        print_blocklist_status(manager.describe_blocklists())
+        
+        print_throttling_report(manager.rate_limiter)
+
+
+async def provision_blocklists_async(
+    endpoint: str,
+    api_key: str,
+    max_concurrency: int = 8,
+    sync: bool = False,
+    term_files: Optional[Dict[str, str]] = None
+):
+    """Create all blocklists and upload their batches concurrently"""
     
-    # Verify created blocklists
+    async with AsyncBlocklistManager(endpoint, api_key, max_concurrency=max_concurrency) as manager:
+        print(f"✅ Async blocklist manager initialized (max concurrency: {max_concurrency})")
+        
+        definitions = get_blocklist_definitions(term_files)
+        start = time.perf_counter()
+        if sync:
+            print(f"\n🔄 Syncing {len(definitions)} blocklists concurrently...")
+            for name, summary in (await manager.sync_blocklists(definitions)).items():
+                print_sync_summary(name, summary)
+        else:
+            print(f"\n🚀 Provisioning {len(definitions)} blocklists concurrently...")
+            results = await manager.provision_blocklists(definitions)
+            for name, success in results.items():
+                print(f"  {'✅' if success else '❌'} {name}")
+        elapsed = time.perf_counter() - start
+        print(f"⏱️  Provisioned in {elapsed:.2f}s")
+        
+        # Verify created blocklists, fetching their details concurrently
+        print_blocklist_status(await manager.describe_blocklists())
+        
+        print_throttling_report(manager.rate_limiter)
+
+
+def print_blocklist_status(blocklists: List[Dict]):
+    """Print the final status of each blocklist"""
     print("\n📋 Final blocklist status:")
-    final_blocklists = manager.list_blocklists()
-    for blocklist in final_blocklists:
-        name = blocklist.get('blocklistName', 'Unknown')
-        desc = blocklist.get('description', 'No description')
-        print(f"  ✅ {name}")
-        print(f"     Description: {desc}")
-        
-        # Get detailed info
-        details = manager.get_blocklist(name)
-        if details:
-            print(f"     Created: {details.get('createdDate', 'Unknown')}")
-            print(f"     Updated: {details.get('lastModifiedDate', 'Unknown')}")
+    for blocklist in blocklists:
+        print(f"  ✅ {blocklist.get('blocklistName', 'Unknown')}")
+        print(f"     Description: {blocklist.get('description', 'No description')}")
+        print(f"     Created: {blocklist.get('createdDate', 'Unknown')}")
+        print(f"     Updated: {blocklist.get('lastModifiedDate', 'Unknown')}")
+
+
+def print_sync_summary(blocklist_name: str, summary: Optional[Dict]):
+    """Print the outcome of a blocklist sync"""
+    if summary is None:
+        print(f"  ❌ Failed to sync blocklist: {blocklist_name}")
+    elif summary["added"] or summary["removed"]:
+        print(f"  ✅ {blocklist_name}: +{summary['added']} / -{summary['removed']} ({summary['unchanged']} unchanged)")
+    else:
+        print(f"  ✅ {blocklist_name}: up to date ({summary['unchanged']} items)")
+
+
+def print_throttling_report(rate_limiter: AdaptiveRateLimiter):
+    """Print how much time provisioning spent throttled"""
+    stats = rate_limiter.stats()
+    print("\n🚦 Rate limiting:")
+    print(f"   Requests: {stats['requests']}")
+    print(f"   Throttle responses (429/503): {stats['throttle_responses']}")
+    print(f"   Time throttled: {stats['throttled_seconds']:.2f}s")
+    print(f"   Final rate: {stats['current_rate']} req/s")
+
+
+def main():
+    """Main function to create blocklists"""
+    parser = argparse.ArgumentParser(description="Create Azure Content Safety blocklists")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Provision blocklists and upload batches concurrently")
+    parser.add_argument("--max-concurrency", type=int, default=8,
+                        help="Maximum concurrent requests in async mode")
+    parser.add_argument("--sync", action="store_true",
+                        help="Only send items that were added or removed since the last run")
+    parser.add_argument("--terms-file", action="append", default=[], metavar="NAME=PATH",
+                        help="Stream a blocklist's terms from a .txt, .csv or .jsonl file (repeatable)")
+    args = parser.parse_args()
+    
+    term_files = {}
+    for spec in args.terms_file:
+        name, separator, path = spec.partition("=")
+        if not separator or not name or not path:
+            parser.error(f"--terms-file expects NAME=PATH, got: {spec}")
+        term_files[name] = path
+    
+    endpoint = os.getenv("CONTENT_SAFETY_ENDPOINT", "")
+    api_key = os.getenv("CONTENT_SAFETY_KEY", "")
+    
+    print("\n" + "="*70)
+    print("AZURE CONTENT SAFETY - BLOCKLIST CREATION")
+    print("="*70)
+    print("Creating custom blocklists for political and religious content")
+    print("="*70)
+    
+    if args.use_async:
+        asyncio.run(provision_blocklists_async(endpoint, api_key, args.max_concurrency, args.sync, term_files))
+    else:
+        provision_blocklists(endpoint, api_key, args.sync, term_files)
     
     print("\n" + "="*70)
     print("🎉 BLOCKLIST CREATION COMPLETED")
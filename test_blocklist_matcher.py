@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Unit tests for blocklist_matcher.py
+"""
+
+import os
+import random
+import threading
+
+import pytest
+
+from blocklist_matcher import (
+    BlocklistMatcher,
+    MappedBlocklistMatcher,
+    compile_artifact,
+    normalize_for_matching,
+    read_artifact_hash,
+    term_variants,
+)
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+def naive_matches(definitions, text):
+    """Reference search: every case-insensitive occurrence of every term on word boundaries"""
+    lowered = text.lower()
+    found = set()
+    for definition in definitions:
+        for term in definition["terms"]:
+            key = term.strip().lower()
+            start = lowered.find(key)
+            while key and start != -1:
+                end = start + len(key)
+                before_ok = start == 0 or not (_is_word_char(lowered[start - 1]) and _is_word_char(lowered[start]))
+                after_ok = end == len(lowered) or not (_is_word_char(lowered[end - 1]) and _is_word_char(lowered[end]))
+                if before_ok and after_ok:
+                    found.add((term.strip(), definition["name"], start, end))
+                start = lowered.find(key, start + 1)
+    return found
+
+
+def scanned(matcher, text):
+    return {(m.term, m.blocklist_name, m.start, m.end) for m in matcher.scan(text)}
+
+
+DEFINITIONS = [
+    {"name": "politics", "terms": ["vote", "vote for", "election fraud", "fraud"]},
+    {"name": "religion", "terms": ["holy war", "war", "Holy"]},
+]
+
+
+@pytest.fixture
+def matcher():
+    return BlocklistMatcher.from_definitions(DEFINITIONS)
+
+
+def test_matches_on_word_boundaries_only(matcher):
+    assert scanned(matcher, "please vote today") == {("vote", "politics", 7, 11)}
+    # Inside longer words
+    assert scanned(matcher, "devoted voters") == set()
+    assert scanned(matcher, "warfare and software") == set()
+    # Punctuation and text edges are boundaries
+    assert scanned(matcher, "war!") == {("war", "religion", 0, 3)}
+    assert scanned(matcher, "(vote)") == {("vote", "politics", 1, 5)}
+
+
+def test_reports_overlapping_and_nested_terms(matcher):
+    result = scanned(matcher, "a vote for election fraud")
+    
+    assert result == {
+        ("vote", "politics", 2, 6),
+        ("vote for", "politics", 2, 10),
+        ("election fraud", "politics", 11, 25),
+        ("fraud", "politics", 20, 25),
+    }
+    assert scanned(matcher, "holy war") == {
+        ("Holy", "religion", 0, 4),
+        ("holy war", "religion", 0, 8),
+        ("war", "religion", 5, 8),
+    }
+
+
+def test_case_folding_keeps_original_offsets(matcher):
+    text = "HOLY WAR and Vote For"
+    
+    result = scanned(matcher, text)
+    
+    assert ("holy war", "religion", 0, 8) in result
+    assert ("vote for", "politics", 13, 21) in result
+    assert all(text[start:end].lower() == term.lower() for term, _, start, end in result)
+
+
+def test_offsets_survive_characters_that_lowercase_to_several():
+    matcher = BlocklistMatcher.from_definitions([{"name": "list", "terms": ["war"]}])
+    # "İ" lowercases to two characters, shifting every later position of the lowered text
+    text = "İİ war"
+    
+    [match] = matcher.scan(text)
+    
+    assert text[match.start:match.end] == "war"
+
+
+def test_first_match_and_helpers(matcher):
+    assert matcher.first_match("nothing here") is None
+    assert matcher.is_blocked("Stop the WAR")
+    assert matcher.matched_terms("vote for war, vote!") == {
+        "politics": ["vote", "vote for"],
+        "religion": ["war"],
+    }
+
+
+def test_matches_naive_search_on_random_texts():
+    rng = random.Random(7)
+    words = ["ab", "abc", "bc", "a b", "b", "ca", "abab"]
+    definitions = [
+        {"name": "one", "terms": words[:4]},
+        {"name": "two", "terms": words[3:]},
+    ]
+    matcher = BlocklistMatcher.from_definitions(definitions)
+    
+    for _ in range(500):
+        text = "".join(rng.choice("abcAB _.") for _ in range(rng.randint(0, 30)))
+        assert scanned(matcher, text) == naive_matches(definitions, text), text
+
+
+def _compiled_parity(tmp_path, normalize):
+    path = str(tmp_path / "blocklists.bin")
+    content_hash = compile_artifact(DEFINITIONS, path, normalize=normalize)
+    built = BlocklistMatcher.from_definitions(DEFINITIONS, normalize=normalize)
+    mapped = MappedBlocklistMatcher(path, expected_hash=content_hash)
+    try:
+        assert mapped.normalize == normalize
+        assert mapped.num_patterns == len(built.patterns)
+        texts = ["a vote for election fraud", "HOLY WAR", "devoted voters", "v0te f.o.r h0ly w@r", ""]
+        for text in texts:
+            assert mapped.scan(text) == built.scan(text), text
+    finally:
+        mapped.close()
+    return path, content_hash
+
+
+@pytest.mark.parametrize("normalize", [False, True])
+def test_compiled_artifact_matches_built_matcher(tmp_path, normalize):
+    path, content_hash = _compiled_parity(tmp_path, normalize)
+    
+    assert read_artifact_hash(path) == content_hash
+    # Recompiling the same term set leaves the file alone
+    mtime = os.stat(path).st_mtime_ns
+    assert compile_artifact(DEFINITIONS, path, normalize=normalize) == content_hash
+    assert os.stat(path).st_mtime_ns == mtime
+    assert os.listdir(tmp_path) == ["blocklists.bin"]
+
+
+def test_mapped_matcher_rejects_stale_artifact(tmp_path):
+    path, _ = _compiled_parity(tmp_path, False)
+    
+    with pytest.raises(ValueError, match="stale"):
+        MappedBlocklistMatcher(path, expected_hash="0" * 64)
+
+
+@pytest.mark.parametrize("cut, message", [
+    (lambda data: data[:-1], "truncated or corrupt"),
+    (lambda data: data + b"\0", "truncated or corrupt"),
+    (lambda data: data[:10], "truncated"),
+    (lambda data: b"", "empty"),
+])
+def test_mapped_matcher_rejects_truncated_artifact(tmp_path, cut, message):
+    path, _ = _compiled_parity(tmp_path, False)
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(cut(data))
+    
+    with pytest.raises(ValueError, match=message):
+        MappedBlocklistMatcher(path)
+
+
+def test_concurrent_compiles_do_not_collide(tmp_path):
+    path = str(tmp_path / "blocklists.bin")
+    term_sets = [[{"name": "list", "terms": [f"term {i}", f"other {j}"]}] for i in range(8) for j in range(4)]
+    errors = []
+    
+    def compile_one(definitions):
+        try:
+            compile_artifact(definitions, path)
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=compile_one, args=(definitions,)) for definitions in term_sets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == []
+    assert os.listdir(tmp_path) == ["blocklists.bin"]
+    # Whichever compile won, the artifact is complete and loadable
+    mapped = MappedBlocklistMatcher(path)
+    try:
+        assert mapped.num_patterns == 2
+    finally:
+        mapped.close()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Café", "cafe"),
+    ("Résumé!", "resume"),
+    ("ＶＯＴＥ", "vote"),
+    ("ⓥⓞⓣⓔ", "vote"),
+    ("Straße", "strasse"),
+])
+def test_normalize_folds_compatibility_forms_and_accents(text, expected):
+    assert normalize_for_matching(text)[0] == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    # Cyrillic о and е, Greek α
+    ("vоtе", "vote"),
+    ("wαr", "war"),
+    # Digit and symbol substitutions
+    ("v0t3", "vote"),
+    ("h0ly w@r", "holy war"),
+    ("$41nt", "saint"),
+])
+def test_normalize_maps_homoglyphs_and_leetspeak(text, expected):
+    assert normalize_for_matching(text)[0] == expected
+
+
+def test_normalize_collapses_separators_and_drops_invisible_characters():
+    assert normalize_for_matching("  v.o.t.e  -- for!! ")[0] == "v o t e for"
+    assert normalize_for_matching("vo\u200bte")[0] == "vote"
+    assert normalize_for_matching("...")[0] == ""
+
+
+@pytest.mark.parametrize("text", ["Café", "ﬁre", "Straße", "vo\u200bte", "  v.o.t.e  -- for ", "ＨＯＬＹ　ＷＡＲ"])
+def test_normalize_origin_maps_back_to_the_original_text(text):
+    normalized, origin = normalize_for_matching(text)
+    
+    assert len(origin) == len(normalized)
+    assert origin == sorted(origin)
+    for ch, index in zip(normalized, origin):
+        if ch != " ":
+            assert ch in normalize_for_matching(text[index])[0]
+
+
+def test_normalize_origin_of_expanded_and_dropped_characters():
+    # Both letters of the ligature point at it; the zero-width space leaves a gap
+    assert normalize_for_matching("ﬁre") == ("fire", [0, 0, 1, 2])
+    assert normalize_for_matching("vo\u200bte") == ("vote", [0, 1, 3, 4])
+
+
+def test_term_variants():
+    assert term_variants("Vote For") == ["vote for", "votefor", "v o t e f o r"]
+    assert term_variants("w@r") == ["war", "w a r"]
+    assert term_variants("a") == ["a"]
+    assert term_variants("...") == []
+
+
+@pytest.mark.parametrize("text, span", [
+    ("please V0TE-F0R now", "V0TE-F0R"),
+    ("v.o.t.e f.o.r", "v.o.t.e f.o.r"),
+    ("vоtefor them", "vоtefor"),
+    ("ＶＯＴＥ　ＦＯＲ", "ＶＯＴＥ　ＦＯＲ"),
+])
+def test_normalized_matches_report_original_spans(text, span):
+    matcher = BlocklistMatcher.from_definitions([{"name": "politics", "terms": ["vote for"]}], normalize=True)
+    
+    [match] = matcher.scan(text)
+    
+    assert match.term == "vote for"
+    assert text[match.start:match.end] == span
+
+
+def test_normalized_matching_keeps_word_boundaries():
+    matcher = BlocklistMatcher.from_definitions([{"name": "religion", "terms": ["war"]}], normalize=True)
+    
+    assert not matcher.is_blocked("s0ftw@re")
+    assert matcher.is_blocked("no w@r!")
@@ -0,0 +1,659 @@
+#!/usr/bin/env python3
+"""
+Unit tests for create_blocklists.py
+Runs without network access; the Content Safety service is replaced by fakes
+"""
+
+import asyncio
+import contextlib
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from requests.structures import CaseInsensitiveDict
+
+import create_blocklists
+from create_blocklists import (
+    MAX_REQUEST_PAYLOAD_BYTES,
+    AdaptiveRateLimiter,
+    AsyncBlocklistManager,
+    BlocklistManager,
+    ScreeningCache,
+    chunk_terms,
+    diff_blocklist_items,
+    read_terms,
+    stream_terms,
+)
+
+
+class FakeClock:
+    """Stand-in for time.monotonic that only moves when told to"""
+    
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+    
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(create_blocklists.time, "monotonic", clock)
+    # Remove jitter so delays are exact
+    monkeypatch.setattr(create_blocklists.random, "uniform", lambda low, high: low)
+    return clock
+
+
+def test_rate_limiter_allows_burst_then_paces(clock):
+    limiter = AdaptiveRateLimiter(rate=10.0, burst=2)
+    
+    assert limiter._reserve() == 0.0
+    assert limiter._reserve() == 0.0
+    assert limiter._reserve() == pytest.approx(0.1)
+
+
+def test_rate_limiter_refills_over_time(clock):
+    limiter = AdaptiveRateLimiter(rate=10.0, burst=2)
+    for _ in range(2):
+        limiter._reserve()
+    
+    clock.advance(0.1)
+    assert limiter._reserve() == 0.0
+    
+    # The bucket never holds more than its capacity
+    clock.advance(60)
+    assert limiter._reserve() == 0.0
+    assert limiter._reserve() == 0.0
+    assert limiter._reserve() == pytest.approx(0.1)
+
+
+def test_rate_limiter_honours_retry_after_seconds(clock):
+    limiter = AdaptiveRateLimiter(rate=10.0, burst=5)
+    
+    assert limiter.record_response(429, CaseInsensitiveDict({"Retry-After": "3"}), attempt=0)
+    assert limiter.rate == 5.0
+    assert limiter._reserve() == pytest.approx(3.0)
+    
+    # Tokens keep refilling (at the reduced rate) while callers are held
+    clock.advance(3)
+    assert limiter._reserve() == 0.0
+    assert limiter.stats()["throttle_responses"] == 1
+    assert limiter.stats()["throttled_seconds"] == pytest.approx(3.0)
+
+
+def test_rate_limiter_retry_after_variants(clock):
+    limiter = AdaptiveRateLimiter(max_backoff=30.0)
+    
+    limiter.record_response(503, CaseInsensitiveDict({"retry-after-ms": "1500"}), attempt=0)
+    assert limiter.blocked_until - clock.now == pytest.approx(1.5)
+    
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=10)
+    limiter.record_response(429, CaseInsensitiveDict({"Retry-After": format_datetime(retry_at, usegmt=True)}), attempt=0)
+    assert 8 <= limiter.blocked_until - clock.now <= 10
+    
+    # Server-requested delays are capped
+    limiter.record_response(429, CaseInsensitiveDict({"Retry-After": "3600"}), attempt=0)
+    assert limiter.blocked_until - clock.now == pytest.approx(30.0)
+
+
+def test_rate_limiter_backs_off_exponentially_without_retry_after(clock, monkeypatch):
+    monkeypatch.setattr(create_blocklists.random, "uniform", lambda low, high: high)
+    limiter = AdaptiveRateLimiter(base_backoff=0.5, max_backoff=4.0)
+    
+    delays = []
+    for attempt in range(5):
+        clock.advance(10)
+        limiter.record_response(429, CaseInsensitiveDict(), attempt=attempt)
+        delays.append(limiter.blocked_until - clock.now)
+    assert delays == pytest.approx([0.5, 1.0, 2.0, 4.0, 4.0])
+
+
+def test_rate_limiter_cuts_rate_once_per_throttle_window(clock):
+    limiter = AdaptiveRateLimiter(rate=16.0, min_rate=1.0)
+    
+    for _ in range(3):
+        limiter.record_response(429, CaseInsensitiveDict({"Retry-After": "2"}), attempt=0)
+    assert limiter.rate == 8.0
+    
+    clock.advance(2)
+    limiter.record_response(429, CaseInsensitiveDict({"Retry-After": "2"}), attempt=0)
+    assert limiter.rate == 4.0
+
+
+def test_rate_limiter_recovers_and_gives_up(clock):
+    limiter = AdaptiveRateLimiter(rate=1.0, max_rate=1.5, increase_step=0.5, max_retries=2)
+    
+    assert not limiter.record_response(200, CaseInsensitiveDict(), attempt=0)
+    assert not limiter.record_response(200, CaseInsensitiveDict(), attempt=0)
+    assert limiter.rate == 1.5
+    
+    assert limiter.record_response(429, CaseInsensitiveDict(), attempt=1)
+    assert not limiter.record_response(429, CaseInsensitiveDict(), attempt=2)
+
+
+def test_rate_limiter_pauses_when_window_is_used_up(clock):
+    limiter = AdaptiveRateLimiter()
+    headers = CaseInsensitiveDict({"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "2s"})
+    
+    assert not limiter.record_response(200, headers, attempt=0)
+    assert limiter._reserve() == pytest.approx(2.0)
+
+
+def _async_manager(screened):
+    """AsyncBlocklistManager whose analyze_text records texts instead of calling the service"""
+    manager = AsyncBlocklistManager("https://example.cognitiveservices.azure.com", "key", max_concurrency=2)
+    
+    async def analyze_text(text, blocklist_names, halt_on_blocklist_hit=False):
+        screened.append(text)
+        await asyncio.sleep(0)
+        return {"text": text}
+    
+    manager.analyze_text = analyze_text
+    return manager
+
+
+def test_analyze_stream_yields_in_input_order():
+    texts = [f"text {i}" for i in range(20)]
+    manager = _async_manager([])
+    
+    async def run():
+        return [text async for text, _ in manager.analyze_stream(texts, ["list"], batch_window=0)]
+    
+    assert asyncio.run(run()) == texts
+
+
+def test_analyze_stream_reraises_source_error():
+    def failing_source():
+        yield "first"
+        yield "second"
+        raise RuntimeError("source failed")
+    
+    manager = _async_manager([])
+    
+    async def run():
+        seen = []
+        with pytest.raises(RuntimeError, match="source failed"):
+            async for text, _ in manager.analyze_stream(failing_source(), ["list"], batch_window=0):
+                seen.append(text)
+        return seen
+    
+    # Before the fix the consumer waited for an end marker that was never queued
+    seen = asyncio.run(asyncio.wait_for(run(), timeout=5))
+    assert seen == ["first", "second"][:len(seen)]
+
+
+def test_analyze_stream_reraises_async_source_error():
+    async def failing_source():
+        yield "first"
+        raise ValueError("bad record")
+    
+    manager = _async_manager([])
+    
+    async def run():
+        with pytest.raises(ValueError, match="bad record"):
+            async for _ in manager.analyze_stream(failing_source(), ["list"], batch_window=0):
+                pass
+    
+    asyncio.run(asyncio.wait_for(run(), timeout=5))
+
+
+def _item(item_id, text):
+    return {"blocklistItemId": item_id, "text": text, "description": text}
+
+
+def test_diff_blocklist_items_adds_and_removes():
+    existing = [_item("1", "keep"), _item("2", "stale"), _item("3", "also keep")]
+    
+    to_add, to_remove, unchanged = diff_blocklist_items(existing, ["new b", "keep", "new a", "also keep"])
+    
+    assert to_add == ["new b", "new a"]
+    assert to_remove == ["2"]
+    assert unchanged == 2
+
+
+def test_diff_blocklist_items_removes_duplicate_copies():
+    existing = [_item("1", "term"), _item("2", "term"), _item("3", "term")]
+    
+    to_add, to_remove, unchanged = diff_blocklist_items(existing, ["term", "term", "other", "other"])
+    
+    assert to_add == ["other"]
+    assert to_remove == ["2", "3"]
+    assert unchanged == 1
+
+
+def test_diff_blocklist_items_no_changes():
+    existing = [_item("1", "a"), _item("2", "b")]
+    
+    assert diff_blocklist_items(existing, iter(["b", "a"])) == ([], [], 2)
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self._body = body if body is not None else {}
+        self.headers = CaseInsensitiveDict(headers or {})
+    
+    @property
+    def text(self):
+        return json.dumps(self._body)
+    
+    def json(self):
+        return self._body
+
+
+class FakeContentSafetySession:
+    """In-memory stand-in for the blocklist endpoints used by BlocklistManager"""
+    
+    def __init__(self, items=None, page_size=2):
+        self.items = {item["blocklistItemId"]: item["text"] for item in items or []}
+        self.page_size = page_size
+        self.calls = []
+        self._next_id = 1000
+        self.analyzed = []
+    
+    def request(self, method, url, json=None, timeout=None):
+        parsed = urlparse(url)
+        path = parsed.path
+        self.calls.append((method, path.rsplit("/", 1)[-1]))
+        
+        if method == "PATCH":
+            return FakeResponse(201, {"description": json["description"]})
+        if path.endswith("text:analyze"):
+            self.analyzed.append(json["text"])
+            matches = [{"blocklistName": name, "blocklistItemText": text}
+                       for name in json["blocklistNames"] for text in self.items.values() if text in json["text"]]
+            return FakeResponse(200, {"blocklistsMatch": matches, "categoriesAnalysis": []})
+        if method == "GET" and path.endswith("/blocklistItems"):
+            skip = int(parse_qs(parsed.query).get("skip", ["0"])[0])
+            items = [_item(item_id, text) for item_id, text in self.items.items()]
+            page = items[skip:skip + self.page_size]
+            body = {"value": page}
+            if skip + self.page_size < len(items):
+                body["nextLink"] = f"{url.split('&skip=')[0]}&skip={skip + self.page_size}"
+            return FakeResponse(200, body)
+        if path.endswith(":addOrUpdateBlocklistItems"):
+            for entry in json["blocklistItems"]:
+                self._next_id += 1
+                self.items[str(self._next_id)] = entry["text"]
+            return FakeResponse(200, {"blocklistItems": json["blocklistItems"]})
+        if path.endswith(":removeBlocklistItems"):
+            for item_id in json["blocklistItemIds"]:
+                self.items.pop(item_id, None)
+            return FakeResponse(204)
+        return FakeResponse(404, {"error": "unexpected request"})
+
+
+def _manager(session):
+    manager = BlocklistManager("https://example.cognitiveservices.azure.com", "key")
+    manager.session.close()
+    manager.session = session
+    return manager
+
+
+def test_sync_blocklist_sends_only_changes(clock):
+    session = FakeContentSafetySession([_item("1", "keep"), _item("2", "stale"), _item("3", "keep")])
+    manager = _manager(session)
+    
+    summary = manager.sync_blocklist("politics", "Political terms", ["keep", "new"],
+                                     existing={"blocklistName": "politics", "description": "Political terms"})
+    
+    assert summary == {"added": 1, "removed": 2, "unchanged": 1}
+    assert sorted(session.items.values()) == ["keep", "new"]
+    # Unchanged description: no PATCH; items are listed across pages, added, then removed
+    methods = [method for method, _ in session.calls]
+    assert "PATCH" not in methods
+    assert session.calls.count(("GET", "blocklistItems")) == 2
+    assert session.calls[-2:] == [("POST", "politics:addOrUpdateBlocklistItems"),
+                                  ("POST", "politics:removeBlocklistItems")]
+
+
+def test_sync_blocklist_creates_missing_list_without_listing(clock):
+    session = FakeContentSafetySession()
+    manager = _manager(session)
+    
+    summary = manager.sync_blocklist("religion", "Religious terms", [f"term {i}" for i in range(250)])
+    
+    assert summary == {"added": 250, "removed": 0, "unchanged": 0}
+    assert session.calls[0] == ("PATCH", "religion")
+    assert ("GET", "blocklistItems") not in session.calls
+    assert session.calls.count(("POST", "religion:addOrUpdateBlocklistItems")) == 3
+
+
+def test_sync_blocklist_is_a_no_op_when_in_sync(clock):
+    session = FakeContentSafetySession([_item("1", "a"), _item("2", "b")])
+    manager = _manager(session)
+    
+    summary = manager.sync_blocklist("list", "desc", ["a", "b"], existing={"description": "desc"})
+    
+    assert summary == {"added": 0, "removed": 0, "unchanged": 2}
+    assert all(method == "GET" for method, _ in session.calls)
+
+
+def test_sync_blocklist_retries_throttled_request(clock):
+    session = FakeContentSafetySession()
+    responses = iter([FakeResponse(429, headers={"Retry-After": "0"})])
+    request = session.request
+    session.request = lambda *args, **kwargs: next(responses, None) or request(*args, **kwargs)
+    manager = _manager(session)
+    
+    assert manager.sync_blocklist("list", "desc", ["a"]) == {"added": 1, "removed": 0, "unchanged": 0}
+    assert manager.rate_limiter.stats()["throttle_responses"] == 1
+
+
+def test_screening_cache_expires_entries_after_ttl(clock):
+    cache = ScreeningCache(ttl=60)
+    key = cache.make_key("Some text", ["list"])
+    cache.put(key, {"blocklistsMatch": []})
+    
+    clock.advance(59)
+    assert cache.get(key) == {"blocklistsMatch": []}
+    clock.advance(2)
+    assert cache.get(key) is None
+    assert cache.stats()["evictions"] == 1 and cache.stats()["size"] == 0
+
+
+def test_screening_cache_evicts_least_recently_used_at_capacity(clock):
+    cache = ScreeningCache(max_size=2)
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    # Reading "a" makes "b" the least recently used
+    assert cache.get("a") == {"n": 1}
+    cache.put("c", {"n": 3})
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1} and cache.get("c") == {"n": 3}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_screening_cache_returns_copies(clock):
+    cache = ScreeningCache()
+    result = {"blocklistsMatch": [{"blocklistItemText": "war"}]}
+    cache.put("key", result)
+    result["blocklistsMatch"].clear()
+    
+    first = cache.get("key")
+    first["blocklistsMatch"].append({"blocklistItemText": "tampered"})
+    
+    assert cache.get("key") == {"blocklistsMatch": [{"blocklistItemText": "war"}]}
+
+
+def test_screening_cache_invalidated_by_blocklist_changes(clock):
+    session = FakeContentSafetySession([_item("1", "war")])
+    manager = _manager(session)
+    manager.screening_cache = ScreeningCache()
+    text = "no war and no vote"
+    
+    assert len(manager.analyze_text(text, ["politics"])["blocklistsMatch"]) == 1
+    assert len(manager.analyze_text("No  WAR and no vote", ["politics"])["blocklistsMatch"]) == 1
+    assert session.analyzed == [text]
+    
+    # Adding to the screened list makes earlier results stale
+    assert manager.add_blocklist_items("politics", ["vote"])
+    assert len(manager.analyze_text(text, ["politics"])["blocklistsMatch"]) == 2
+    # Changes to an unrelated list don't
+    assert manager.add_blocklist_items("religion", ["holy"])
+    manager.analyze_text(text, ["politics"])
+    assert len(session.analyzed) == 2
+    
+    assert manager.remove_blocklist_items("politics", ["1"])
+    assert len(manager.analyze_text(text, ["politics"])["blocklistsMatch"]) == 1
+    assert len(session.analyzed) == 3
+
+
+def _detail_delay(blocklists, path):
+    """Delay that makes later blocklists answer first, so completion order differs from listing order"""
+    names = [b["blocklistName"] for b in blocklists]
+    name = path.rsplit("/", 1)[-1]
+    return 0.005 * (len(names) - names.index(name)) if name in names else 0
+
+
+class FakeDescribeSession:
+    """Stand-in for the list and get blocklist endpoints used by BlocklistManager.describe_blocklists"""
+    
+    def __init__(self, blocklists, failing_blocklists=()):
+        self.blocklists = blocklists
+        self.failing_blocklists = set(failing_blocklists)
+    
+    def request(self, method, url, json=None, timeout=None):
+        path = urlparse(url).path
+        name = path.rsplit("/", 1)[-1]
+        if name == "blocklists":
+            return FakeResponse(200, {"value": self.blocklists})
+        time.sleep(_detail_delay(self.blocklists, path))
+        if name in self.failing_blocklists:
+            return FakeResponse(500, {"error": "internal error"})
+        return FakeResponse(200, {"blocklistName": name, "description": f"{name} details"})
+
+
+LISTED_BLOCKLISTS = [
+    {"blocklistName": "alpha", "description": "alpha listed"},
+    {"blocklistName": "beta", "description": "beta listed"},
+    {"blocklistName": "gamma", "description": "gamma listed"},
+    {"blocklistName": "delta", "description": "delta listed"},
+]
+
+
+def _expected_descriptions(failed):
+    return [
+        dict(listed) if listed["blocklistName"] == failed
+        else {"blocklistName": listed["blocklistName"], "description": f"{listed['blocklistName']} details"}
+        for listed in LISTED_BLOCKLISTS
+    ]
+
+
+def test_describe_blocklists_keeps_listing_order_and_fields():
+    manager = _manager(FakeDescribeSession(LISTED_BLOCKLISTS, failing_blocklists=["beta"]))
+    
+    described = manager.describe_blocklists(max_concurrency=4)
+    
+    assert described == _expected_descriptions("beta")
+
+
+def test_describe_blocklists_for_named_lists():
+    manager = _manager(FakeDescribeSession(LISTED_BLOCKLISTS, failing_blocklists=["gamma"]))
+    
+    described = manager.describe_blocklists(["gamma", "alpha"])
+    
+    assert described == [{"blocklistName": "gamma"}, {"blocklistName": "alpha", "description": "alpha details"}]
+
+
+class FakeAsyncResponse:
+    def __init__(self, status, body=None):
+        self.status = status
+        self._body = body if body is not None else {}
+        self.headers = CaseInsensitiveDict()
+    
+    async def text(self):
+        return json.dumps(self._body)
+
+
+class FakeAsyncContentSafetySession:
+    """In-memory stand-in for the aiohttp session used by AsyncBlocklistManager"""
+    
+    def __init__(self, failing_term="bad", blocklists=None, failing_blocklists=()):
+        self.failing_term = failing_term
+        self.blocklists = blocklists or []
+        self.failing_blocklists = set(failing_blocklists)
+        self.items = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    @contextlib.asynccontextmanager
+    async def request(self, method, url, json=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(_detail_delay(self.blocklists, urlparse(url).path) or 0.001)
+            yield self._respond(method, urlparse(url).path, json)
+        finally:
+            self.in_flight -= 1
+    
+    def _respond(self, method, path, json):
+        name = path.rsplit("/", 1)[-1]
+        if method == "PATCH":
+            return FakeAsyncResponse(201, {"description": json["description"]})
+        if name.endswith(":addOrUpdateBlocklistItems"):
+            texts = [entry["text"] for entry in json["blocklistItems"]]
+            if self.failing_term in texts:
+                return FakeAsyncResponse(500, {"error": "batch rejected"})
+            self.items.setdefault(name.split(":")[0], []).extend(texts)
+            return FakeAsyncResponse(200, {"blocklistItems": json["blocklistItems"]})
+        if method == "GET" and name == "blocklists":
+            return FakeAsyncResponse(200, {"value": self.blocklists})
+        if method == "GET" and name in self.failing_blocklists:
+            return FakeAsyncResponse(500, {"error": "internal error"})
+        if method == "GET":
+            return FakeAsyncResponse(200, {"blocklistName": name, "description": f"{name} details"})
+        return FakeAsyncResponse(404, {"error": "unexpected request"})
+
+
+def _async_session_manager(session, max_concurrency=2):
+    manager = AsyncBlocklistManager(
+        "https://example.cognitiveservices.azure.com", "key",
+        max_concurrency=max_concurrency, rate_limiter=AdaptiveRateLimiter(rate=10000, burst=10000)
+    )
+    manager.session = session
+    return manager
+
+
+def test_upload_terms_bounds_in_flight_batches_and_counts_failures():
+    session = FakeAsyncContentSafetySession()
+    manager = _async_session_manager(session, max_concurrency=2)
+    outstanding = {"now": 0, "max": 0}
+    add_blocklist_items = manager.add_blocklist_items
+    
+    async def tracked_add(blocklist_name, items):
+        outstanding["now"] += 1
+        outstanding["max"] = max(outstanding["max"], outstanding["now"])
+        try:
+            return await add_blocklist_items(blocklist_name, items)
+        finally:
+            outstanding["now"] -= 1
+    
+    manager.add_blocklist_items = tracked_add
+    # 20 batches of 100; the 3rd and 17th contain the term the fake service rejects
+    terms = [f"term {i}" for i in range(2000)]
+    terms[250] = terms[1650] = "bad"
+    
+    failed = asyncio.run(manager.upload_terms("list", terms))
+    
+    assert failed == 2
+    assert outstanding["max"] == 2 * manager.max_concurrency
+    assert session.max_in_flight <= manager.max_concurrency
+    assert len(session.items["list"]) == 1800
+
+
+def test_provision_blocklists_reports_failed_batches(capsys):
+    session = FakeAsyncContentSafetySession()
+    manager = _async_session_manager(session)
+    definitions = [
+        {"name": "clean", "description": "ok", "terms": [f"clean {i}" for i in range(300)]},
+        {"name": "broken", "description": "has a rejected batch", "terms": ["bad"] + [f"broken {i}" for i in range(300)]},
+    ]
+    
+    results = asyncio.run(manager.provision_blocklists(definitions))
+    
+    assert results == {"clean": True, "broken": False}
+    assert "❌ 1 batch(es) failed for blocklist: broken" in capsys.readouterr().out
+    assert len(session.items["clean"]) == 300
+    assert len(session.items["broken"]) == 201
+
+
+def test_async_describe_blocklists_keeps_listing_order_and_fields():
+    session = FakeAsyncContentSafetySession(blocklists=LISTED_BLOCKLISTS, failing_blocklists=["beta"])
+    manager = _async_session_manager(session, max_concurrency=4)
+    
+    described = asyncio.run(manager.describe_blocklists())
+    
+    assert described == _expected_descriptions("beta")
+
+
+def _write(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def test_read_terms_csv_with_header(tmp_path):
+    path = _write(tmp_path, "terms.csv", 'id,term\n1,vote\n2,"holy, war"\n3\n')
+    
+    assert list(read_terms(path)) == ["vote", "holy, war"]
+
+
+def test_read_terms_csv_without_matching_header(tmp_path):
+    path = _write(tmp_path, "terms.csv", "vote,1\nelection,2\n")
+    
+    # The first row is data, and the first column holds the term
+    assert list(read_terms(path)) == ["vote", "election"]
+    assert list(read_terms(path, column="missing")) == ["vote", "election"]
+
+
+def test_read_terms_csv_custom_column_and_bom(tmp_path):
+    path = _write(tmp_path, "terms.csv", "\ufeffphrase,lang\nVote For,en\n")
+    
+    assert list(read_terms(path, column="phrase")) == ["Vote For"]
+
+
+def test_read_terms_jsonl(tmp_path):
+    path = _write(tmp_path, "terms.jsonl", '"vote"\n\n{"term": "holy war"}\n{"other": "x"}\n{"term": 5}\n')
+    
+    assert list(read_terms(path)) == ["vote", "holy war"]
+
+
+def test_read_terms_jsonl_rejects_malformed_lines(tmp_path):
+    path = _write(tmp_path, "terms.ndjson", '{"term": "vote"}\n{not json\n')
+    
+    terms = read_terms(path)
+    assert next(terms) == "vote"
+    with pytest.raises(json.JSONDecodeError):
+        next(terms)
+
+
+def test_stream_terms_normalizes_and_dedupes(tmp_path):
+    path = _write(tmp_path, "terms.txt", "# comment\n  Vote   For \nvote for\n\n" + "x" * 200 + "\nWar\n")
+    
+    assert list(stream_terms(path)) == ["vote for", "war"]
+
+
+def _payload_size(batch):
+    """Size of the addOrUpdateBlocklistItems body BlocklistManager sends for a batch"""
+    return len(json.dumps({"blocklistItems": [{"description": term, "text": term} for term in batch]}))
+
+
+def test_chunk_terms_respects_item_limit():
+    batches = list(chunk_terms((f"term {i}" for i in range(250)), max_items=100))
+    
+    assert [len(batch) for batch in batches] == [100, 100, 50]
+    assert [term for batch in batches for term in batch] == [f"term {i}" for i in range(250)]
+
+
+@pytest.mark.parametrize("max_bytes", [1000, 4096, MAX_REQUEST_PAYLOAD_BYTES])
+def test_chunk_terms_respects_payload_byte_limit(max_bytes):
+    rng = random.Random(max_bytes)
+    # Mix of ASCII, characters json.dumps escapes, and long terms
+    alphabet = "abc xyz\"\\éü中文"
+    terms = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 40))) for _ in range(300)]
+    
+    batches = list(chunk_terms(terms, max_items=100, max_bytes=max_bytes))
+    
+    assert [term for batch in batches for term in batch] == terms
+    for batch in batches:
+        assert len(batch) <= 100
+        assert _payload_size(batch) <= max_bytes
+    # Batches are filled, not split early (the size estimate reserves one spare ", " separator)
+    for batch, following in zip(batches, batches[1:]):
+        assert _payload_size(batch + following[:1]) > max_bytes - 2 or len(batch) == 100
+
+
+def test_chunk_terms_sends_oversized_term_alone():
+    big = "x" * 500
+    
+    assert list(chunk_terms(["a", big, "b"], max_bytes=300)) == [["a"], [big], ["b"]]